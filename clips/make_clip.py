@@ -22,6 +22,8 @@ Usage:
 """
 
 import argparse
+import functools
+import json
 import subprocess
 import sys
 import os
@@ -239,43 +241,58 @@ def create_overlay(caption, overlay_path, text_color, outline_color, use_pill=Fa
     return overlay_path
 
 
-def get_video_dimensions(video_path):
-    """Get original video width and height."""
+@functools.lru_cache(maxsize=256)
+def _probe_video_stream(video_path, size, mtime_ns, inode):
+    """Probe width, height and frame rate of the first video stream.
+
+    Cached on file identity (path, size, mtime, inode), so the several
+    lookups made per clip cost one ffprobe process and an edited file is
+    re-probed.
+    """
     cmd = [
         "ffprobe", "-v", "quiet",
         "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "csv=p=0",
+        "-show_entries", "stream=width,height,r_frame_rate",
+        "-of", "json",
         video_path,
     ]
     result = subprocess.run(cmd, capture_output=True, text=True)
-    for line in result.stdout.strip().split("\n"):
-        parts = line.strip().split(",")
-        if len(parts) == 2:
-            try:
-                return int(parts[0]), int(parts[1])
-            except ValueError:
-                continue
-    return None, None
+    try:
+        streams = json.loads(result.stdout or "{}").get("streams", [])
+    except ValueError:
+        streams = []
+    return streams[0] if streams else {}
+
+
+def _video_stream(video_path):
+    """First video stream's probe data, via the identity-keyed cache."""
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return {}
+    return _probe_video_stream(
+        os.path.abspath(video_path), st.st_size, st.st_mtime_ns, st.st_ino
+    )
+
+
+def get_video_dimensions(video_path):
+    """Get original video width and height."""
+    stream = _video_stream(video_path)
+    try:
+        return int(stream["width"]), int(stream["height"])
+    except (KeyError, TypeError, ValueError):
+        return None, None
 
 
 def get_video_fps(video_path):
     """Get video frame rate as a float."""
-    cmd = [
-        "ffprobe", "-v", "quiet",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=r_frame_rate",
-        "-of", "csv=p=0",
-        video_path,
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    rate_str = result.stdout.strip().split("\n")[0].strip()
-    if "/" in rate_str:
-        num, den = rate_str.split("/")
-        return float(num) / float(den)
+    rate_str = str(_video_stream(video_path).get("r_frame_rate", "")).strip()
     try:
+        if "/" in rate_str:
+            num, den = rate_str.split("/")
+            return float(num) / float(den)
         return float(rate_str)
-    except ValueError:
+    except (ValueError, ZeroDivisionError):
         return 30.0
 
 
@@ -0,0 +1,113 @@
+"""Move transcripts out of sources into source_transcripts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.ingestion.compact_transcript import CompactTranscript
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def _has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _decode_json(value):
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Databases created by `init-db` (create_all) already have the new layout
+    if not _has_table("source_transcripts"):
+        op.create_table(
+            "source_transcripts",
+            sa.Column("source_id", sa.Integer(), sa.ForeignKey("sources.id"), primary_key=True),
+            sa.Column("data", sa.LargeBinary(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    if "transcript_size" not in _columns("sources"):
+        op.add_column("sources", sa.Column("transcript_size", sa.Integer(), nullable=True))
+
+    if "transcript_json" not in _columns("sources"):
+        return
+
+    sources = sa.table(
+        "sources",
+        sa.column("id", sa.Integer),
+        sa.column("transcript_json", sa.Text),
+        sa.column("transcript_size", sa.Integer),
+    )
+    transcripts = sa.table(
+        "source_transcripts",
+        sa.column("source_id", sa.Integer),
+        sa.column("data", sa.LargeBinary),
+    )
+
+    rows = bind.execute(
+        sa.select(sources.c.id, sources.c.transcript_json)
+        .where(sources.c.transcript_json.isnot(None))
+    )
+    for source_id, value in rows.fetchall():
+        transcript = _decode_json(value)
+        if transcript is None:
+            continue
+        data = CompactTranscript.from_dict(transcript).to_bytes()
+        bind.execute(transcripts.insert().values(source_id=source_id, data=data))
+        bind.execute(
+            sources.update()
+            .where(sources.c.id == source_id)
+            .values(transcript_size=len(data))
+        )
+
+    with op.batch_alter_table("sources") as batch_op:
+        batch_op.drop_column("transcript_json")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    with op.batch_alter_table("sources") as batch_op:
+        batch_op.add_column(sa.Column("transcript_json", sa.JSON(), nullable=True))
+
+    sources = sa.table(
+        "sources",
+        sa.column("id", sa.Integer),
+        sa.column("transcript_json", sa.JSON),
+    )
+    transcripts = sa.table(
+        "source_transcripts",
+        sa.column("source_id", sa.Integer),
+        sa.column("data", sa.LargeBinary),
+    )
+
+    rows = bind.execute(sa.select(transcripts.c.source_id, transcripts.c.data))
+    for source_id, data in rows.fetchall():
+        bind.execute(
+            sources.update()
+            .where(sources.c.id == source_id)
+            .values(transcript_json=CompactTranscript.from_bytes(data).to_dict())
+        )
+
+    op.drop_table("source_transcripts")
+    with op.batch_alter_table("sources") as batch_op:
+        batch_op.drop_column("transcript_size")
@@ -0,0 +1,34 @@
+"""Add generated_clips.hook_text
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(c["name"] == column for c in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    # Databases created by `init-db` (create_all) already have the column
+    if not _has_column("generated_clips", "hook_text"):
+        op.add_column("generated_clips", sa.Column("hook_text", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("generated_clips") as batch_op:
+        batch_op.drop_column("hook_text")
@@ -1,47 +1,94 @@
-import json
-import os
-import subprocess
+import time
+from typing import Any, Callable
 
 import structlog
 
-logger = structlog.get_logger()
+from src.ai.llm_backend import get_llm_backend
+from src.ai.prompts import PROMPT_TEMPLATE_VERSION
+from src.ai.rate_limiter import get_rate_limiter
+from src.ai.response_cache import get_response_cache, response_key
+from src.config import Settings
 
+logger = structlog.get_logger()
 
-def call_claude(system_prompt: str, user_prompt: str) -> str:
-    """Call Claude via the Claude Code CLI (uses Pro Max subscription).
 
-    Combines system + user prompt and calls `claude -p` which routes
-    through the user's subscription, not the pay-per-use API.
-    """
-    full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
+def call_claude(
+    system_prompt: str,
+    user_prompt: str,
+    settings: Settings | None = None,
+    model: str | None = None,
+    refresh: bool = False,
+    validate: Callable[[str], Any] | None = None,
+) -> str:
+    """Call Claude through the configured LLM backend.
 
-    logger.debug("calling_claude_cli", prompt_length=len(full_prompt))
+    ``llm_backend`` picks the Claude Code CLI (uses Pro Max subscription,
+    the default and the only choice without ``settings``), the in-process
+    Anthropic SDK, or the offline stub. See src.ai.llm_backend.
 
-    # Allow spawning claude CLI even when running inside a Claude Code session
-    env = os.environ.copy()
-    env.pop("CLAUDECODE", None)
+    With ``settings`` (and ``llm_cache_enabled``), responses are served
+    from and stored in the LLM response cache. ``refresh`` (or the
+    ``llm_cache_refresh`` setting) skips the lookup and overwrites the
+    cached entry with a fresh response.
 
-    result = subprocess.run(
-        ["claude", "-p", full_prompt, "--output-format", "json"],
-        capture_output=True,
-        text=True,
-        timeout=300,
-        env=env,
-    )
+    ``validate`` (e.g. a model's ``model_validate_json``) is called on the
+    response and must raise when it is unusable. Only responses that pass
+    are stored, and a cached response that fails is dropped and fetched
+    again, so a malformed reply is never served from the cache.
 
-    if result.returncode != 0:
-        raise RuntimeError(f"Claude CLI failed: {result.stderr}")
+    Requests that reach a remote backend share one process-wide rate
+    limit (``llm_requests_per_minute``, bursts of ``llm_max_concurrency``),
+    so calls from several threads are throttled together.
+    """
+    backend = get_llm_backend(settings)
 
-    output = json.loads(result.stdout)
-    text = output["result"]
+    cache = None
+    key = None
+    if settings is not None and settings.llm_cache_enabled:
+        cache = get_response_cache(
+            settings.get_llm_cache_path(),
+            settings.llm_cache_max_bytes,
+            settings.llm_cache_ttl_seconds,
+        )
+        key = response_key(
+            system_prompt,
+            user_prompt,
+            f"{backend.name}/{backend.resolve_model(model)}",
+            PROMPT_TEMPLATE_VERSION,
+        )
+        if not (refresh or settings.llm_cache_refresh):
+            cached = cache.get(key)
+            if cached is not None and _is_valid(cached, validate):
+                logger.debug("llm_cache_hit", key=key)
+                return cached
+            if cached is not None:
+                logger.warning("llm_cache_invalid_entry", key=key)
+                cache.delete(key)
 
-    # Strip markdown code fences if Claude wrapped the response
-    if text.startswith("```"):
-        lines = text.split("\n")
-        # Remove first line (```json) and last line (```)
-        lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        text = "\n".join(lines)
+    if settings is not None and backend.rate_limited:
+        get_rate_limiter(
+            settings.llm_requests_per_minute, settings.llm_max_concurrency
+        ).acquire()
 
+    started = time.monotonic()
+    text = backend.complete(system_prompt, user_prompt, model)
+    logger.debug(
+        "llm_call_finished",
+        backend=backend.name,
+        seconds=round(time.monotonic() - started, 3),
+    )
+    if validate is not None:
+        validate(text)
+    if cache is not None:
+        cache.put(key, text)
     return text
+
+
+def _is_valid(text: str, validate: Callable[[str], Any] | None) -> bool:
+    if validate is None:
+        return True
+    try:
+        validate(text)
+    except Exception:
+        return False
+    return True
@@ -1,15 +1,26 @@
-from typing import Any
+from typing import Any, Sequence
 
 import structlog
 from pydantic import BaseModel, Field
 
 from src.ai.claude_cli import call_claude
-from src.ai.prompts import HOOK_GENERATION_SYSTEM, HOOK_GENERATION_USER
+from src.ai.prompts import (
+    HOOK_BATCH_CLIP,
+    HOOK_BATCH_USER,
+    HOOK_GENERATION_SYSTEM,
+    HOOK_GENERATION_USER,
+)
+from src.ai.tokens import estimate_tokens
 from src.config import Settings
 from src.exceptions import AIDetectionError
+from src.ingestion.compact_transcript import CompactTranscript
+from src.ingestion.transcript_index import get_transcript_index
 
 logger = structlog.get_logger()
 
+# Estimated response tokens per hook (hook text, caption, style, JSON)
+TOKENS_PER_HOOK = 80
+
 
 class HookVariation(BaseModel):
     """A single hook variation for a clip."""
@@ -25,6 +36,12 @@ class HookSet(BaseModel):
     hooks: list[HookVariation] = Field(description="Hook variations")
 
 
+class HookBatch(BaseModel):
+    """Hook sets for several clip moments, keyed by clip ID."""
+
+    clips: dict[str, HookSet] = Field(description="Hook set per clip ID")
+
+
 class HookWriter:
     """Generates scroll-stopping hooks and captions using Claude."""
 
@@ -35,7 +52,7 @@ class HookWriter:
         self,
         start_time: float,
         end_time: float,
-        transcript: dict[str, Any],
+        transcript: dict[str, Any] | CompactTranscript,
         num_variations: int = 3,
     ) -> list[HookVariation]:
         """Generate hook variations for a clip moment.
@@ -62,6 +79,8 @@ class HookWriter:
             response_text = call_claude(
                 system_prompt=HOOK_GENERATION_SYSTEM,
                 user_prompt=user_prompt,
+                settings=self.settings,
+                validate=HookSet.model_validate_json,
             )
 
             hook_set = HookSet.model_validate_json(response_text)
@@ -80,18 +99,148 @@ class HookWriter:
 
     def _extract_excerpt(
         self,
-        transcript: dict[str, Any],
+        transcript: dict[str, Any] | CompactTranscript,
         start_time: float,
         end_time: float,
     ) -> str:
         """Extract the transcript text for a specific time range."""
         lines = []
-        for segment in transcript.get("segments", []):
-            seg_start = segment.get("start", 0)
-            seg_end = segment.get("end", 0)
-            # Include segments that overlap with the clip range
-            if seg_end >= start_time and seg_start <= end_time:
-                text = segment.get("text", "").strip()
-                if text:
-                    lines.append(f"[{seg_start:.1f}s] {text}")
+        # Include segments that overlap with the clip range
+        for segment in get_transcript_index(transcript).segments_in_range(start_time, end_time):
+            text = segment.get("text", "").strip()
+            if text:
+                lines.append(f"[{segment.get('start', 0):.1f}s] {text}")
         return "\n".join(lines)
+
+    def generate_hooks_batch(
+        self,
+        moments: Sequence[Any],
+        transcript: dict[str, Any] | CompactTranscript,
+        num_variations: int = 3,
+    ) -> list[list[HookVariation]]:
+        """Generate hook variations for several moments with as few requests as possible.
+
+        Moments are packed into shared prompts of at most ``hook_batch_size``
+        clips, and split further so each request's estimated prompt plus
+        response stays within ``hook_batch_max_tokens`` (and the response
+        within ``claude_max_tokens``). Responses are JSON keyed by clip ID,
+        validated with HookBatch. When a batch fails (request error,
+        invalid JSON, or a missing or empty clip), its affected moments
+        fall back to one generate_hooks call each.
+
+        Args:
+            moments: Objects with ``start_time`` and ``end_time`` (e.g. ViralMoment).
+            transcript: Full WhisperX transcript dict.
+            num_variations: Number of hook variations per moment.
+
+        Returns:
+            Hook variations per moment, in the order of ``moments``.
+
+        Raises:
+            AIDetectionError: A per-moment fallback call failed too.
+        """
+        excerpts = [
+            self._extract_excerpt(transcript, m.start_time, m.end_time) for m in moments
+        ]
+        results: list[list[HookVariation] | None] = [None] * len(moments)
+
+        for batch in self._plan_batches(moments, excerpts, num_variations):
+            if len(batch) > 1:
+                for index, hooks in self._request_batch(
+                    batch, moments, excerpts, num_variations
+                ).items():
+                    results[index] = hooks
+
+            for index in batch:
+                if results[index] is None:
+                    results[index] = self.generate_hooks(
+                        start_time=moments[index].start_time,
+                        end_time=moments[index].end_time,
+                        transcript=transcript,
+                        num_variations=num_variations,
+                    )
+
+        return results
+
+    def _plan_batches(
+        self,
+        moments: Sequence[Any],
+        excerpts: list[str],
+        num_variations: int,
+    ) -> list[list[int]]:
+        """Group moment indexes into batches that fit the size and token limits."""
+        overhead = estimate_tokens(HOOK_GENERATION_SYSTEM + HOOK_BATCH_USER)
+        output_per_clip = num_variations * TOKENS_PER_HOOK
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        prompt_tokens = overhead
+
+        for index, moment in enumerate(moments):
+            clip_tokens = estimate_tokens(self._format_clip(index, moment, excerpts[index]))
+            fits = (
+                len(batch) < self.settings.hook_batch_size
+                and prompt_tokens + clip_tokens + output_per_clip * (len(batch) + 1)
+                <= self.settings.hook_batch_max_tokens
+                and output_per_clip * (len(batch) + 1) <= self.settings.claude_max_tokens
+            )
+            if batch and not fits:
+                batches.append(batch)
+                batch, prompt_tokens = [], overhead
+            batch.append(index)
+            prompt_tokens += clip_tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _request_batch(
+        self,
+        batch: list[int],
+        moments: Sequence[Any],
+        excerpts: list[str],
+        num_variations: int,
+    ) -> dict[int, list[HookVariation]]:
+        """Hooks for the clips of one batch that came back valid, by moment index."""
+        ids = {self._clip_id(index): index for index in batch}
+        user_prompt = HOOK_BATCH_USER.format(
+            num_variations=num_variations,
+            count=len(batch),
+            clips="\n\n".join(
+                self._format_clip(index, moments[index], excerpts[index]) for index in batch
+            ),
+            ids=", ".join(ids),
+            first_id=next(iter(ids)),
+        )
+
+        try:
+            response_text = call_claude(
+                system_prompt=HOOK_GENERATION_SYSTEM,
+                user_prompt=user_prompt,
+                settings=self.settings,
+                validate=HookBatch.model_validate_json,
+            )
+            hook_batch = HookBatch.model_validate_json(response_text)
+        except Exception as e:
+            logger.warning("hook_batch_failed", clips=len(batch), error=str(e))
+            return {}
+
+        hooks = {
+            ids[clip_id]: hook_set.hooks
+            for clip_id, hook_set in hook_batch.clips.items()
+            if clip_id in ids and hook_set.hooks
+        }
+        missing = len(batch) - len(hooks)
+        logger.info("hooks_generated_batch", clips=len(batch), missing=missing)
+        return hooks
+
+    @staticmethod
+    def _clip_id(index: int) -> str:
+        return f"m{index + 1}"
+
+    def _format_clip(self, index: int, moment: Any, excerpt: str) -> str:
+        return HOOK_BATCH_CLIP.format(
+            clip_id=self._clip_id(index),
+            start_time=moment.start_time,
+            end_time=moment.end_time,
+            transcript_excerpt=excerpt,
+        )
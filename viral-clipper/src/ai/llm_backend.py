@@ -0,0 +1,281 @@
+"""Pluggable backends that send a prompt to Claude and return its text.
+
+``llm_backend`` selects one:
+
+- ``cli``: runs ``claude -p`` per request (the user's subscription). Each
+  call starts a Node process and pays auth and a TLS handshake again.
+- ``sdk``: the Anthropic SDK in-process, using ``claude_api_key``. One
+  client (and so one pooled, keep-alive HTTP connection set) is shared
+  per configuration for the life of the process, so client-side cost per
+  call is milliseconds. Bulk work uses ``claude_model_bulk``; callers
+  pass ``claude_model_complex`` explicitly for complex analysis.
+- ``stub``: no network. Deterministic, well-formed responses to the
+  moment detection and hook prompts (derived from the prompt text), with
+  optional artificial latency, for tests and benchmarks.
+
+Every backend returns the response text with any markdown code fence
+removed, and raises RuntimeError when the call fails.
+"""
+import abc
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+import structlog
+
+from src.config import Settings
+
+logger = structlog.get_logger()
+
+# Timeout for one CLI call
+CLI_TIMEOUT_SECONDS = 300
+
+# Model name reported (and cache-keyed) when the CLI's own default is used
+CLI_DEFAULT_MODEL = "cli-default"
+
+LLM_BACKENDS = ("cli", "sdk", "stub")
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a markdown code fence Claude sometimes wraps JSON in."""
+    if text.startswith("```"):
+        lines = text.split("\n")
+        # Remove first line (```json) and last line (```)
+        lines = lines[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        text = "\n".join(lines)
+    return text
+
+
+class LLMBackend(abc.ABC):
+    """Interface: one prompt in, response text out."""
+
+    name = "base"
+    # Whether requests count against llm_requests_per_minute
+    rate_limited = True
+
+    @abc.abstractmethod
+    def resolve_model(self, model: str | None) -> str:
+        """The model a call with ``model`` will actually use."""
+
+    @abc.abstractmethod
+    def complete(self, system_prompt: str, user_prompt: str, model: str | None = None) -> str:
+        """Send one request and return the response text.
+
+        Raises:
+            RuntimeError: The request failed.
+        """
+
+
+class CLIBackend(LLMBackend):
+    """Claude Code CLI (``claude -p``), routed through the user's subscription."""
+
+    name = "cli"
+
+    def __init__(self, timeout: float = CLI_TIMEOUT_SECONDS):
+        self.timeout = timeout
+
+    def resolve_model(self, model: str | None) -> str:
+        return model or CLI_DEFAULT_MODEL
+
+    def complete(self, system_prompt: str, user_prompt: str, model: str | None = None) -> str:
+        full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
+
+        logger.debug("calling_claude_cli", prompt_length=len(full_prompt))
+
+        # Allow spawning claude CLI even when running inside a Claude Code session
+        env = os.environ.copy()
+        env.pop("CLAUDECODE", None)
+
+        cmd = ["claude", "-p", full_prompt, "--output-format", "json"]
+        if model:
+            cmd.extend(["--model", model])
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                env=env,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"Claude CLI timed out after {self.timeout}s") from e
+
+        if result.returncode != 0:
+            raise RuntimeError(f"Claude CLI failed: {result.stderr}")
+
+        try:
+            output = json.loads(result.stdout)
+            return strip_code_fences(output["result"])
+        except (json.JSONDecodeError, KeyError) as e:
+            raise RuntimeError(f"Claude CLI returned unexpected output: {e}") from e
+
+
+_clients: dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_client(api_key: str, timeout: float, max_retries: int, max_connections: int):
+    """Process-wide Anthropic client per configuration (pooled HTTP connections)."""
+    import anthropic
+    import httpx
+
+    key = (api_key, timeout, max_retries, max_connections)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = anthropic.Anthropic(
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=max_retries,
+                http_client=anthropic.DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    ),
+                ),
+            )
+        return client
+
+
+class SDKBackend(LLMBackend):
+    """Anthropic Messages API through the SDK, on a shared pooled client."""
+
+    name = "sdk"
+
+    def __init__(self, settings: Settings):
+        if not settings.claude_api_key:
+            raise RuntimeError("CLAUDE_API_KEY is required for the sdk LLM backend")
+        self.settings = settings
+        self.client = _shared_client(
+            settings.claude_api_key,
+            settings.claude_timeout_seconds,
+            settings.claude_max_retries,
+            settings.claude_max_connections,
+        )
+
+    def resolve_model(self, model: str | None) -> str:
+        return model or self.settings.claude_model_bulk
+
+    def complete(self, system_prompt: str, user_prompt: str, model: str | None = None) -> str:
+        import anthropic
+
+        model = self.resolve_model(model)
+        logger.debug("calling_claude_api", model=model, prompt_length=len(user_prompt))
+        try:
+            message = self.client.messages.create(
+                model=model,
+                max_tokens=self.settings.claude_max_tokens,
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+        except anthropic.APIError as e:
+            raise RuntimeError(f"Claude API failed: {e}") from e
+
+        text = "".join(block.text for block in message.content if block.type == "text")
+        return strip_code_fences(text.strip())
+
+
+class StubBackend(LLMBackend):
+    """Deterministic offline responses for tests and benchmarks.
+
+    Moment detection prompts get moments starting at timestamps found in
+    the transcript; hook prompts (single or batched) get the requested
+    number of hooks. The same prompt always gets the same response.
+    Anything else gets a small JSON object naming the prompt's hash.
+    """
+
+    name = "stub"
+    rate_limited = False
+
+    # Start of a transcript line: "[12.5s - 20.0s] ..." or compact "[12] ..."
+    _TIMESTAMP = re.compile(r"^\[(\d+(?:\.\d+)?)(?:s - [\d.]+s)?\] \S", re.MULTILINE)
+    _HOOK_STYLES = ("question", "bold_claim", "relatability", "urgency", "controversy", "story")
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+
+    def resolve_model(self, model: str | None) -> str:
+        return model or "stub"
+
+    def complete(self, system_prompt: str, user_prompt: str, model: str | None = None) -> str:
+        from src.ai.prompts import HOOK_GENERATION_SYSTEM, MOMENT_DETECTION_SYSTEM
+
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        seed = hashlib.sha256(f"{system_prompt}\0{user_prompt}".encode()).digest()
+
+        if system_prompt == MOMENT_DETECTION_SYSTEM:
+            return json.dumps(self._moments(user_prompt, seed))
+        if system_prompt == HOOK_GENERATION_SYSTEM:
+            return json.dumps(self._hooks(user_prompt, seed))
+        return json.dumps({"result": seed.hex()[:16]})
+
+    def _moments(self, user_prompt: str, seed: bytes) -> dict:
+        match = re.search(r"top (\d+) viral", user_prompt)
+        max_moments = int(match.group(1)) if match else 10
+        starts = sorted({float(t) for t in self._TIMESTAMP.findall(user_prompt)})
+        # Spread the moments over the transcript, at most one per 30 s
+        picked: list[float] = []
+        for start in starts:
+            if not picked or start - picked[-1] >= 30:
+                picked.append(start)
+        step = max(1, len(picked) // max_moments) if picked else 1
+        moments = []
+        for i, start in enumerate(picked[::step][:max_moments]):
+            moments.append({
+                "start_time": start,
+                "end_time": start + 30 + seed[i % len(seed)] % 45,
+                "hook_text": f"Stub hook {i + 1}",
+                "caption_text": f"Stub caption {i + 1} #stub",
+                "viral_score": 30 + seed[(i + 7) % len(seed)] % 70,
+                "reasoning": "Deterministic stub response",
+            })
+        return {"moments": moments}
+
+    def _hooks(self, user_prompt: str, seed: bytes) -> dict:
+        match = re.search(r"Generate (\d+) different hook", user_prompt)
+        count = int(match.group(1)) if match else 3
+        # Batched prompts: one hook set per "CLIP m<n>:" block
+        clip_ids = re.findall(r"^CLIP (m\d+):", user_prompt, re.MULTILINE)
+        if clip_ids:
+            return {"clips": {
+                clip_id: self._hook_set(count, seed[i % len(seed)])
+                for i, clip_id in enumerate(clip_ids)
+            }}
+        return self._hook_set(count, seed[0])
+
+    def _hook_set(self, count: int, offset: int) -> dict:
+        return {"hooks": [
+            {
+                "hook_text": f"Stub hook {i + 1}",
+                "post_caption": f"Stub caption {i + 1} #stub",
+                "hook_style": self._HOOK_STYLES[(offset + i) % len(self._HOOK_STYLES)],
+            }
+            for i in range(count)
+        ]}
+
+
+def get_llm_backend(settings: Settings | None = None) -> LLMBackend:
+    """The backend selected by ``llm_backend`` (the CLI without settings).
+
+    Raises:
+        ValueError: Unknown backend name.
+        RuntimeError: The sdk backend has no API key.
+    """
+    if settings is None:
+        return CLIBackend()
+    name = settings.llm_backend
+    if name == "cli":
+        return CLIBackend(settings.claude_timeout_seconds)
+    if name == "sdk":
+        return SDKBackend(settings)
+    if name == "stub":
+        return StubBackend(settings.llm_stub_latency_seconds)
+    raise ValueError(f"Unknown LLM backend {name!r} (expected one of {', '.join(LLM_BACKENDS)})")
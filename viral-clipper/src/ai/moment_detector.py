@@ -1,12 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import structlog
 from pydantic import BaseModel, Field
 
 from src.ai.claude_cli import call_claude
-from src.ai.prompts import MOMENT_DETECTION_SYSTEM, MOMENT_DETECTION_USER
+from src.ai.prompts import (
+    MOMENT_DETECTION_SYSTEM,
+    MOMENT_DETECTION_USER,
+    TRANSCRIPT_FORMAT_COMPACT,
+    TRANSCRIPT_FORMAT_FULL,
+)
+from src.ai.transcript_windows import (
+    TranscriptWindow,
+    build_windows,
+    transcript_lines,
+)
 from src.config import Settings
 from src.exceptions import AIDetectionError
+from src.ingestion.compact_transcript import CompactTranscript
 
 logger = structlog.get_logger()
 
@@ -36,13 +48,15 @@ class MomentDetector:
 
     def detect_moments(
         self,
-        transcript: dict[str, Any],
+        transcript: dict[str, Any] | CompactTranscript,
         max_moments: int = 10,
     ) -> list[ViralMoment]:
         """Analyze a transcript and return ranked viral moments.
 
         Uses Claude with structured outputs for guaranteed valid responses.
-        Sends transcript in sliding windows to manage token costs.
+        Transcripts over ``moment_window_max_tokens`` are sent in
+        overlapping, segment-aligned windows to manage token costs (see
+        src.ai.transcript_windows).
 
         Args:
             transcript: WhisperX transcript dict with segments.
@@ -51,13 +65,22 @@ class MomentDetector:
         Returns:
             List of ViralMoment sorted by viral_score descending.
         """
-        transcript_text = self._format_transcript(transcript)
+        compact = self.settings.transcript_compact_encoding
+        lines = transcript_lines(
+            transcript,
+            merge_seconds=self.settings.transcript_merge_seconds if compact else 0.0,
+        )
+        windows = build_windows(
+            lines,
+            max_tokens=self.settings.moment_window_max_tokens,
+            overlap_seconds=self.settings.moment_window_overlap_seconds,
+            compact=compact,
+        )
 
-        # Use sliding window for long transcripts (>8k tokens ~= 32k chars)
-        if len(transcript_text) > 32000:
-            return self._detect_with_windows(transcript_text, max_moments)
+        if len(windows) > 1:
+            return self._detect_with_windows(windows, max_moments)
 
-        return self._detect_single(transcript_text, max_moments)
+        return self._detect_single(windows[0].text if windows else "", max_moments)
 
     def _detect_single(
         self,
@@ -67,6 +90,11 @@ class MomentDetector:
         """Detect moments from a single transcript chunk."""
         user_prompt = MOMENT_DETECTION_USER.format(
             max_moments=max_moments,
+            transcript_format=(
+                TRANSCRIPT_FORMAT_COMPACT
+                if self.settings.transcript_compact_encoding
+                else TRANSCRIPT_FORMAT_FULL
+            ),
             transcript=transcript_text,
         )
 
@@ -74,6 +102,8 @@ class MomentDetector:
             response_text = call_claude(
                 system_prompt=MOMENT_DETECTION_SYSTEM,
                 user_prompt=user_prompt,
+                settings=self.settings,
+                validate=MomentAnalysis.model_validate_json,
             )
 
             analysis = MomentAnalysis.model_validate_json(response_text)
@@ -97,35 +127,41 @@ class MomentDetector:
 
     def _detect_with_windows(
         self,
-        transcript_text: str,
+        windows: list[TranscriptWindow],
         max_moments: int,
     ) -> list[ViralMoment]:
-        """Detect moments using sliding windows for long transcripts.
+        """Detect moments in each window of a long transcript.
 
-        Splits transcript into overlapping windows of ~6000 words,
-        detects moments in each window, then deduplicates and ranks.
+        Analyzes up to ``llm_max_concurrency`` windows at once (requests
+        also pass the shared LLM rate limit). Results are merged in window
+        order, so the outcome doesn't depend on which call finishes first,
+        then deduplicated and ranked.
         """
-        window_size = 24000  # chars (~6000 words)
-        overlap = 4000  # chars overlap between windows
-        all_moments: list[ViralMoment] = []
-
-        pos = 0
-        window_num = 0
-        while pos < len(transcript_text):
-            window = transcript_text[pos : pos + window_size]
-            window_num += 1
 
+        def analyze(window_num: int, window: TranscriptWindow) -> list[ViralMoment]:
             logger.info(
                 "processing_window",
                 window=window_num,
-                start_char=pos,
-                length=len(window),
+                start_seconds=round(window.start, 1),
+                end_seconds=round(window.end, 1),
+                lines=window.line_count,
+                tokens=window.tokens,
             )
-
-            moments = self._detect_single(window, max_moments=max_moments)
-            all_moments.extend(moments)
-
-            pos += window_size - overlap
+            return self._detect_single(window.text, max_moments=max_moments)
+
+        workers = min(self.settings.llm_max_concurrency, len(windows))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(analyze, i + 1, window) for i, window in enumerate(windows)
+            ]
+            try:
+                results = [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        all_moments = [moment for moments in results for moment in moments]
 
         # Deduplicate moments with overlapping timestamps
         deduped = self._deduplicate_moments(all_moments)
@@ -166,14 +202,3 @@ class MomentDetector:
                 result.append(moment)
 
         return result
-
-    def _format_transcript(self, transcript: dict[str, Any]) -> str:
-        """Format a WhisperX transcript dict into readable text with timestamps."""
-        lines = []
-        for segment in transcript.get("segments", []):
-            start = segment.get("start", 0)
-            end = segment.get("end", 0)
-            text = segment.get("text", "").strip()
-            if text:
-                lines.append(f"[{start:.1f}s - {end:.1f}s] {text}")
-        return "\n".join(lines)
@@ -1,3 +1,7 @@
+# Part of every LLM response cache key: bump when a template changes meaning
+# (or how its response is parsed) so older cached responses are not reused
+PROMPT_TEMPLATE_VERSION = "2"
+
 MOMENT_DETECTION_SYSTEM = """You are an expert viral content analyst specializing in short-form video.
 You analyze transcripts of long-form content (interviews, podcasts, live streams, concerts)
 and identify the most clip-worthy moments for TikTok, Instagram Reels, YouTube Shorts, and X.
@@ -21,7 +25,7 @@ For each moment, provide:
 - Viral score 0-100 (be honest — not everything is viral)
 - Brief reasoning for why this moment works
 
-TRANSCRIPT:
+TRANSCRIPT ({transcript_format}):
 {transcript}
 
 IMPORTANT:
@@ -33,6 +37,13 @@ IMPORTANT:
 Respond with ONLY valid JSON in this exact format (no markdown, no explanation):
 {{"moments": [{{"start_time": 0.0, "end_time": 30.0, "hook_text": "...", "caption_text": "...", "viral_score": 85, "reasoning": "..."}}]}}"""
 
+# Descriptions of the transcript line formats (src.ai.transcript_windows)
+TRANSCRIPT_FORMAT_FULL = "each line is [start - end] text, times in seconds"
+TRANSCRIPT_FORMAT_COMPACT = (
+    "each line is [start] text, start in whole seconds; a line lasts until the "
+    "next line's time, and the final bare [time] marks the end"
+)
+
 HOOK_GENERATION_SYSTEM = """You are a viral content writer specializing in scroll-stopping hooks for short-form video.
 Your hooks appear as text overlays in the first 2-3 seconds of TikTok/Reels/Shorts.
 
@@ -63,3 +74,21 @@ For each hook, provide:
 
 Respond with ONLY valid JSON in this exact format (no markdown, no explanation):
 {{"hooks": [{{"hook_text": "...", "post_caption": "...", "hook_style": "question"}}]}}"""
+
+
+HOOK_BATCH_USER = """Generate {num_variations} different hook variations for EACH of the {count} clip moments below.
+Treat every clip on its own: its hooks must only use its own excerpt.
+
+{clips}
+
+For each hook, provide:
+- Hook text (max 10 words, for text overlay)
+- Post caption (1-2 sentences with relevant hashtags)
+- Hook style (question/bold_claim/relatability/urgency/controversy/story)
+
+Respond with ONLY valid JSON, keyed by clip ID, covering every clip ({ids}), in this exact format (no markdown, no explanation):
+{{"clips": {{"{first_id}": {{"hooks": [{{"hook_text": "...", "post_caption": "...", "hook_style": "question"}}]}}}}}}"""
+
+HOOK_BATCH_CLIP = """CLIP {clip_id}:
+Start: {start_time}s - End: {end_time}s
+Transcript excerpt: {transcript_excerpt}"""
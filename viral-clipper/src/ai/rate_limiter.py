@@ -0,0 +1,61 @@
+"""Process-wide rate limit on outgoing LLM requests.
+
+Concurrent window analysis (and anything else calling Claude from
+several threads) would otherwise send bursts the API or subscription
+throttles. A token bucket refilled at ``llm_requests_per_minute`` lets
+up to ``burst`` requests start at once and spaces the rest evenly.
+Cache hits never take a token.
+"""
+import threading
+import time
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class RateLimiter:
+    """Thread-safe token bucket."""
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if self.requests_per_minute <= 0:
+            return 0.0
+        rate = self.requests_per_minute / 60
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            # Reserve the token now; a negative balance queues later callers
+            self._tokens -= 1
+            wait = -self._tokens / rate if self._tokens < 0 else 0.0
+        if wait:
+            logger.debug("llm_rate_limited", wait_seconds=round(wait, 3))
+            time.sleep(wait)
+        return wait
+
+
+_shared: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(requests_per_minute: float, burst: int) -> RateLimiter:
+    """The process-wide limiter, updated to the given limits."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter(requests_per_minute, burst)
+        _shared.requests_per_minute = requests_per_minute
+        _shared.burst = max(1, burst)
+        return _shared
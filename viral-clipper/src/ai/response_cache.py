@@ -0,0 +1,146 @@
+"""Disk cache of LLM responses keyed by the exact request.
+
+Moment detection and hook generation on an unchanged transcript send the
+same prompts again, and each call to Claude takes seconds to minutes.
+Responses are cached here under a hash of the system prompt, user prompt,
+model and PROMPT_TEMPLATE_VERSION, so a re-run is answered from SQLite.
+Bumping PROMPT_TEMPLATE_VERSION (when a template or the parsing of its
+response changes meaning) orphans every older entry.
+
+Entries expire after a TTL and are evicted least recently used first
+once the store exceeds its byte budget. Only successful responses are
+stored; a forced refresh skips the lookup and overwrites the entry.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def response_key(system_prompt: str, user_prompt: str, model: str, template_version: str) -> str:
+    """Cache key of one request."""
+    digest = hashlib.sha256()
+    for part in (template_version, model, system_prompt, user_prompt):
+        encoded = part.encode()
+        # Length-prefixed so parts can't run into each other
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite store of LLM responses with a TTL and an LRU byte budget."""
+
+    def __init__(self, db_path: Path, max_bytes: int, ttl_seconds: float):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, key: str) -> str | None:
+        """Cached response, or None when missing or expired."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    conn.execute(
+                        "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                    )
+        except sqlite3.Error as e:
+            logger.warning("llm_cache_read_failed", key=key, error=str(e))
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting expired and least recently used entries."""
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, response, size, now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.warning("llm_cache_write_failed", key=key, error=str(e))
+
+    def delete(self, key: str) -> None:
+        """Drop an entry (e.g. a cached response that no longer validates)."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning("llm_cache_write_failed", key=key, error=str(e))
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            logger.info("llm_cache_evicted", key=key, size=size)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return total
+
+
+_shared: dict[Path, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(db_path: Path, max_bytes: int, ttl_seconds: float) -> ResponseCache:
+    """Process-wide cache for a store, so hit/miss counters are shared."""
+    with _shared_lock:
+        cache = _shared.get(db_path)
+        if cache is None:
+            cache = _shared[db_path] = ResponseCache(db_path, max_bytes, ttl_seconds)
+        cache.max_bytes = max_bytes
+        cache.ttl_seconds = ttl_seconds
+        return cache
@@ -0,0 +1,14 @@
+"""Cheap token estimates for sizing prompts.
+
+Claude's tokenizer isn't available offline; English prose and
+transcript text average about four characters per token, which is close
+enough to keep requests under a budget with some margin.
+"""
+
+# Average characters per token for English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1
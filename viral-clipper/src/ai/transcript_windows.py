@@ -0,0 +1,138 @@
+"""Segment-aligned, token-budgeted transcript windows for moment detection.
+
+Long transcripts used to be cut into 24000-character slices with 4000
+characters of overlap. Slices ended mid-line, the overlap was a fixed
+character count unrelated to time, and the size had nothing to do with
+the model's token budget. Here windows are built from whole transcript
+lines:
+
+- each window holds as many consecutive lines as fit ``max_tokens``
+  (estimated with src.ai.tokens.estimate_tokens);
+- the next window starts at the line that reaches into the last
+  ``overlap_seconds`` of the previous one, so any moment up to that long
+  appears whole in at least one window.
+
+Lines can also use a compact encoding, which needs roughly a quarter
+fewer tokens for speech segmented the way WhisperX segments it:
+
+- start times only, as integer seconds (``[754] text``). A line lasts
+  until the next line's stamp; the window's end gets a bare stamp line.
+- consecutive short segments are merged into lines spanning up to
+  ``merge_seconds``, but never across a pause of ``MERGE_MAX_GAP_SECONDS``
+  or more, since pauses are where clips tend to start and end.
+"""
+import math
+from typing import Any, Iterator
+
+from src.ai.tokens import estimate_tokens
+from src.ingestion.compact_transcript import CompactTranscript
+
+# Segments separated by a pause this long are never merged into one line
+MERGE_MAX_GAP_SECONDS = 1.0
+
+
+class TranscriptLine:
+    """One prompt line: one segment, or several merged short ones."""
+
+    __slots__ = ("start", "end", "text")
+
+    def __init__(self, start: float, end: float, text: str):
+        self.start = start
+        self.end = end
+        self.text = text
+
+
+class TranscriptWindow:
+    """A run of consecutive lines sent to the model as one prompt."""
+
+    __slots__ = ("start", "end", "text", "tokens", "line_count")
+
+    def __init__(self, lines: list[TranscriptLine], compact: bool):
+        self.start = lines[0].start
+        self.end = lines[-1].end
+        self.line_count = len(lines)
+        self.text = format_lines(lines, compact)
+        self.tokens = estimate_tokens(self.text)
+
+
+def _segment_spans(
+    transcript: dict[str, Any] | CompactTranscript,
+) -> Iterator[tuple[float, float, str]]:
+    if isinstance(transcript, CompactTranscript):
+        yield from transcript.segment_spans()
+        return
+    for segment in transcript.get("segments", []):
+        start = segment.get("start", 0)
+        yield start, segment.get("end", start), segment.get("text", "")
+
+
+def transcript_lines(
+    transcript: dict[str, Any] | CompactTranscript,
+    merge_seconds: float = 0.0,
+) -> list[TranscriptLine]:
+    """Non-empty segments as lines, merging short neighbours up to ``merge_seconds``."""
+    lines: list[TranscriptLine] = []
+    for start, end, text in _segment_spans(transcript):
+        text = text.strip()
+        if not text:
+            continue
+        last = lines[-1] if lines else None
+        if (
+            last is not None
+            and end - last.start <= merge_seconds
+            and start - last.end < MERGE_MAX_GAP_SECONDS
+        ):
+            last.end = end
+            last.text = f"{last.text} {text}"
+        else:
+            lines.append(TranscriptLine(start, end, text))
+    return lines
+
+
+def format_line(line: TranscriptLine, compact: bool) -> str:
+    if compact:
+        return f"[{int(line.start)}] {line.text}"
+    return f"[{line.start:.1f}s - {line.end:.1f}s] {line.text}"
+
+
+def format_lines(lines: list[TranscriptLine], compact: bool) -> str:
+    """Prompt text of consecutive lines (compact: ends with a bare end stamp)."""
+    text = "\n".join(format_line(line, compact) for line in lines)
+    if compact and lines:
+        text += f"\n[{math.ceil(lines[-1].end)}]"
+    return text
+
+
+def build_windows(
+    lines: list[TranscriptLine],
+    max_tokens: int,
+    overlap_seconds: float,
+    compact: bool = True,
+) -> list[TranscriptWindow]:
+    """Split lines into overlapping windows of at most ``max_tokens`` each.
+
+    A single line longer than the budget gets a window of its own. The
+    overlap never exceeds half of a window's lines.
+    """
+    costs = [estimate_tokens(format_line(line, compact)) for line in lines]
+    windows: list[TranscriptWindow] = []
+    first = 0
+    while first < len(lines):
+        last = first + 1
+        tokens = costs[first]
+        while last < len(lines) and tokens + costs[last] <= max_tokens:
+            tokens += costs[last]
+            last += 1
+        windows.append(TranscriptWindow(lines[first:last], compact))
+        if last == len(lines):
+            break
+
+        # Back up to repeat the final overlap_seconds, but by at most half
+        # the window, so tiny budgets can't produce a window per line
+        overlap_from = lines[last - 1].end - overlap_seconds
+        earliest = first + max(1, (last - first) // 2)
+        following = last
+        while following - 1 >= earliest and lines[following - 1].end > overlap_from:
+            following -= 1
+        first = following
+    return windows
@@ -9,6 +9,9 @@ Usage:
     python -m src.cli test-account --platform instagram --username myuser
     python -m src.cli clip-and-post ./media/ [--dry-run]
     python -m src.cli post-worker
+    python -m src.cli transcription-server
+    python -m src.cli transcription-status
+    python -m src.cli benchmark-transcription --models base,small --lengths 30,120
 """
 import argparse
 import getpass
@@ -74,6 +77,19 @@ def cmd_process_folder(args) -> None:
         sys.exit(1)
 
     print(f"Found {len(video_files)} video(s) in {input_dir}")
+
+    # Probe every file up front, concurrently; results are cached for the pipeline
+    from src.clipper.ffmpeg_ops import FFmpegService
+    probes = FFmpegService(settings).probe_many(video_files)
+    unreadable = [f for f in video_files if not _has_video_stream(probes.get(f))]
+    for f in unreadable:
+        print(f"  Skipping unreadable video: {f.name}")
+    video_files = [f for f in video_files if f not in unreadable]
+
+    if not video_files:
+        print(f"No readable video files in {input_dir}")
+        sys.exit(1)
+
     output_dir.mkdir(parents=True, exist_ok=True)
 
     from src.services.pipeline_service import PipelineService
@@ -97,6 +113,13 @@ def cmd_process_folder(args) -> None:
     print(f"\nDone! All clips saved to: {output_dir}")
 
 
+def _has_video_stream(info: dict | None) -> bool:
+    """Whether ffprobe output describes at least one video stream."""
+    if not info:
+        return False
+    return any(s.get("codec_type") == "video" for s in info.get("streams", []))
+
+
 # ---------------------------------------------------------------------------
 # Phase 4: Account management
 # ---------------------------------------------------------------------------
@@ -508,6 +531,89 @@ def cmd_status(args) -> None:
         print(f"  [{a['status']}] {a['platform']}: @{a['username']}")
 
 
+def cmd_transcription_server(args) -> None:
+    """Run the transcription server (keeps WhisperX models loaded)."""
+    settings = get_settings()
+
+    from src.ingestion.transcription_server import TranscriptionServer
+
+    server = TranscriptionServer(settings)
+    print(f"Loading {settings.whisperx_model} on {settings.whisperx_device}...")
+    print(f"Transcription server listening on {server.socket_path}")
+    print("Press Ctrl+C to stop.\n")
+    try:
+        server.serve_forever(preload=not args.lazy)
+    except KeyboardInterrupt:
+        print("\nTranscription server stopped.")
+
+
+def cmd_transcription_status(args) -> None:
+    """Show queue depth and model state of the transcription server."""
+    settings = get_settings()
+
+    from src.ingestion.transcription_server import TranscriptionClient
+
+    client = TranscriptionClient(settings.get_transcription_socket_path())
+    try:
+        status = client.status()
+    except OSError:
+        print(f"No transcription server running on {client.socket_path}")
+        sys.exit(1)
+
+    languages = ", ".join(status.align_languages) or "none"
+    print(f"Model: {status.model} ({status.device}, {status.compute_type}), "
+          f"loaded: {'yes' if status.model_loaded else 'no'}")
+    print(f"Alignment models: {languages}")
+    print(f"Queue: {status.queue_depth} waiting, {status.active_jobs} running")
+    print(f"Jobs: {status.jobs_completed} completed, {status.jobs_failed} failed")
+    print(f"Uptime: {status.uptime_seconds:.0f}s")
+
+
+def cmd_benchmark_transcription(args) -> None:
+    """Benchmark transcription across a matrix of WhisperX settings (CPU only)."""
+    settings = get_settings()
+
+    from src.ingestion.transcription_benchmark import (
+        BenchmarkReport,
+        benchmark_matrix,
+        compare_to_baseline,
+        format_table,
+        run_benchmark,
+    )
+
+    def split(value, cast=str):
+        return [cast(v) for v in value.split(",") if v]
+
+    configs = benchmark_matrix(
+        models=split(args.models or settings.whisperx_model),
+        compute_types=split(args.compute_types or settings.whisperx_compute_type),
+        batch_sizes=split(args.batch_sizes or str(settings.whisperx_batch_size), int),
+        concurrencies=split(args.concurrency, int),
+    )
+    lengths = split(args.lengths, int)
+    audio_path = Path(args.audio) if args.audio else None
+    if audio_path is not None and not audio_path.exists():
+        print(f"Error: audio file not found: {audio_path}")
+        sys.exit(1)
+
+    print(f"Benchmarking {len(configs)} configuration(s) on {lengths} second fixtures...",
+          file=sys.stderr)
+    report = run_benchmark(settings, configs, lengths, audio_path=audio_path)
+
+    if args.output:
+        Path(args.output).write_text(report.model_dump_json(indent=2))
+    if args.json:
+        print(report.model_dump_json(indent=2))
+    else:
+        print(format_table(report))
+
+    if args.baseline:
+        baseline = BenchmarkReport.model_validate_json(Path(args.baseline).read_text())
+        print("\nAgainst baseline:")
+        for line in compare_to_baseline(report, baseline):
+            print(f"  {line}")
+
+
 def cmd_serve(args) -> None:
     """Start the web dashboard."""
     import uvicorn
@@ -564,6 +670,29 @@ def main():
     # post-worker
     subparsers.add_parser("post-worker", help="Run the posting worker (executes scheduled posts)")
 
+    # transcription-server
+    ts = subparsers.add_parser(
+        "transcription-server", help="Run the transcription server (keeps models loaded)"
+    )
+    ts.add_argument("--lazy", action="store_true", help="Load models on the first job")
+
+    # transcription-status
+    subparsers.add_parser("transcription-status", help="Show transcription server status")
+
+    # benchmark-transcription
+    bt = subparsers.add_parser(
+        "benchmark-transcription", help="Benchmark transcription settings (CPU only)"
+    )
+    bt.add_argument("--models", default=None, help="Comma-separated WhisperX models (default: configured)")
+    bt.add_argument("--compute-types", default=None, help="Comma-separated compute types (default: configured)")
+    bt.add_argument("--batch-sizes", default=None, help="Comma-separated batch sizes (default: configured)")
+    bt.add_argument("--concurrency", default="1", help="Comma-separated concurrent jobs")
+    bt.add_argument("--lengths", default="30,120,600", help="Fixture lengths in seconds")
+    bt.add_argument("--audio", default=None, help="Speech recording to build fixtures from")
+    bt.add_argument("--json", action="store_true", help="Print the report as JSON")
+    bt.add_argument("--output", default=None, help="Also write the JSON report here")
+    bt.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+
     # Legacy commands
     url_parser = subparsers.add_parser("process-url", help="Process a video URL")
     url_parser.add_argument("client_id", type=int)
@@ -596,6 +725,9 @@ def main():
         "test-account": cmd_test_account,
         "clip-and-post": cmd_clip_and_post,
         "post-worker": cmd_post_worker,
+        "transcription-server": cmd_transcription_server,
+        "transcription-status": cmd_transcription_status,
+        "benchmark-transcription": cmd_benchmark_transcription,
         "process-url": cmd_process_url,
         "process-file": cmd_process_file,
         "status": cmd_status,
@@ -1,15 +1,55 @@
+import copy
 import json
 import subprocess
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import structlog
 
+from src.clipper.ffmpeg_runner import (
+    CancelToken,
+    FFmpegRunStats,
+    ProgressCallback,
+    run_ffmpeg,
+)
+from src.clipper.job_graph import JobGraph, JobStatus, threads_per_job
+from src.clipper.keyframes import KeyframeIndex, load_index, parse_packet_csv, save_index
+from src.clipper.probe_cache import get_probe_cache
+from src.clipper.scratch import (
+    CLIP_BYTES_PER_SECOND,
+    disk_workdir,
+    get_scratch_space,
+)
+from src.clipper.render_cache import RenderCache, render_key
+from src.clipper.render_plan import (
+    AUDIO_OUT,
+    BASE_AUDIO_OUT,
+    BASE_VIDEO_OUT,
+    OUTPUT_HEIGHT,
+    OUTPUT_WIDTH,
+    VIDEO_OUT,
+    RenderPlan,
+    ass_filter,
+    build_base_and_final_filter_complex,
+    build_fanout_filter_complex,
+    build_filter_complex,
+    crop_filter,
+    drawtext_filter,
+    fanout_window,
+    group_for_fanout,
+    mute_filter,
+)
 from src.config import Settings
 from src.exceptions import FFmpegError
 
 logger = structlog.get_logger()
 
+# Head/tail gaps shorter than this (seconds) are not worth a re-encode
+SMART_CUT_EPSILON = 0.05
+
+# Mezzanine files live next to the original as <stem>.mezzanine.mp4
+MEZZANINE_SUFFIX = ".mezzanine.mp4"
+
 
 class FFmpegService:
     """Wraps all FFmpeg operations with safe subprocess calls.
@@ -18,9 +58,33 @@ class FFmpegService:
     to prevent command injection.
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ):
         self.settings = settings
         self.timeout = settings.ffmpeg_timeout_seconds
+        self.on_progress = on_progress
+        self.cancel_token = cancel_token
+        self.run_stats: list[FFmpegRunStats] = []
+        # Encoder threads (-threads); None lets FFmpeg use every core
+        self.threads: int | None = None
+        self.scratch = None
+        if settings.scratch_dir is not None:
+            self.scratch = get_scratch_space(
+                settings.get_scratch_path(), settings.scratch_max_bytes
+            )
+        self.render_cache = None
+        if settings.render_cache_enabled:
+            self.render_cache = RenderCache(
+                settings.get_render_cache_path(),
+                settings.render_cache_max_bytes,
+            )
+        self.probe_cache = None
+        if settings.probe_cache_enabled:
+            self.probe_cache = get_probe_cache(settings.get_probe_cache_path())
 
     def extract_clip(
         self,
@@ -28,12 +92,24 @@ class FFmpegService:
         output_path: Path,
         start_time: float,
         end_time: float,
+        smart_cut: bool | None = None,
     ) -> Path:
         """Extract a clip from source video at given timestamps.
 
-        Uses stream copy when possible for speed, falls back to re-encode
-        if the codec doesn't support precise seeking.
+        With smart cut (``ffmpeg_smart_cut``, the default, or
+        smart_cut=True) the cut is frame-accurate: only the partial GOPs
+        at the head and tail are re-encoded and everything between them
+        is stream-copied (see _smart_cut). Otherwise it is a plain stream
+        copy, which snaps the cut to the nearest keyframe.
+
+        Finished clips don't go through here: render_clip crops and burns
+        in captions, so it re-encodes every frame from the source anyway.
         """
+        if smart_cut is None:
+            smart_cut = self.settings.ffmpeg_smart_cut
+        if smart_cut:
+            return self._smart_cut(source_path, output_path, start_time, end_time)
+
         cmd = [
             "ffmpeg",
             "-ss", str(start_time),
@@ -47,6 +123,275 @@ class FFmpegService:
         self._run(cmd)
         return output_path
 
+    def transcode_mezzanine(
+        self,
+        source_path: Path,
+        output_path: Path | None = None,
+    ) -> Path:
+        """Transcode a source once into a normalized, seek-friendly mezzanine.
+
+        Constant frame rate, a keyframe every mezzanine_keyframe_seconds,
+        fixed audio rate and faststart. Every later cut then lands within
+        one short GOP of a keyframe, so stream-copy extracts are near-exact
+        and seek cost no longer depends on the source's original GOPs.
+
+        Args:
+            source_path: Original source video.
+            output_path: Defaults to ``<stem>.mezzanine.mp4`` next to the source.
+        """
+        if output_path is None:
+            output_path = source_path.with_name(f"{source_path.stem}{MEZZANINE_SUFFIX}")
+
+        fps = self.settings.mezzanine_fps
+        gop_frames = max(1, round(fps * self.settings.mezzanine_keyframe_seconds))
+
+        if self.settings.use_nvenc:
+            video_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "19"]
+        else:
+            video_args = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18"]
+
+        cmd = [
+            "ffmpeg",
+            "-i", str(source_path),
+            "-map", "0:v:0",
+            "-map", "0:a:0?",
+            "-vf", f"fps={fps}",
+            *video_args,
+            "-g", str(gop_frames),
+            "-keyint_min", str(gop_frames),
+            "-sc_threshold", "0",
+            "-force_key_frames",
+            f"expr:gte(t,n_forced*{self.settings.mezzanine_keyframe_seconds})",
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-ar", str(self.settings.mezzanine_audio_rate),
+            "-ac", "2",
+            "-b:a", "192k",
+            "-movflags", "+faststart",
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd, timeout=self.settings.mezzanine_timeout_seconds)
+
+        logger.info(
+            "mezzanine_created",
+            source=str(source_path),
+            output=str(output_path),
+            fps=fps,
+            gop_frames=gop_frames,
+        )
+        return output_path
+
+    def get_keyframe_index(self, source_path: Path) -> KeyframeIndex:
+        """Get the keyframe index for a source, building it on first use.
+
+        The index is read from ffprobe's packet flags (demux only, no
+        decode) and persisted as a sidecar next to the source, so it is
+        built once per source file.
+        """
+        index = load_index(source_path)
+        if index is not None:
+            return index
+
+        stat = source_path.stat()
+        index = KeyframeIndex(
+            self.probe_keyframes(source_path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+        save_index(source_path, index)
+
+        logger.info(
+            "keyframe_index_built",
+            source=str(source_path),
+            keyframes=len(index),
+        )
+        return index
+
+    def probe_keyframes(self, path: Path) -> list[float]:
+        """List video keyframe timestamps from ffprobe packet flags (no sidecar)."""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            str(path),
+        ]
+        result = self._run(cmd, capture_output=True)
+        return parse_packet_csv(result.stdout.decode(errors="replace"))
+
+    def _smart_cut(
+        self,
+        source_path: Path,
+        output_path: Path,
+        start_time: float,
+        end_time: float,
+    ) -> Path:
+        """Frame-accurate cut that re-encodes only the partial GOPs.
+
+        [start, first keyframe) and [last keyframe, end) are re-encoded,
+        the keyframe-aligned middle is stream-copied. Segments are written
+        as MPEG-TS (in-band SPS/PPS) so the differently-encoded parts can
+        be joined with the concat demuxer without another encode.
+
+        Falls back to a full re-encode of the range when the clip sits
+        inside a single GOP or the source isn't H.264/AAC.
+        """
+        index = self.get_keyframe_index(source_path)
+        head_end = index.at_or_after(start_time)
+        tail_start = index.at_or_before(end_time)
+
+        if head_end is None or tail_start is None or tail_start <= head_end:
+            return self._extract_reencode(source_path, output_path, start_time, end_time)
+
+        info = self.get_video_info(source_path)
+        if not self._is_smart_cut_compatible(info):
+            return self._extract_reencode(source_path, output_path, start_time, end_time)
+
+        bit_rate = int(info.get("format", {}).get("bit_rate") or 0) // 8
+        estimated_bytes = int((end_time - start_time) * (bit_rate or CLIP_BYTES_PER_SECOND))
+
+        with self._work_dir(output_path, "smartcut", estimated_bytes) as work_dir:
+            parts = []
+            if head_end - start_time > SMART_CUT_EPSILON:
+                parts.append(self._encode_segment(
+                    source_path, work_dir / "head.ts", start_time, head_end, info
+                ))
+
+            parts.append(self._copy_segment(
+                source_path, work_dir / "middle.ts", head_end, tail_start - head_end
+            ))
+
+            if end_time - tail_start > SMART_CUT_EPSILON:
+                parts.append(self._encode_segment(
+                    source_path, work_dir / "tail.ts", tail_start, end_time, info
+                ))
+
+            self._concat(parts, output_path, work_dir / "concat.txt")
+
+        logger.info(
+            "smart_cut_complete",
+            source=str(source_path),
+            start=start_time,
+            end=end_time,
+            copied_seconds=tail_start - head_end,
+        )
+        return output_path
+
+    def _copy_segment(
+        self,
+        source_path: Path,
+        output_path: Path,
+        start_time: float,
+        duration: float | None = None,
+    ) -> Path:
+        """Stream-copy from a keyframe at start_time into an MPEG-TS segment."""
+        cmd = [
+            "ffmpeg",
+            "-ss", str(start_time),
+            "-i", str(source_path),
+        ]
+        if duration is not None:
+            cmd += ["-t", str(duration)]
+        cmd += [
+            "-map", "0:v:0",
+            "-map", "0:a:0?",
+            "-c", "copy",
+            "-bsf:v", "h264_mp4toannexb",
+            "-f", "mpegts",
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
+    def _is_smart_cut_compatible(self, info: dict) -> bool:
+        """Smart cut needs H.264 video and AAC (or no) audio to concat cleanly."""
+        streams = info.get("streams", [])
+        video = [s for s in streams if s.get("codec_type") == "video"]
+        audio = [s for s in streams if s.get("codec_type") == "audio"]
+        if not video or video[0].get("codec_name") != "h264":
+            return False
+        return not audio or audio[0].get("codec_name") == "aac"
+
+    def _encode_segment(
+        self,
+        source_path: Path,
+        output_path: Path,
+        start_time: float,
+        end_time: float,
+        info: dict,
+    ) -> Path:
+        """Re-encode [start, end) as MPEG-TS matching the source's stream format."""
+        streams = info.get("streams", [])
+        video = next(s for s in streams if s.get("codec_type") == "video")
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+        cmd = [
+            "ffmpeg",
+            "-ss", str(start_time),
+            "-i", str(source_path),
+            "-t", str(end_time - start_time),
+            "-map", "0:v:0",
+            "-map", "0:a:0?",
+            *self._get_encoder_args(),
+            "-pix_fmt", video.get("pix_fmt", "yuv420p"),
+        ]
+        if audio is not None:
+            cmd += [
+                "-c:a", "aac",
+                "-ar", str(audio.get("sample_rate", 48000)),
+                "-ac", str(audio.get("channels", 2)),
+            ]
+        cmd += ["-f", "mpegts", "-y", str(output_path)]
+
+        self._run(cmd)
+        return output_path
+
+    def _extract_reencode(
+        self,
+        source_path: Path,
+        output_path: Path,
+        start_time: float,
+        end_time: float,
+    ) -> Path:
+        """Frame-accurate extract by re-encoding the whole range."""
+        cmd = [
+            "ffmpeg",
+            "-ss", str(start_time),
+            "-i", str(source_path),
+            "-t", str(end_time - start_time),
+            *self._get_encoder_args(),
+            "-c:a", "aac",
+            "-b:a", "128k",
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
+    def _concat(self, parts: list[Path], output_path: Path, list_path: Path) -> Path:
+        """Join same-format segments with the concat demuxer (no re-encode)."""
+        # Concat list syntax: single quotes inside a quoted path become '\''
+        lines = []
+        for part in parts:
+            escaped = part.resolve().as_posix().replace("'", "'\\''")
+            lines.append(f"file '{escaped}'\n")
+        list_path.write_text("".join(lines))
+        cmd = [
+            "ffmpeg",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path),
+            "-c", "copy",
+            "-movflags", "+faststart",
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
     def crop_to_vertical(
         self,
         input_path: Path,
@@ -61,7 +406,7 @@ class FFmpegService:
         cmd = [
             "ffmpeg",
             "-i", str(input_path),
-            "-vf", "crop=ih*9/16:ih,scale=1080:1920",
+            "-vf", crop_filter(),
             *encoder_args,
             "-c:a", "aac",
             "-b:a", "128k",
@@ -80,13 +425,10 @@ class FFmpegService:
         """Burn ASS subtitles into the video."""
         encoder_args = self._get_encoder_args()
 
-        # ASS filter requires escaping colons and backslashes in the path
-        safe_ass_path = str(ass_path).replace("\\", "\\\\").replace(":", "\\:")
-
         cmd = [
             "ffmpeg",
             "-i", str(input_path),
-            "-vf", f"ass={safe_ass_path}",
+            "-vf", ass_filter(ass_path),
             *encoder_args,
             "-c:a", "copy",
             "-y",
@@ -103,26 +445,12 @@ class FFmpegService:
         duration: float = 3.0,
     ) -> Path:
         """Add text hook overlay to the first N seconds of the video."""
-        # Sanitize hook text for FFmpeg drawtext filter
-        safe_text = hook_text.replace("'", "\u2019").replace(":", "\\:")
-
         encoder_args = self._get_encoder_args()
 
-        # Escape the font path for FFmpeg filter syntax
-        safe_font = self.settings.font_path.replace("\\", "\\\\").replace(":", "\\:").replace("'", "\\'")
-
-        drawtext_filter = (
-            f"drawtext=text='{safe_text}'"
-            f":fontfile='{safe_font}'"
-            f":fontsize=48:fontcolor=white:borderw=3:bordercolor=black"
-            f":x=(w-text_w)/2:y=h*0.15"
-            f":enable='between(t,0,{duration})'"
-        )
-
         cmd = [
             "ffmpeg",
             "-i", str(input_path),
-            "-vf", drawtext_filter,
+            "-vf", drawtext_filter(hook_text, self.settings.font_path, duration),
             *encoder_args,
             "-c:a", "copy",
             "-y",
@@ -156,19 +484,10 @@ class FFmpegService:
             self._run(cmd)
             return output_path
 
-        # Build volume filter with enable expressions for each segment
-        volume_filters = []
-        for start, end in segments:
-            volume_filters.append(
-                f"volume=enable='between(t,{start},{end})':volume=0"
-            )
-
-        filter_chain = ",".join(volume_filters)
-
         cmd = [
             "ffmpeg",
             "-i", str(input_path),
-            "-af", filter_chain,
+            "-af", mute_filter(segments),
             "-c:v", "copy",
             "-y",
             str(output_path),
@@ -176,8 +495,512 @@ class FFmpegService:
         self._run(cmd)
         return output_path
 
+    def render_clip(self, plan: RenderPlan, output_path: Path) -> Path:
+        """Render a finished clip from the source in a single FFmpeg pass.
+
+        Trim, 9:16 crop, caption burn-in, hook overlay and profanity muting
+        are compiled into one filter graph, so the source is decoded once
+        and the clip is encoded exactly once.
+
+        With the render cache enabled, an unchanged clip is returned from
+        the cache without encoding. When only the hook changed and the
+        clip's hook-less base is cached, just the overlay is rendered on
+        top of the base. The base is cached the second time a clip is
+        rendered with a different hook, i.e. once someone is iterating
+        on it.
+        """
+        cache = self.render_cache
+        if cache is None:
+            return self._render_single(plan, output_path)
+
+        render_settings = self._render_settings()
+        key = render_key(plan, render_settings)
+        if cache.fetch(key, output_path):
+            return output_path
+
+        if not plan.hook_text:
+            self._render_single(plan, output_path)
+            cache.put(key, output_path)
+            return output_path
+
+        base_plan = plan.model_copy(update={"hook_text": ""})
+        base_key = render_key(base_plan, render_settings)
+        estimated_bytes = int(plan.duration * CLIP_BYTES_PER_SECOND)
+        with self._work_dir(output_path, "base", estimated_bytes) as work_dir:
+            # A private link/copy of the base: eviction can't pull it away mid-encode
+            base_path = work_dir / f"{output_path.stem}_base{output_path.suffix}"
+            if cache.fetch(base_key, base_path, link=True):
+                logger.info("render_cache_base_hit", key=base_key[:12])
+                self.add_hook_overlay(base_path, output_path, plan.hook_text, plan.hook_duration)
+            elif cache.seen(base_key):
+                self._render_base_and_final(plan, base_path, output_path)
+                cache.put(base_key, base_path)
+            else:
+                cache.mark_seen(base_key)
+                self._render_single(plan, output_path)
+
+        cache.put(key, output_path)
+        return output_path
+
+    def _render_single(
+        self,
+        plan: RenderPlan,
+        output_path: Path,
+        extra_output_args: list[str] | None = None,
+    ) -> Path:
+        """Run the single-pass render of a plan (no cache)."""
+        encoder_args = self._get_encoder_args()
+        filter_complex = build_filter_complex(plan, self.settings.font_path)
+
+        cmd = [
+            "ffmpeg",
+            # Input seek: decoding starts at the nearest prior keyframe and
+            # frames before start_time are discarded, so the cut is exact.
+            "-ss", str(plan.start_time),
+            "-i", str(plan.source_path),
+            "-filter_complex", filter_complex,
+            "-map", VIDEO_OUT,
+            "-map", AUDIO_OUT,
+            *encoder_args,
+            *self._get_output_audio_args(),
+            *(extra_output_args or []),
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
+    def _render_base_and_final(
+        self,
+        plan: RenderPlan,
+        base_path: Path,
+        output_path: Path,
+    ) -> Path:
+        """Render the hook-less base and the finished clip from one decode."""
+        encoder_args = self._get_encoder_args()
+        filter_complex = build_base_and_final_filter_complex(plan, self.settings.font_path)
+
+        cmd = [
+            "ffmpeg",
+            "-ss", str(plan.start_time),
+            "-i", str(plan.source_path),
+            "-filter_complex", filter_complex,
+            "-map", BASE_VIDEO_OUT,
+            "-map", BASE_AUDIO_OUT,
+            *encoder_args,
+            *self._get_output_audio_args(),
+            # Keyframe where the hook ends so variants can swap just the head
+            "-force_key_frames", str(plan.hook_duration),
+            "-y",
+            str(base_path),
+            "-map", VIDEO_OUT,
+            "-map", AUDIO_OUT,
+            *encoder_args,
+            *self._get_output_audio_args(),
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
+    def render_hook_variants(
+        self,
+        plan: RenderPlan,
+        hook_texts: list[str],
+        output_paths: list[Path],
+    ) -> list[Path]:
+        """Render one clip with several hook overlays for A/B testing.
+
+        The hook only covers the first plan.hook_duration seconds, so the
+        hook-less base is encoded once (with a keyframe forced where the
+        hook ends), its body is stream-copied once, and each variant only
+        re-encodes the leading GOP-aligned head with its own overlay before
+        being joined to the body with the concat demuxer. N variants cost
+        about 1 + N * (hook_duration / clip duration) encodes.
+
+        Args:
+            plan: Render plan; its hook_text is ignored, hook_duration is used.
+            hook_texts: Hook overlay text for each variant.
+            output_paths: Output file for each variant (same order).
+
+        Returns:
+            The output paths.
+        """
+        if len(hook_texts) != len(output_paths):
+            raise ValueError("hook_texts and output_paths must be the same length")
+        if not hook_texts:
+            return []
+
+        render_settings = self._render_settings()
+        variant_plans = [plan.model_copy(update={"hook_text": text}) for text in hook_texts]
+        pending = []
+        for variant, output_path in zip(variant_plans, output_paths):
+            if self.render_cache and self.render_cache.fetch(
+                render_key(variant, render_settings), output_path
+            ):
+                continue
+            pending.append((variant, output_path))
+        if not pending:
+            return output_paths
+
+        # Base and body are each about one clip; heads are a few seconds each
+        estimated_bytes = int(
+            (2 * plan.duration + len(pending) * plan.hook_duration) * CLIP_BYTES_PER_SECOND
+        )
+
+        with self._work_dir(output_paths[0], "variants", estimated_bytes) as work_dir:
+            base_path = self._variant_base(plan, work_dir / "base.mp4")
+            split = self._variants_from_base(base_path, pending, work_dir)
+
+            if self.render_cache is not None:
+                for variant, output_path in pending:
+                    self.render_cache.put(render_key(variant, render_settings), output_path)
+
+        logger.info(
+            "hook_variants_rendered",
+            source=str(plan.source_path),
+            variants=len(hook_texts),
+            rendered=len(pending),
+            split=split,
+        )
+        return output_paths
+
+    def _variant_base(self, plan: RenderPlan, work_path: Path) -> Path:
+        """Hook-less base for variant rendering, from the render cache if possible."""
+        base_plan = plan.model_copy(update={"hook_text": ""})
+        base_key = None
+
+        if self.render_cache is not None:
+            base_key = render_key(base_plan, self._render_settings())
+            # Linked or copied into the work dir, so eviction can't remove
+            # the input while the variants are being encoded
+            if self.render_cache.fetch(base_key, work_path, link=True):
+                return work_path
+
+        self._render_single(
+            base_plan,
+            work_path,
+            extra_output_args=["-force_key_frames", str(plan.hook_duration)],
+        )
+        if base_key is not None:
+            self.render_cache.put(base_key, work_path)
+        return work_path
+
+    def _variants_from_base(
+        self,
+        base_path: Path,
+        variants: list[tuple[RenderPlan, Path]],
+        work_dir: Path,
+        prefix: str = "",
+    ) -> float | None:
+        """Lay each variant's hook over a hook-less base.
+
+        The base needs a keyframe at (or just after) hook_duration. Its body
+        from that keyframe on is stream-copied once and each variant only
+        re-encodes the head. Without such a keyframe every variant gets a
+        full overlay instead.
+
+        Returns:
+            The split point, or None when full overlays were rendered.
+        """
+        plan = variants[0][0]
+        split = KeyframeIndex(self.probe_keyframes(base_path)).at_or_after(plan.hook_duration)
+
+        if split is None or split >= plan.duration - SMART_CUT_EPSILON:
+            # No keyframe after the hook: overlay each variant in full
+            for variant, output_path in variants:
+                self.add_hook_overlay(
+                    base_path, output_path, variant.hook_text, variant.hook_duration
+                )
+            return None
+
+        body = self._copy_segment(base_path, work_dir / f"{prefix}body.ts", split)
+        for i, (variant, output_path) in enumerate(variants):
+            head = self._encode_hook_head(
+                base_path, work_dir / f"{prefix}head_{i}.ts", variant, split
+            )
+            self._concat([head, body], output_path, work_dir / f"{prefix}concat_{i}.txt")
+        return split
+
+    def _encode_hook_head(
+        self,
+        base_path: Path,
+        output_path: Path,
+        plan: RenderPlan,
+        split: float,
+    ) -> Path:
+        """Re-encode [0, split) of the base with the hook overlay as MPEG-TS."""
+        cmd = [
+            "ffmpeg",
+            "-i", str(base_path),
+            "-t", str(split),
+            "-vf", drawtext_filter(plan.hook_text, self.settings.font_path, plan.hook_duration),
+            *self._get_encoder_args(),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "copy",
+            "-f", "mpegts",
+            "-y",
+            str(output_path),
+        ]
+        self._run(cmd)
+        return output_path
+
+    def render_batch(
+        self,
+        plans: list[RenderPlan],
+        output_paths: list[Path],
+        priorities: list[float] | None = None,
+        validate: bool = False,
+        variant_hooks: list[list[str]] | None = None,
+        variant_paths: list[list[Path]] | None = None,
+    ) -> list[dict]:
+        """Render many clips from the same source(s) with shared decodes.
+
+        Plans are grouped into nearby time ranges per source. Each group is
+        rendered by one FFmpeg process that seeks once, decodes the group's
+        range once and fans out to one encoder per clip via split/trim.
+        Groups run concurrently on a JobGraph within the CPU-thread budget,
+        highest priority first; with validate=True each clip also gets a
+        validate job depending on its group's render.
+
+        A plan with hook variants is fanned out as its hook-less base
+        instead; its own hook and each variant hook are then laid over the
+        base as in render_hook_variants, inside the group's job.
+
+        Args:
+            plans: Render plans, typically every moment of one Source.
+            output_paths: Output file for each plan (same order).
+            priorities: Scheduling priority per plan (e.g. viral score).
+            validate: Run validate_clip on each rendered clip.
+            variant_hooks: Extra hook texts to render per plan (A/B variants).
+            variant_paths: Output file for each extra hook (same shape).
+
+        Returns:
+            List of result dicts (same order as plans) with 'success',
+            'output_path', 'variant_paths', 'error' and 'plan' (and
+            'validation' when validating). A failed FFmpeg process fails
+            only the clips in its group.
+        """
+        if len(plans) != len(output_paths):
+            raise ValueError("plans and output_paths must be the same length")
+        priorities = priorities or [0] * len(plans)
+        variant_hooks = variant_hooks or [[] for _ in plans]
+        variant_paths = variant_paths or [[] for _ in plans]
+        if len(variant_hooks) != len(plans) or [len(h) for h in variant_hooks] != [
+            len(p) for p in variant_paths
+        ]:
+            raise ValueError("variant_hooks and variant_paths must match plans")
+        variants = [list(zip(hooks, paths)) for hooks, paths in zip(variant_hooks, variant_paths)]
+
+        results: list[dict] = [
+            {
+                "success": False,
+                "output_path": str(path),
+                "variant_paths": list(paths),
+                "error": None,
+                "plan": plan,
+            }
+            for plan, path, paths in zip(plans, output_paths, variant_paths)
+        ]
+        keys: list[str | None] = [None for _ in plans]
+        pending = list(range(len(plans)))
+        graph = JobGraph.from_settings(self.settings)
+        render_job: dict[int, str] = {}
+
+        if self.render_cache is not None:
+            render_settings = self._render_settings()
+            pending = []
+            for i, plan in enumerate(plans):
+                keys[i] = render_key(plan, render_settings)
+                fetched = [self.render_cache.fetch(keys[i], output_paths[i])]
+                for hook_text, path in variants[i]:
+                    variant = plan.model_copy(update={"hook_text": hook_text})
+                    fetched.append(self.render_cache.fetch(render_key(variant, render_settings), path))
+                if all(fetched):
+                    results[i]["success"] = True
+                else:
+                    pending.append(i)
+
+        pending_plans = [plans[i] for i in pending]
+        for n, pending_group in enumerate(group_for_fanout(pending_plans)):
+            group = [pending[j] for j in pending_group]
+            name = f"render_{n}"
+            graph.add(
+                name,
+                self._fanout_job(
+                    [plans[i] for i in group],
+                    [output_paths[i] for i in group],
+                    [keys[i] for i in group],
+                    [variants[i] for i in group],
+                ),
+                threads=threads_per_job(self.settings) * len(group),
+                priority=max(priorities[i] for i in group),
+            )
+            for i in group:
+                render_job[i] = name
+
+        if validate:
+            for i, output_path in enumerate(output_paths):
+                graph.add(
+                    f"validate_{i}",
+                    lambda threads, path=output_path: self.validate_clip(path),
+                    deps=[render_job[i]] if i in render_job else [],
+                    priority=priorities[i],
+                )
+
+        jobs = graph.run()
+
+        for i in range(len(plans)):
+            if i in render_job:
+                job = jobs[render_job[i]]
+                results[i]["success"] = job.status == JobStatus.SUCCEEDED
+                results[i]["error"] = job.error
+            if validate:
+                results[i]["validation"] = jobs[f"validate_{i}"].result
+
+        return results
+
+    def _fanout_job(
+        self,
+        plans: list[RenderPlan],
+        output_paths: list[Path],
+        keys: list[str | None],
+        variants: list[list[tuple[str, Path]]],
+    ):
+        """JobGraph callable rendering one fan-out group and caching it."""
+        def run(threads: int) -> list[Path]:
+            service = self.with_threads(max(1, threads // len(plans)))
+            try:
+                if any(variants):
+                    service._render_fanout_with_variants(plans, output_paths, variants)
+                else:
+                    service._render_fanout(plans, output_paths)
+            except FFmpegError as e:
+                logger.error(
+                    "fanout_render_failed",
+                    source=str(plans[0].source_path),
+                    clips=len(plans),
+                    error=str(e),
+                )
+                raise
+
+            if self.render_cache is not None:
+                render_settings = self._render_settings()
+                for plan, key, output_path, extra in zip(plans, keys, output_paths, variants):
+                    self.render_cache.put(key, output_path)
+                    for hook_text, path in extra:
+                        variant = plan.model_copy(update={"hook_text": hook_text})
+                        self.render_cache.put(render_key(variant, render_settings), path)
+            return output_paths
+
+        return run
+
+    def _render_fanout_with_variants(
+        self,
+        plans: list[RenderPlan],
+        output_paths: list[Path],
+        variants: list[list[tuple[str, Path]]],
+    ) -> list[Path]:
+        """Render a fan-out group in which some plans have hook variants.
+
+        Those plans are fanned out as hook-less bases (keyframe forced where
+        the hook ends) into a work directory; their hooks are then added by
+        re-encoding only each variant's head.
+        """
+        estimated_bytes = sum(
+            int((2 * plan.duration + (len(extra) + 1) * plan.hook_duration) * CLIP_BYTES_PER_SECOND)
+            for plan, extra in zip(plans, variants)
+            if extra
+        )
+        with self._work_dir(output_paths[0], "variants", estimated_bytes) as work_dir:
+            fanout_plans = []
+            fanout_paths = []
+            extra_output_args = []
+            for i, (plan, output_path, extra) in enumerate(zip(plans, output_paths, variants)):
+                if extra:
+                    fanout_plans.append(plan.model_copy(update={"hook_text": ""}))
+                    fanout_paths.append(work_dir / f"base_{i}.mp4")
+                    extra_output_args.append(["-force_key_frames", str(plan.hook_duration)])
+                else:
+                    fanout_plans.append(plan)
+                    fanout_paths.append(output_path)
+                    extra_output_args.append([])
+            self._render_fanout(fanout_plans, fanout_paths, extra_output_args)
+
+            for i, (plan, output_path, extra) in enumerate(zip(plans, output_paths, variants)):
+                if not extra:
+                    continue
+                pending = [(plan, output_path)] + [
+                    (plan.model_copy(update={"hook_text": hook_text}), path)
+                    for hook_text, path in extra
+                ]
+                self._variants_from_base(fanout_paths[i], pending, work_dir, prefix=f"{i}_")
+        return output_paths
+
+    def with_threads(self, threads: int) -> "FFmpegService":
+        """Copy of this service whose encodes use ``-threads threads``.
+
+        The copy shares caches, callbacks and run_stats with the original.
+        """
+        clone = copy.copy(self)
+        clone.threads = threads
+        return clone
+
+    def _render_fanout(
+        self,
+        plans: list[RenderPlan],
+        output_paths: list[Path],
+        extra_output_args: list[list[str]] | None = None,
+    ) -> list[Path]:
+        """Render one fan-out group (same source) in a single FFmpeg process."""
+        extra_output_args = extra_output_args or [[] for _ in plans]
+        encoder_args = self._get_encoder_args()
+        window_start, window_end = fanout_window(plans)
+        filter_complex, labels = build_fanout_filter_complex(
+            plans, self.settings.font_path
+        )
+
+        cmd = [
+            "ffmpeg",
+            "-ss", str(window_start),
+            "-t", str(window_end - window_start),
+            "-i", str(plans[0].source_path),
+            "-filter_complex", filter_complex,
+        ]
+        for (video_label, audio_label), output_path, extra_args in zip(
+            labels, output_paths, extra_output_args
+        ):
+            cmd += [
+                "-map", video_label,
+                "-map", audio_label,
+                *encoder_args,
+                *self._get_output_audio_args(),
+                *extra_args,
+                "-y",
+                str(output_path),
+            ]
+
+        logger.info(
+            "fanout_render",
+            source=str(plans[0].source_path),
+            clips=len(plans),
+            window_start=window_start,
+            window_end=window_end,
+        )
+        self._run(cmd)
+        return output_paths
+
     def get_video_info(self, path: Path) -> dict:
-        """Get video metadata using ffprobe."""
+        """Get video metadata using ffprobe.
+
+        Results are cached by file identity (see probe_cache), so repeat
+        calls for an unchanged file don't spawn ffprobe again.
+        """
+        if self.probe_cache is not None:
+            cached = self.probe_cache.get(path)
+            if cached is not None:
+                return cached
+
         cmd = [
             "ffprobe",
             "-v", "quiet",
@@ -187,7 +1010,45 @@ class FFmpegService:
             str(path),
         ]
         result = self._run(cmd, capture_output=True)
-        return json.loads(result.stdout)
+        info = json.loads(result.stdout)
+
+        if self.probe_cache is not None:
+            self.probe_cache.put(path, info)
+        return info
+
+    def probe_many(
+        self,
+        paths: list[Path],
+        max_workers: int | None = None,
+    ) -> dict[Path, dict | None]:
+        """Probe many files concurrently, filling the probe cache.
+
+        Cached files are answered without spawning ffprobe; the rest are
+        probed in parallel (ffprobe is I/O bound, so threads suffice).
+
+        Returns:
+            Probe data per path, or None for files ffprobe couldn't read.
+        """
+        workers = max_workers or self.settings.probe_max_workers
+        results: dict[Path, dict | None] = {}
+
+        def probe(path: Path) -> dict | None:
+            try:
+                return self.get_video_info(path)
+            except (FFmpegError, ValueError) as e:
+                logger.warning("probe_failed", path=str(path), error=str(e))
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, info in zip(paths, executor.map(probe, paths)):
+                results[path] = info
+
+        logger.info(
+            "probe_many_complete",
+            files=len(paths),
+            failed=sum(1 for info in results.values() if info is None),
+        )
+        return results
 
     def validate_clip(self, path: Path) -> dict:
         """Validate a generated clip meets quality requirements.
@@ -243,65 +1104,115 @@ class FFmpegService:
         jobs: list[dict],
         max_workers: int | None = None,
     ) -> list[dict]:
-        """Process multiple FFmpeg jobs in parallel.
+        """Process multiple independent FFmpeg jobs in parallel.
+
+        Runs on a JobGraph, so jobs share the CPU-thread budget and each
+        method runs with its own ``-threads`` allowance. For dependent
+        work (render → validate) build a JobGraph directly.
 
         Args:
-            jobs: List of dicts with 'function' (method name) and 'kwargs'.
+            jobs: List of dicts with 'function' (method name), 'kwargs' and
+                optionally 'priority'.
             max_workers: Max parallel processes (defaults to settings).
 
         Returns:
             List of result dicts with 'success', 'output_path', and 'error'.
         """
-        workers = max_workers or self.settings.ffmpeg_max_workers
-        results = []
+        graph = JobGraph.from_settings(self.settings)
+        if max_workers:
+            graph.max_workers = max_workers
+
+        for n, job in enumerate(jobs):
+            def run(threads: int, job=job):
+                method = getattr(self.with_threads(threads), job["function"])
+                return method(**job["kwargs"])
+
+            graph.add(
+                f"job_{n}",
+                run,
+                threads=threads_per_job(self.settings),
+                priority=job.get("priority", 0),
+            )
 
-        with ProcessPoolExecutor(max_workers=workers) as executor:
-            future_to_job = {}
-            for job in jobs:
-                method = getattr(self, job["function"])
-                future = executor.submit(method, **job["kwargs"])
-                future_to_job[future] = job
-
-            for future in as_completed(future_to_job):
-                job = future_to_job[future]
-                try:
-                    output = future.result()
-                    results.append({
-                        "success": True,
-                        "output_path": str(output),
-                        "job": job,
-                    })
-                except Exception as e:
-                    results.append({
-                        "success": False,
-                        "error": str(e),
-                        "job": job,
-                    })
+        nodes = graph.run()
+        results = []
+        for n, job in enumerate(jobs):
+            node = nodes[f"job_{n}"]
+            if node.status == JobStatus.SUCCEEDED:
+                results.append({
+                    "success": True,
+                    "output_path": str(node.result),
+                    "job": job,
+                })
+            else:
+                results.append({
+                    "success": False,
+                    "error": node.error,
+                    "job": job,
+                })
 
         return results
 
+    def _work_dir(self, output_path: Path, name: str, estimated_bytes: int):
+        """Context manager for an intermediate work directory.
+
+        Uses the scratch area (scratch_dir) when configured and the
+        estimate fits its quota, otherwise ``.<stem>_<name>`` next to the
+        output. The directory is removed on exit.
+        """
+        fallback = output_path.parent / f".{output_path.stem}_{name}"
+        if self.scratch is None:
+            return disk_workdir(fallback)
+        return self.scratch.workdir(name, estimated_bytes, fallback)
+
+    def _get_output_audio_args(self) -> list[str]:
+        """Audio codec and container flags for finished clips."""
+        return ["-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart"]
+
+    def _render_settings(self) -> dict:
+        """Encoder and style settings that affect rendered output (cache key)."""
+        return {
+            "video": self._get_encoder_args(),
+            "audio": self._get_output_audio_args(),
+            "font": self.settings.font_path,
+            "frame": [OUTPUT_WIDTH, OUTPUT_HEIGHT],
+        }
+
     def _get_encoder_args(self) -> list[str]:
         """Get video encoder arguments based on settings."""
         if self.settings.use_nvenc:
             return ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq"]
-        return ["-c:v", "libx264", "-preset", "medium", "-crf", "23"]
+        args = ["-c:v", "libx264", "-preset", "medium", "-crf", "23"]
+        if self.threads:
+            args += ["-threads", str(self.threads)]
+        return args
 
     def _run(
         self,
         cmd: list[str],
         capture_output: bool = False,
+        timeout: int | None = None,
     ) -> subprocess.CompletedProcess:
         """Run an FFmpeg/ffprobe command safely.
 
         SECURITY: Always uses list format, never shell=True.
+
+        Progress is streamed to self.on_progress and the run is aborted
+        when self.cancel_token is cancelled. Resource usage of every
+        invocation is appended to self.run_stats.
+
+        Args:
+            timeout: Overrides ffmpeg_timeout_seconds for long operations.
         """
+        timeout = timeout or self.timeout
         try:
-            result = subprocess.run(
+            result = run_ffmpeg(
                 cmd,
-                capture_output=True,
-                timeout=self.timeout,
-                check=False,
+                timeout=timeout,
+                on_progress=self.on_progress,
+                cancel=self.cancel_token,
             )
+            self.run_stats.append(result.stats)
 
             if result.returncode != 0:
                 stderr = result.stderr.decode(errors="replace")
@@ -316,6 +1227,6 @@ class FFmpegService:
 
         except subprocess.TimeoutExpired:
             raise FFmpegError(
-                f"FFmpeg command timed out after {self.timeout}s",
+                f"FFmpeg command timed out after {timeout}s",
                 command=cmd,
             )
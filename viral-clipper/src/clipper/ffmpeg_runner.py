@@ -0,0 +1,265 @@
+"""Streaming FFmpeg runner with progress, cancellation and resource stats.
+
+``subprocess.run`` blocks until FFmpeg exits, so long encodes give no
+feedback and can only be stopped by the timeout. ``run_ffmpeg`` starts the
+process with ``-progress pipe:1``, parses the key=value progress blocks as
+they arrive and hands each one to a callback (and, throttled, to
+structlog). Between blocks it checks a CancelToken and the deadline.
+
+Every invocation is reaped with ``os.wait4`` so its wall time, CPU time
+and peak RSS are known; they're attached to the result as ``stats``.
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.exceptions import FFmpegCancelledError
+
+logger = structlog.get_logger()
+
+# How often the runner wakes up to check cancellation and the deadline
+POLL_INTERVAL_SECONDS = 0.5
+
+# Progress is logged at most this often per invocation
+PROGRESS_LOG_INTERVAL_SECONDS = 10.0
+
+
+class FFmpegProgress(BaseModel):
+    """One ``-progress`` report from a running FFmpeg process."""
+
+    frame: int = Field(default=0, description="Frames encoded so far")
+    fps: float = Field(default=0.0, description="Current encoding frame rate")
+    speed: float = Field(default=0.0, description="Encode speed relative to realtime")
+    out_time: float = Field(default=0.0, description="Output timestamp reached (seconds)")
+    finished: bool = Field(default=False, description="Whether this is the final report")
+
+
+class FFmpegRunStats(BaseModel):
+    """Resource usage of one FFmpeg/ffprobe invocation."""
+
+    command: str = Field(description="Program name (ffmpeg, ffprobe)")
+    returncode: int | None = Field(default=None, description="Exit code")
+    wall_seconds: float = Field(default=0.0, description="Elapsed wall-clock time")
+    user_cpu_seconds: float = Field(default=0.0, description="User CPU time")
+    system_cpu_seconds: float = Field(default=0.0, description="System CPU time")
+    peak_rss_bytes: int = Field(default=0, description="Peak resident set size")
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.user_cpu_seconds + self.system_cpu_seconds
+
+
+class FFmpegResult(subprocess.CompletedProcess):
+    """CompletedProcess carrying the invocation's FFmpegRunStats."""
+
+    def __init__(self, args, returncode, stdout, stderr, stats: FFmpegRunStats):
+        super().__init__(args, returncode, stdout, stderr)
+        self.stats = stats
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared with running FFmpeg processes."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+ProgressCallback = Callable[[FFmpegProgress], None]
+
+
+def _parse_time(value: str) -> float:
+    """Parse ``HH:MM:SS.micro`` (out_time) into seconds."""
+    try:
+        hours, minutes, seconds = value.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return 0.0
+
+
+def parse_progress_block(fields: dict[str, str]) -> FFmpegProgress:
+    """Build an FFmpegProgress from one block of ``-progress`` key/values."""
+    def number(key: str, cast=float):
+        try:
+            return cast(fields.get(key, "0").rstrip("x"))
+        except ValueError:
+            return cast(0)
+
+    if "out_time" in fields:
+        out_time = _parse_time(fields["out_time"])
+    else:
+        # out_time_us/out_time_ms are both microseconds
+        out_time = number("out_time_us", int) / 1_000_000
+
+    return FFmpegProgress(
+        frame=number("frame", int),
+        fps=number("fps"),
+        speed=number("speed"),
+        out_time=out_time,
+        finished=fields.get("progress") == "end",
+    )
+
+
+def with_progress_args(cmd: list[str]) -> list[str]:
+    """Add ``-progress pipe:1 -nostats`` to an ffmpeg command.
+
+    Commands that aren't ffmpeg, already report progress, or write their
+    output to stdout are returned unchanged.
+    """
+    if not cmd or os.path.basename(cmd[0]) != "ffmpeg":
+        return cmd
+    if "-progress" in cmd or "pipe:1" in cmd or "-" in cmd[1:]:
+        return cmd
+    return [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+
+def _reap(proc: subprocess.Popen) -> tuple[int, object | None]:
+    """Wait for a process, returning its exit code and rusage if available."""
+    if not hasattr(os, "wait4"):
+        return proc.wait(), None
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, rusage
+
+
+def _peak_rss_bytes(rusage) -> int:
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    if sys.platform == "darwin":
+        return int(rusage.ru_maxrss)
+    return int(rusage.ru_maxrss) * 1024
+
+
+def run_ffmpeg(
+    cmd: list[str],
+    timeout: float | None = None,
+    on_progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+) -> FFmpegResult:
+    """Run an FFmpeg/ffprobe command, streaming progress as it runs.
+
+    SECURITY: Always uses list format, never shell=True.
+
+    Args:
+        cmd: Command to run.
+        timeout: Seconds before the process is killed.
+        on_progress: Called with each FFmpegProgress report.
+        cancel: Token checked between reports; cancelling kills the process.
+
+    Returns:
+        FFmpegResult with stdout/stderr bytes and resource stats. Non-zero
+        exit codes are returned, not raised.
+
+    Raises:
+        subprocess.TimeoutExpired: The timeout elapsed.
+        FFmpegCancelledError: The cancel token was set.
+        Exception: Whatever on_progress raised; the process is killed first.
+    """
+    run_cmd = with_progress_args(cmd)
+    streams_progress = run_cmd is not cmd
+    program = os.path.basename(cmd[0]) if cmd else ""
+
+    started = time.monotonic()
+    deadline = started + timeout if timeout else None
+    proc = subprocess.Popen(run_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # Pipes are drained on threads so neither can fill up and block FFmpeg
+    stdout_lines: queue.Queue = queue.Queue()
+    stderr_chunks: list[bytes] = []
+
+    def read_stdout():
+        for line in iter(proc.stdout.readline, b""):
+            stdout_lines.put(line)
+        stdout_lines.put(None)
+
+    def read_stderr():
+        for chunk in iter(lambda: proc.stderr.read(65536), b""):
+            stderr_chunks.append(chunk)
+
+    readers = [
+        threading.Thread(target=read_stdout, daemon=True),
+        threading.Thread(target=read_stderr, daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    stdout_chunks: list[bytes] = []
+    fields: dict[str, str] = {}
+    last_logged = started
+
+    try:
+        while True:
+            if cancel is not None and cancel.cancelled:
+                raise FFmpegCancelledError("FFmpeg command cancelled", command=cmd)
+            if deadline is not None and time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+
+            try:
+                line = stdout_lines.get(timeout=POLL_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+            if line is None:
+                break
+
+            if not streams_progress:
+                stdout_chunks.append(line)
+                continue
+
+            key, _, value = line.decode(errors="replace").strip().partition("=")
+            if not key:
+                continue
+            fields[key] = value
+            if key != "progress":
+                continue
+
+            progress = parse_progress_block(fields)
+            fields = {}
+            if on_progress is not None:
+                on_progress(progress)
+            now = time.monotonic()
+            if now - last_logged >= PROGRESS_LOG_INTERVAL_SECONDS:
+                last_logged = now
+                logger.info(
+                    "ffmpeg_progress",
+                    out_time=progress.out_time,
+                    fps=progress.fps,
+                    speed=progress.speed,
+                )
+    except BaseException:
+        # Cancelled, timed out or the on_progress callback raised: don't
+        # leave FFmpeg running (and the reap below waiting for it)
+        proc.kill()
+        raise
+    finally:
+        returncode, rusage = _reap(proc)
+        for reader in readers:
+            reader.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+        stats = FFmpegRunStats(
+            command=program,
+            returncode=returncode,
+            wall_seconds=round(time.monotonic() - started, 3),
+        )
+        if rusage is not None:
+            stats.user_cpu_seconds = round(rusage.ru_utime, 3)
+            stats.system_cpu_seconds = round(rusage.ru_stime, 3)
+            stats.peak_rss_bytes = _peak_rss_bytes(rusage)
+        logger.debug("ffmpeg_finished", **stats.model_dump())
+
+    return FFmpegResult(
+        cmd, returncode, b"".join(stdout_chunks), b"".join(stderr_chunks), stats
+    )
@@ -0,0 +1,194 @@
+"""Dependency-aware executor for FFmpeg clip work.
+
+Clip work is a small DAG per clip (render → validate, with several clips
+sharing one fan-out render). JobGraph runs such a DAG on a thread pool:
+
+- Jobs declare how many CPU threads they use and are only started while
+  the total stays within the thread budget; the granted count is passed
+  to the job so it can hand ``-threads`` to FFmpeg and concurrent encodes
+  don't oversubscribe the cores.
+- Among ready jobs, higher ``priority`` starts first (ties keep insertion
+  order).
+- A failing job only fails itself; its dependents are skipped and every
+  unrelated job still runs.
+
+Jobs run on threads rather than processes: the work happens in FFmpeg
+subprocesses, so nothing needs pickling.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Any, Callable
+
+import structlog
+
+from src.config import Settings
+
+logger = structlog.get_logger()
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class Job:
+    """One node of a JobGraph.
+
+    ``func`` is called with the number of threads granted to the job.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[int], Any],
+        deps: list[str],
+        threads: int,
+        priority: float,
+        order: int,
+    ):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.threads = threads
+        self.priority = priority
+        self.order = order
+        self.status = JobStatus.PENDING
+        self.result: Any = None
+        self.error: str | None = None
+        self.wall_seconds = 0.0
+
+
+def cpu_thread_budget(settings: Settings) -> int:
+    """Threads shared by concurrent jobs (ffmpeg_thread_budget or all cores)."""
+    return settings.ffmpeg_thread_budget or os.cpu_count() or 1
+
+
+def threads_per_job(settings: Settings) -> int:
+    """Default thread request of one encode."""
+    if settings.ffmpeg_threads_per_job:
+        return settings.ffmpeg_threads_per_job
+    return max(1, cpu_thread_budget(settings) // settings.ffmpeg_max_workers)
+
+
+class JobGraph:
+    """Runs dependent jobs within a CPU-thread budget."""
+
+    def __init__(self, thread_budget: int, max_workers: int):
+        self.thread_budget = max(1, thread_budget)
+        self.max_workers = max(1, max_workers)
+        self.jobs: dict[str, Job] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "JobGraph":
+        return cls(cpu_thread_budget(settings), settings.ffmpeg_max_workers)
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[int], Any],
+        deps: list[str] | None = None,
+        threads: int = 1,
+        priority: float = 0,
+    ) -> Job:
+        """Add a job. Dependencies must already be in the graph.
+
+        Requiring dependencies up front keeps the graph acyclic by
+        construction.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Duplicate job name: {name}")
+        deps = list(deps or [])
+        missing = [d for d in deps if d not in self.jobs]
+        if missing:
+            raise ValueError(f"Job {name} depends on unknown jobs: {missing}")
+
+        job = Job(
+            name=name,
+            func=func,
+            deps=deps,
+            threads=min(max(1, threads), self.thread_budget),
+            priority=priority,
+            order=len(self.jobs),
+        )
+        self.jobs[name] = job
+        return job
+
+    def result(self, name: str) -> Any:
+        return self.jobs[name].result
+
+    def run(self) -> dict[str, Job]:
+        """Run every job, returning them by name with status/result/error."""
+        running: dict[Future, Job] = {}
+        threads_in_use = 0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                self._skip_blocked()
+                ready = sorted(
+                    (j for j in self.jobs.values() if self._is_ready(j)),
+                    key=lambda j: (-j.priority, j.order),
+                )
+
+                for job in ready:
+                    if len(running) >= self.max_workers:
+                        break
+                    if running and threads_in_use + job.threads > self.thread_budget:
+                        continue
+                    job.status = JobStatus.RUNNING
+                    threads_in_use += job.threads
+                    running[executor.submit(self._run_job, job)] = job
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    threads_in_use -= running.pop(future).threads
+
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self.jobs.values():
+            counts[job.status.value] += 1
+        logger.info(
+            "job_graph_complete",
+            jobs=len(self.jobs),
+            thread_budget=self.thread_budget,
+            wall_seconds=round(time.monotonic() - started, 3),
+            **counts,
+        )
+        return self.jobs
+
+    def _is_ready(self, job: Job) -> bool:
+        return job.status == JobStatus.PENDING and all(
+            self.jobs[d].status == JobStatus.SUCCEEDED for d in job.deps
+        )
+
+    def _skip_blocked(self) -> None:
+        """Skip pending jobs with a failed or skipped dependency."""
+        for job in self.jobs.values():
+            if job.status != JobStatus.PENDING:
+                continue
+            blocked = [
+                d for d in job.deps
+                if self.jobs[d].status in (JobStatus.FAILED, JobStatus.SKIPPED)
+            ]
+            if blocked:
+                job.status = JobStatus.SKIPPED
+                job.error = f"Dependency failed: {blocked[0]}"
+
+    def _run_job(self, job: Job) -> None:
+        started = time.monotonic()
+        try:
+            job.result = job.func(job.threads)
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+            logger.error("job_failed", job=job.name, error=job.error)
+        finally:
+            job.wall_seconds = round(time.monotonic() - started, 3)
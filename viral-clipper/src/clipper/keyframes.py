@@ -0,0 +1,97 @@
+"""Per-source keyframe index for frame-accurate, mostly stream-copied cuts.
+
+The index is built once per source from ffprobe's packet listing (demux
+only, no decode) and persisted as a JSON sidecar next to the source file
+(``<source>.keyframes.json``). It is invalidated automatically when the
+source file's size or mtime changes.
+"""
+import bisect
+import json
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+SIDECAR_SUFFIX = ".keyframes.json"
+
+
+class KeyframeIndex:
+    """Sorted video keyframe timestamps (seconds) for one source file."""
+
+    def __init__(self, times: list[float], size: int = 0, mtime_ns: int = 0):
+        self.times = sorted(times)
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def at_or_after(self, t: float) -> float | None:
+        """First keyframe at or after ``t``, or None."""
+        i = bisect.bisect_left(self.times, t)
+        return self.times[i] if i < len(self.times) else None
+
+    def at_or_before(self, t: float) -> float | None:
+        """Last keyframe at or before ``t``, or None."""
+        i = bisect.bisect_right(self.times, t)
+        return self.times[i - 1] if i > 0 else None
+
+    def to_dict(self) -> dict:
+        return {"times": self.times, "size": self.size, "mtime_ns": self.mtime_ns}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KeyframeIndex":
+        return cls(
+            times=[float(t) for t in data.get("times", [])],
+            size=int(data.get("size", 0)),
+            mtime_ns=int(data.get("mtime_ns", 0)),
+        )
+
+
+def sidecar_path(source_path: Path) -> Path:
+    """Where the keyframe index for a source is stored."""
+    return source_path.with_name(source_path.name + SIDECAR_SUFFIX)
+
+
+def parse_packet_csv(output: str) -> list[float]:
+    """Parse ``ffprobe -show_entries packet=pts_time,flags -of csv=p=0``.
+
+    Each line is ``<pts_time>,<flags>``; keyframe packets carry ``K`` in
+    their flags. Packets without a timestamp are skipped.
+    """
+    times = []
+    for line in output.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) < 2 or "K" not in parts[1]:
+            continue
+        try:
+            times.append(float(parts[0]))
+        except ValueError:
+            continue
+    return times
+
+
+def load_index(source_path: Path) -> KeyframeIndex | None:
+    """Load the sidecar index if it exists and still matches the source."""
+    path = sidecar_path(source_path)
+    if not path.exists() or not source_path.exists():
+        return None
+
+    try:
+        index = KeyframeIndex.from_dict(json.loads(path.read_text()))
+    except (ValueError, OSError) as e:
+        logger.warning("keyframe_index_unreadable", path=str(path), error=str(e))
+        return None
+
+    stat = source_path.stat()
+    if index.size != stat.st_size or index.mtime_ns != stat.st_mtime_ns:
+        return None
+    return index
+
+
+def save_index(source_path: Path, index: KeyframeIndex) -> Path:
+    """Persist an index as the source's JSON sidecar."""
+    path = sidecar_path(source_path)
+    path.write_text(json.dumps(index.to_dict()))
+    return path
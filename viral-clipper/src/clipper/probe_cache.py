@@ -0,0 +1,146 @@
+"""Cache of ffprobe metadata keyed by file identity.
+
+Probing the same file several times (smart cut, validation, folder scans)
+spawns a fresh ffprobe process each time. Parsed ``-show_format
+-show_streams`` output is cached here under the file's identity — resolved
+path, size, mtime and inode — so any change to the file invalidates its
+entry without explicit bookkeeping.
+
+Entries live in a bounded in-memory LRU backed by a SQLite store, so they
+survive across worker processes and CLI runs.
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Entries kept in memory per cache (the SQLite store is unbounded)
+MEMORY_MAX_ENTRIES = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    info TEXT NOT NULL
+)
+"""
+
+
+def file_identity(path: Path) -> tuple[str, int, int, int]:
+    """(resolved path, size, mtime_ns, inode) of a file."""
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+class ProbeCache:
+    """In-memory LRU of ffprobe results over a persistent SQLite store."""
+
+    def __init__(self, db_path: Path | None, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._memory: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(_SCHEMA)
+
+    def __getstate__(self) -> dict:
+        # Picklable for process pools: the memory layer is rebuilt lazily
+        return {"db_path": self.db_path, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["db_path"], state["max_entries"])
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, path: Path) -> dict | None:
+        """Cached probe data for a file, or None if missing or stale."""
+        try:
+            identity = file_identity(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            info = self._memory.get(identity)
+            if info is not None:
+                self._memory.move_to_end(identity)
+                self.hits += 1
+                return info
+
+        info = self._load(identity)
+        with self._lock:
+            if info is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(identity, info)
+        return info
+
+    def put(self, path: Path, info: dict) -> None:
+        """Store probe data for a file under its current identity."""
+        try:
+            identity = file_identity(path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._remember(identity, info)
+
+        if self.db_path is None:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probes (path, size, mtime_ns, inode, info) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*identity, json.dumps(info)),
+                )
+        except sqlite3.Error as e:
+            logger.warning("probe_cache_write_failed", path=identity[0], error=str(e))
+
+    def _remember(self, identity: tuple, info: dict) -> None:
+        self._memory[identity] = info
+        self._memory.move_to_end(identity)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, identity: tuple) -> dict | None:
+        if self.db_path is None:
+            return None
+        path, size, mtime_ns, inode = identity
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT info FROM probes "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                    (path, size, mtime_ns, inode),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("probe_cache_read_failed", path=path, error=str(e))
+            return None
+        return json.loads(row[0]) if row else None
+
+
+_shared: dict[Path | None, ProbeCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_probe_cache(db_path: Path | None) -> ProbeCache:
+    """Process-wide cache for a store, so every FFmpegService shares memory."""
+    with _shared_lock:
+        cache = _shared.get(db_path)
+        if cache is None:
+            cache = _shared[db_path] = ProbeCache(db_path)
+        return cache
@@ -0,0 +1,225 @@
+"""Content-addressed cache of rendered clips.
+
+Entries are keyed by a SHA-256 of everything that affects the pixels and
+samples of a render: source fingerprint, start/end, ASS caption content,
+hook text, mute segments, encoder settings and style. Regenerating a clip
+whose inputs haven't changed returns the cached file instead of
+re-encoding.
+
+Besides finished clips, the cache can hold the "base" of a clip (cropped,
+captioned and muted, but without the hook overlay), so iterating on hook
+text only re-renders the overlay.
+
+Size is bounded by ``render_cache_max_bytes``; least recently used
+entries (by mtime, refreshed on every hit) are evicted first. Workers
+may put and evict concurrently: eviction is serialized within a process,
+and entries removed by another process meanwhile are skipped.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+from pathlib import Path
+
+import structlog
+
+from src.clipper.render_plan import RenderPlan
+
+logger = structlog.get_logger()
+
+# Bump when the render graph changes in a way that alters output
+RENDER_VERSION = 1
+
+ENTRY_SUFFIX = ".mp4"
+
+# Markers of keys requested once but not stored (see RenderCache.seen);
+# the oldest beyond this many are dropped on eviction
+MAX_SEEN_MARKERS = 10_000
+
+# Serializes eviction across the RenderCache instances of a process
+_evict_lock = threading.Lock()
+
+
+def _hard_link(source: Path, target: Path) -> bool:
+    """Hard-link source to target, replacing target. False if unsupported."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Different filesystem (e.g. tmpfs scratch) or no hard links
+        return False
+    return True
+
+
+def _stat_files(paths) -> list[tuple[Path, os.stat_result]]:
+    """Stat each path once, skipping files deleted in the meantime."""
+    stats = []
+    for path in paths:
+        try:
+            stats.append((path, path.stat()))
+        except FileNotFoundError:
+            continue
+    return stats
+
+
+def source_fingerprint(path: Path) -> dict:
+    """Cheap identity of a source file: resolved path, size and mtime."""
+    stat = path.stat()
+    return {
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def render_key(plan: RenderPlan, render_settings: dict) -> str:
+    """Hash every input that affects a rendered clip."""
+    ass_content = ""
+    if plan.ass_path is not None and plan.ass_path.exists():
+        ass_content = hashlib.sha256(plan.ass_path.read_bytes()).hexdigest()
+
+    try:
+        fingerprint = source_fingerprint(plan.source_path)
+    except OSError:
+        fingerprint = {"path": str(plan.source_path)}
+
+    payload = {
+        "version": RENDER_VERSION,
+        "source": fingerprint,
+        "start": plan.start_time,
+        "end": plan.end_time,
+        "ass": ass_content,
+        "hook_text": plan.hook_text,
+        "hook_duration": plan.hook_duration if plan.hook_text else None,
+        "mute": [list(s) for s in plan.mute_segments],
+        "settings": render_settings,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class RenderCache:
+    """Disk-backed LRU cache of rendered clips, bounded by total size."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "seen").mkdir(exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def _seen_path(self, key: str) -> Path:
+        return self.root / "seen" / key
+
+    def get(self, key: str) -> Path | None:
+        """Return the cached file for a key (marking it recently used)."""
+        path = self._entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def fetch(self, key: str, output_path: Path, link: bool = False) -> bool:
+        """Copy a cached render to output_path. Returns False on a miss.
+
+        With link=True the file is hard-linked when the filesystem allows
+        it (for intermediates that are only read, never modified). Either
+        way output_path stays valid if the entry is evicted afterwards, so
+        it is safe to use as an FFmpeg input.
+        """
+        cached = self.get(key)
+        if cached is None:
+            return False
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if not (link and _hard_link(cached, output_path)):
+                shutil.copyfile(cached, output_path)
+        except FileNotFoundError:
+            # Evicted between get() and the copy
+            return False
+        logger.info("render_cache_hit", key=key[:12], output=str(output_path))
+        return True
+
+    def put(self, key: str, rendered_path: Path) -> Path | None:
+        """Store a copy of a rendered file, then evict down to the quota.
+
+        Files larger than the whole quota aren't stored.
+        """
+        try:
+            size = rendered_path.stat().st_size
+        except FileNotFoundError:
+            return None
+        if size == 0 or size > self.max_bytes:
+            return None
+
+        path = self._entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Unique per writer, so concurrent puts of one key don't collide
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(rendered_path, tmp_path)
+        tmp_path.replace(path)
+        # Stored now, so the "requested before" marker has served its purpose
+        self._seen_path(key).unlink(missing_ok=True)
+
+        self.evict(keep=path)
+        return path
+
+    def seen(self, key: str) -> bool:
+        """Whether a key was requested before without being stored."""
+        return self._seen_path(key).exists()
+
+    def mark_seen(self, key: str) -> None:
+        self._seen_path(key).touch()
+
+    def _stat_entries(self) -> list[tuple[Path, os.stat_result]]:
+        return [
+            (path, st)
+            for path, st in _stat_files(self.root.glob(f"*/*{ENTRY_SUFFIX}"))
+            if stat.S_ISREG(st.st_mode)
+        ]
+
+    def entries(self) -> list[Path]:
+        return [path for path, _ in self._stat_entries()]
+
+    def total_bytes(self) -> int:
+        return sum(st.st_size for _, st in self._stat_entries())
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Delete least recently used entries until under max_bytes.
+
+        ``keep`` (the entry just stored) is never evicted. Also drops the
+        oldest seen markers beyond MAX_SEEN_MARKERS.
+
+        Returns:
+            Number of entries evicted.
+        """
+        with _evict_lock:
+            entries = sorted(self._stat_entries(), key=lambda e: e[1].st_mtime)
+            total = sum(st.st_size for _, st in entries)
+            evicted = 0
+
+            for path, st in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                path.unlink(missing_ok=True)
+                total -= st.st_size
+                evicted += 1
+
+            markers = sorted(
+                _stat_files((self.root / "seen").iterdir()), key=lambda e: e[1].st_mtime
+            )
+            for path, _ in markers[: max(0, len(markers) - MAX_SEEN_MARKERS)]:
+                path.unlink(missing_ok=True)
+
+        if evicted:
+            logger.info("render_cache_evicted", count=evicted, total_bytes=total)
+        return evicted
@@ -0,0 +1,230 @@
+"""Single-pass render plans for finished clips.
+
+A RenderPlan describes every edit a clip needs (trim, 9:16 crop, burned
+captions, hook overlay, profanity muting) and compiles to one FFmpeg
+``-filter_complex`` graph, so the clip is decoded once and encoded once
+instead of once per stage.
+
+Several plans over the same source can also be compiled into one fan-out
+graph (``split``/``asplit`` + per-clip ``trim``), so one FFmpeg process
+decodes a source region once and writes every clip inside it.
+"""
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+# Output frame for short-form platforms
+OUTPUT_WIDTH = 1080
+OUTPUT_HEIGHT = 1920
+
+# Labels of the final video/audio pads in the compiled graph
+VIDEO_OUT = "[vout]"
+AUDIO_OUT = "[aout]"
+# Labels of the hook-less base pads (see build_base_and_final_filter_complex)
+BASE_VIDEO_OUT = "[vbase]"
+BASE_AUDIO_OUT = "[abase]"
+
+# Fan-out grouping: moments further apart than this are rendered by separate
+# processes, since seeking past the gap is cheaper than decoding through it.
+FANOUT_MAX_GAP_SECONDS = 120.0
+# Cap on clips written by one process (each is a concurrent encoder).
+FANOUT_MAX_OUTPUTS = 6
+
+
+class RenderPlan(BaseModel):
+    """All edits to apply to one clip, rendered in a single FFmpeg pass."""
+
+    source_path: Path = Field(description="Source video to cut from")
+    start_time: float = Field(ge=0, description="Clip start in the source (seconds)")
+    end_time: float = Field(description="Clip end in the source (seconds)")
+    ass_path: Path | None = Field(default=None, description="ASS captions to burn in")
+    hook_text: str = Field(default="", description="Text overlay for the opening seconds")
+    hook_duration: float = Field(default=3.0, description="How long the hook stays on screen")
+    mute_segments: list[tuple[float, float]] = Field(
+        default_factory=list,
+        description="Clip-relative (start, end) ranges to silence",
+    )
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end_time - self.start_time)
+
+
+def escape_filter_path(path: str) -> str:
+    """Escape a file path for use inside an FFmpeg filter argument."""
+    return str(path).replace("\\", "\\\\").replace(":", "\\:").replace("'", "\\'")
+
+
+def crop_filter() -> str:
+    """Center-crop to 9:16 and scale to the output frame."""
+    return f"crop=ih*9/16:ih,scale={OUTPUT_WIDTH}:{OUTPUT_HEIGHT}"
+
+
+def ass_filter(ass_path: Path) -> str:
+    """Burn an ASS subtitle file."""
+    return f"ass={escape_filter_path(str(ass_path))}"
+
+
+def drawtext_filter(hook_text: str, font_path: str, duration: float) -> str:
+    """Draw the hook text near the top of the frame for the first N seconds."""
+    safe_text = hook_text.replace("'", "\u2019").replace(":", "\\:")
+    safe_font = escape_filter_path(font_path)
+    return (
+        f"drawtext=text='{safe_text}'"
+        f":fontfile='{safe_font}'"
+        f":fontsize=48:fontcolor=white:borderw=3:bordercolor=black"
+        f":x=(w-text_w)/2:y=h*0.15"
+        f":enable='between(t,0,{duration})'"
+    )
+
+
+def mute_filter(segments: list[tuple[float, float]]) -> str:
+    """Silence audio inside each (start, end) range."""
+    return ",".join(
+        f"volume=enable='between(t,{start},{end})':volume=0"
+        for start, end in segments
+    )
+
+
+def _trim_args(offset: float, duration: float) -> str:
+    """Arguments for trim/atrim cutting ``duration`` seconds at ``offset``."""
+    if offset:
+        return f"start={offset}:duration={duration}"
+    return f"duration={duration}"
+
+
+def _video_chain(
+    plan: RenderPlan,
+    font_path: str,
+    offset: float,
+    with_hook: bool = True,
+) -> str:
+    """Filters taking source video at ``offset`` to the finished clip frame."""
+    chain = [
+        f"trim={_trim_args(offset, plan.duration)}",
+        "setpts=PTS-STARTPTS",
+        crop_filter(),
+    ]
+    if plan.ass_path is not None:
+        chain.append(ass_filter(plan.ass_path))
+    if with_hook and plan.hook_text:
+        chain.append(drawtext_filter(plan.hook_text, font_path, plan.hook_duration))
+    return ",".join(chain)
+
+
+def _audio_chain(plan: RenderPlan, offset: float) -> str:
+    """Filters taking source audio at ``offset`` to the finished clip audio."""
+    chain = [
+        f"atrim={_trim_args(offset, plan.duration)}",
+        "asetpts=PTS-STARTPTS",
+    ]
+    if plan.mute_segments:
+        chain.append(mute_filter(plan.mute_segments))
+    return ",".join(chain)
+
+
+def build_filter_complex(plan: RenderPlan, font_path: str) -> str:
+    """Compile a RenderPlan into a single ``-filter_complex`` graph.
+
+    The input is expected to be opened with ``-ss plan.start_time`` so the
+    trim filters only need the clip duration. Output pads are VIDEO_OUT
+    and AUDIO_OUT.
+    """
+    return (
+        f"[0:v]{_video_chain(plan, font_path, 0.0)}{VIDEO_OUT};"
+        f"[0:a]{_audio_chain(plan, 0.0)}{AUDIO_OUT}"
+    )
+
+
+def build_base_and_final_filter_complex(plan: RenderPlan, font_path: str) -> str:
+    """Compile a plan into a graph with two outputs from one decode.
+
+    BASE_VIDEO_OUT/BASE_AUDIO_OUT carry the clip without the hook overlay
+    (for caching), VIDEO_OUT/AUDIO_OUT the finished clip.
+    """
+    base_chain = _video_chain(plan, font_path, 0.0, with_hook=False)
+    hook = drawtext_filter(plan.hook_text, font_path, plan.hook_duration)
+    return (
+        f"[0:v]{base_chain},split=2{BASE_VIDEO_OUT}[vhook];"
+        f"[vhook]{hook}{VIDEO_OUT};"
+        f"[0:a]{_audio_chain(plan, 0.0)},asplit=2{BASE_AUDIO_OUT}{AUDIO_OUT}"
+    )
+
+
+def fanout_window(plans: list[RenderPlan]) -> tuple[float, float]:
+    """Source (start, end) range covering every plan in a fan-out group."""
+    return (
+        min(p.start_time for p in plans),
+        max(p.end_time for p in plans),
+    )
+
+
+def build_fanout_filter_complex(
+    plans: list[RenderPlan],
+    font_path: str,
+) -> tuple[str, list[tuple[str, str]]]:
+    """Compile several plans over one source into a single fan-out graph.
+
+    The input is expected to be opened with ``-ss`` at the start of
+    ``fanout_window(plans)``; each branch trims its own clip relative to
+    that point.
+
+    Returns:
+        The graph and a (video_label, audio_label) pair per plan, in order.
+    """
+    window_start, _ = fanout_window(plans)
+    count = len(plans)
+
+    video_inputs = "".join(f"[v{i}]" for i in range(count))
+    audio_inputs = "".join(f"[a{i}]" for i in range(count))
+    parts = [
+        f"[0:v]split={count}{video_inputs}",
+        f"[0:a]asplit={count}{audio_inputs}",
+    ]
+    labels = []
+
+    for i, plan in enumerate(plans):
+        offset = plan.start_time - window_start
+        video_out = f"[vout{i}]"
+        audio_out = f"[aout{i}]"
+        parts.append(f"[v{i}]{_video_chain(plan, font_path, offset)}{video_out}")
+        parts.append(f"[a{i}]{_audio_chain(plan, offset)}{audio_out}")
+        labels.append((video_out, audio_out))
+
+    return ";".join(parts), labels
+
+
+def group_for_fanout(
+    plans: list[RenderPlan],
+    max_gap: float = FANOUT_MAX_GAP_SECONDS,
+    max_outputs: int = FANOUT_MAX_OUTPUTS,
+) -> list[list[int]]:
+    """Group plans into fan-out batches, returned as indices into ``plans``.
+
+    Plans are grouped per source and ordered by start time. A new group
+    starts when the next clip begins more than ``max_gap`` seconds after
+    the group's furthest end, or when the group is full.
+    """
+    order = sorted(
+        range(len(plans)),
+        key=lambda i: (str(plans[i].source_path), plans[i].start_time),
+    )
+    groups: list[list[int]] = []
+    group_end = 0.0
+
+    for i in order:
+        plan = plans[i]
+        current = groups[-1] if groups else None
+        if (
+            current is not None
+            and plans[current[0]].source_path == plan.source_path
+            and len(current) < max_outputs
+            and plan.start_time <= group_end + max_gap
+        ):
+            current.append(i)
+            group_end = max(group_end, plan.end_time)
+        else:
+            groups.append([i])
+            group_end = plan.end_time
+
+    return groups
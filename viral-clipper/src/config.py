@@ -69,6 +69,65 @@ class Settings(BaseSettings):
         default="claude-opus-4-6",
         description="Model for complex analysis (strategy, learning)",
     )
+    llm_backend: str = Field(
+        default="cli",
+        description="LLM backend: cli (claude -p), sdk (Anthropic API) or stub (offline)",
+    )
+    claude_timeout_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Timeout for one Claude request",
+    )
+    claude_max_retries: int = Field(
+        default=2,
+        ge=0,
+        description="Retries of failed API requests (sdk backend)",
+    )
+    claude_max_connections: int = Field(
+        default=8,
+        ge=1,
+        description="Pooled HTTP connections to the API (sdk backend)",
+    )
+    claude_max_tokens: int = Field(
+        default=8192,
+        ge=1,
+        description="Maximum response tokens per API request (sdk backend)",
+    )
+    llm_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Max parallel Claude requests (e.g. transcript windows)",
+    )
+    llm_requests_per_minute: float = Field(
+        default=50.0,
+        ge=0,
+        description="Process-wide Claude request rate limit (0 = unlimited)",
+    )
+    moment_window_max_tokens: int = Field(
+        default=8000,
+        ge=500,
+        description="Estimated transcript tokens per moment detection request",
+    )
+    moment_window_overlap_seconds: float = Field(
+        default=120.0,
+        ge=0,
+        description="Transcript time repeated between consecutive windows",
+    )
+    transcript_compact_encoding: bool = Field(
+        default=True,
+        description="Send transcripts as [start] lines in whole seconds, short segments merged",
+    )
+    transcript_merge_seconds: float = Field(
+        default=6.0,
+        ge=0,
+        description="Merge consecutive segments into lines up to this long (compact encoding)",
+    )
+    llm_stub_latency_seconds: float = Field(
+        default=0.0,
+        ge=0,
+        description="Artificial delay per request of the stub backend (benchmarks)",
+    )
 
     # Security
     encryption_key: str = Field(
@@ -99,12 +158,58 @@ class Settings(BaseSettings):
         default="int8",
         description="Compute type for WhisperX (int8 for CPU, float16 for GPU)",
     )
+    whisperx_batch_size: int = Field(
+        default=16,
+        ge=1,
+        le=128,
+        description="Batch size passed to the WhisperX model",
+    )
     max_concurrent_transcriptions: int = Field(
         default=1,
         ge=1,
         le=10,
         description="Max parallel WhisperX jobs",
     )
+    align_model_cache_max_bytes: int = Field(
+        default=2 * 1024**3,
+        ge=0,
+        description="Memory for alignment models kept loaded between jobs (0 = free after each)",
+    )
+    audio_memmap_threshold_seconds: int = Field(
+        default=7200,
+        ge=0,
+        description="Sources longer than this decode audio into a memory-mapped temp file",
+    )
+    transcription_chunk_threshold_seconds: int = Field(
+        default=3600,
+        ge=60,
+        description="Audio longer than this is transcribed in parallel chunks (CPU only)",
+    )
+    transcription_chunk_seconds: int = Field(
+        default=600,
+        ge=60,
+        description="Target chunk length; cuts are moved to the nearest silence",
+    )
+    transcription_chunk_workers: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes for chunked transcription (0 = one per 4 cores)",
+    )
+
+    # Transcription server — keeps WhisperX models loaded between jobs
+    transcription_server_enabled: bool = Field(
+        default=True,
+        description="Send transcriptions to the transcription server when it's running",
+    )
+    transcription_socket_path: Optional[Path] = Field(
+        default=None,
+        description="Unix socket of the transcription server (default: storage/transcriber.sock)",
+    )
+    transcription_server_timeout_seconds: int = Field(
+        default=14400,
+        ge=1,
+        description="How long a client waits for a queued transcription",
+    )
 
     # FFmpeg
     ffmpeg_max_workers: int = Field(
@@ -113,6 +218,16 @@ class Settings(BaseSettings):
         le=20,
         description="Max parallel FFmpeg processes",
     )
+    ffmpeg_thread_budget: int = Field(
+        default=0,
+        ge=0,
+        description="CPU threads shared by concurrent FFmpeg jobs (0 = all cores)",
+    )
+    ffmpeg_threads_per_job: int = Field(
+        default=0,
+        ge=0,
+        description="FFmpeg -threads per encode (0 = thread budget / max workers)",
+    )
     ffmpeg_timeout_seconds: int = Field(
         default=300,
         description="Timeout for FFmpeg operations",
@@ -121,6 +236,137 @@ class Settings(BaseSettings):
         default=False,
         description="Use NVIDIA NVENC for GPU-accelerated encoding",
     )
+    ffmpeg_smart_cut: bool = Field(
+        default=True,
+        description="Frame-accurate extract_clip cuts (re-encode only the partial GOPs at each end)",
+    )
+
+    hook_variants_per_clip: int = Field(
+        default=1,
+        ge=1,
+        le=5,
+        description="Hook variants rendered per clip (extra ones re-encode only the head)",
+    )
+    hook_batch_size: int = Field(
+        default=10,
+        ge=1,
+        le=50,
+        description="Moments per hook generation request (1 = one request per moment)",
+    )
+    hook_batch_max_tokens: int = Field(
+        default=24000,
+        ge=1000,
+        description="Estimated prompt + response tokens per batched hook request",
+    )
+
+    # Mezzanine — normalized copy of each source made once at ingest
+    mezzanine_enabled: bool = Field(
+        default=False,
+        description="Transcode sources to a short-GOP mezzanine on ingest",
+    )
+    mezzanine_fps: int = Field(
+        default=30,
+        ge=1,
+        le=120,
+        description="Constant frame rate of the mezzanine",
+    )
+    mezzanine_keyframe_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Keyframe interval of the mezzanine in seconds",
+    )
+    mezzanine_audio_rate: int = Field(
+        default=48000,
+        description="Audio sample rate of the mezzanine",
+    )
+    mezzanine_timeout_seconds: int = Field(
+        default=14400,
+        description="Timeout for the mezzanine transcode (full-length sources)",
+    )
+
+    # Scratch — where intermediates between FFmpeg processes are written
+    scratch_dir: Optional[Path] = Field(
+        default=None,
+        description="Fast scratch area for intermediates, e.g. /dev/shm (default: next to output)",
+    )
+    scratch_max_bytes: int = Field(
+        default=2 * 1024**3,
+        ge=0,
+        description="Max bytes of intermediates held in scratch_dir at once",
+    )
+
+    # Render cache — reuse finished clips/bases when inputs are unchanged
+    render_cache_enabled: bool = Field(
+        default=True,
+        description="Cache rendered clips keyed by a hash of their inputs",
+    )
+    render_cache_max_bytes: int = Field(
+        default=10 * 1024**3,
+        ge=0,
+        description="Disk quota for the render cache (LRU eviction above this)",
+    )
+
+    # Captions — word-timed YouTube captions instead of WhisperX
+    download_captions: bool = Field(
+        default=True,
+        description="Fetch captions (manual or automatic) alongside downloaded videos",
+    )
+    caption_language: str = Field(
+        default="en",
+        description="Caption language to fetch",
+    )
+    caption_fast_path: bool = Field(
+        default=True,
+        description="Use a video's word-timed captions instead of transcribing when good enough",
+    )
+    caption_min_timed_ratio: float = Field(
+        default=0.9,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of caption words that must have their own timestamps",
+    )
+
+    # Transcript cache — transcripts keyed by a fingerprint of the decoded audio
+    transcript_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse transcripts of identical audio (any filename or URL)",
+    )
+    transcript_cache_max_bytes: int = Field(
+        default=1024**3,
+        ge=0,
+        description="Size of the transcript cache (LRU eviction above this)",
+    )
+
+    # LLM response cache — Claude responses keyed by prompt, model and template version
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse Claude responses to identical prompts",
+    )
+    llm_cache_ttl_seconds: int = Field(
+        default=30 * 24 * 3600,
+        ge=0,
+        description="Age after which a cached response is no longer used",
+    )
+    llm_cache_max_bytes: int = Field(
+        default=256 * 1024**2,
+        ge=0,
+        description="Size of the LLM response cache (LRU eviction above this)",
+    )
+    llm_cache_refresh: bool = Field(
+        default=False,
+        description="Skip cache lookups and overwrite entries with fresh responses",
+    )
+
+    # Probe cache — ffprobe results keyed by file identity
+    probe_cache_enabled: bool = Field(
+        default=True,
+        description="Cache ffprobe metadata keyed by (path, size, mtime, inode)",
+    )
+    probe_max_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Concurrent ffprobe processes when probing a folder",
+    )
 
     # Font — auto-detected per OS
     font_path: str = Field(
@@ -170,6 +416,36 @@ class Settings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def get_scratch_path(self) -> Path:
+        """Get the directory for small intermediates (scratch_dir or temp)."""
+        if self.scratch_dir is None:
+            return self.get_temp_path()
+        path = self.scratch_dir / "viral-clipper"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get_render_cache_path(self) -> Path:
+        """Get the directory for cached clip renders."""
+        path = self.storage_base_path / "render_cache"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get_probe_cache_path(self) -> Path:
+        """Get the SQLite file holding cached ffprobe results."""
+        return self.storage_base_path / "probe_cache.sqlite3"
+
+    def get_transcript_cache_path(self) -> Path:
+        """Get the SQLite file holding cached transcripts."""
+        return self.storage_base_path / "transcript_cache.sqlite3"
+
+    def get_llm_cache_path(self) -> Path:
+        """Get the SQLite file holding cached LLM responses."""
+        return self.storage_base_path / "llm_cache.sqlite3"
+
+    def get_transcription_socket_path(self) -> Path:
+        """Get the Unix socket path of the transcription server."""
+        return self.transcription_socket_path or self.storage_base_path / "transcriber.sock"
+
     def get_cookies_path(self) -> Path:
         """Get the directory for browser session cookies."""
         path = self.storage_base_path / "cookies"
@@ -21,6 +21,10 @@ class FFmpegError(ViralClipperError):
         self.returncode = returncode
 
 
+class FFmpegCancelledError(FFmpegError):
+    """FFmpeg operation was cancelled before it finished."""
+
+
 class TranscriptionError(ViralClipperError):
     """WhisperX transcription failed."""
 
@@ -0,0 +1,175 @@
+"""Decode a source's audio track straight into memory.
+
+Transcription used to write a 16 kHz WAV next to the video, have
+``whisperx.load_audio`` run FFmpeg again to read it back, then delete it.
+decode_audio runs FFmpeg once with raw ``s16le`` output on stdout and
+converts it block by block into a float32 array, which is what WhisperX
+takes. Nothing is written to disk for normal sources.
+
+The array is preallocated from the probed duration. Sources longer than
+``audio_memmap_threshold_seconds`` are decoded into a memory-mapped
+temp file instead (unlinked as soon as it's mapped), so a multi-hour
+stream doesn't have to fit in RAM.
+
+The returned array can be handed to anything else that needs the
+samples (chunking, fingerprinting) without decoding again.
+"""
+import math
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+import structlog
+
+from src.config import Settings
+from src.exceptions import TranscriptionError
+
+logger = structlog.get_logger()
+
+SAMPLE_RATE = 16000
+
+# Timeout for decoding one source's audio
+AUDIO_DECODE_TIMEOUT_SECONDS = 600
+
+# Bytes read from FFmpeg per block (about 2 s of audio)
+_BLOCK_BYTES = 64 * 1024
+
+
+def audio_decode_command(video_path: Path, sample_rate: int = SAMPLE_RATE) -> list[str]:
+    """FFmpeg command writing mono 16-bit PCM to stdout."""
+    return [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel", "error",
+        "-i", str(video_path),
+        "-vn",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ]
+
+
+def stream_pcm(
+    cmd: list[str],
+    timeout: float = AUDIO_DECODE_TIMEOUT_SECONDS,
+    block_bytes: int = _BLOCK_BYTES,
+) -> Iterator[bytes]:
+    """Yield FFmpeg's stdout in blocks of whole 16-bit samples.
+
+    SECURITY: Always uses list format, never shell=True.
+
+    Raises:
+        TranscriptionError: FFmpeg failed or took longer than ``timeout``.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill_on_timeout)
+    stderr_chunks: list[bytes] = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.extend(iter(lambda: proc.stderr.read(65536), b"")),
+        daemon=True,
+    )
+    timer.start()
+    stderr_reader.start()
+
+    pending = b""
+    try:
+        for block in iter(lambda: proc.stdout.read(block_bytes), b""):
+            block = pending + block
+            usable = len(block) - len(block) % 2
+            pending = block[usable:]
+            if usable:
+                yield block[:usable]
+    finally:
+        # Also reached when the consumer stops early
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        timer.cancel()
+        stderr_reader.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if timed_out.is_set():
+        raise TranscriptionError(f"Audio extraction timed out after {timeout} seconds")
+    if proc.returncode != 0:
+        stderr = b"".join(stderr_chunks).decode(errors="replace")
+        raise TranscriptionError(f"Audio extraction failed: {stderr}")
+
+
+def _probe_duration(video_path: Path, settings: Settings) -> float | None:
+    """Source duration from the (cached) probe, if it can be read."""
+    from src.clipper.ffmpeg_ops import FFmpegService
+
+    try:
+        info = FFmpegService(settings).get_video_info(video_path)
+        return float(info["format"]["duration"])
+    except Exception:
+        return None
+
+
+def _allocate(samples: int, memmap_dir: Path | None) -> Any:
+    import numpy as np
+
+    if memmap_dir is None:
+        return np.empty(samples, dtype=np.float32)
+    with tempfile.NamedTemporaryFile(dir=memmap_dir, prefix="audio_", suffix=".f32") as f:
+        # The mapping keeps the file alive after it's unlinked on exit
+        return np.memmap(f.name, dtype=np.float32, mode="w+", shape=(samples,))
+
+
+def decode_audio(
+    video_path: Path,
+    settings: Settings,
+    sample_rate: int = SAMPLE_RATE,
+) -> Any:
+    """Decode a video's audio to a mono float32 array in [-1, 1).
+
+    Args:
+        video_path: Source video (or audio) file.
+        settings: Application settings (memmap threshold, temp path).
+        sample_rate: Output sample rate.
+
+    Returns:
+        numpy float32 array (an np.memmap for very long sources).
+
+    Raises:
+        TranscriptionError: FFmpeg failed or timed out.
+    """
+    import numpy as np
+
+    duration = _probe_duration(video_path, settings)
+    memmap_dir = None
+    if duration and duration > settings.audio_memmap_threshold_seconds:
+        memmap_dir = settings.get_temp_path()
+    # One second of slack for streams slightly longer than the container
+    capacity = math.ceil(((duration or 600) + 1) * sample_rate)
+    samples = _allocate(capacity, memmap_dir)
+    filled = 0
+
+    for block in stream_pcm(audio_decode_command(video_path, sample_rate)):
+        pcm = np.frombuffer(block, dtype="<i2")
+        if filled + len(pcm) > capacity:
+            capacity = max(filled + len(pcm), int(capacity * 1.5))
+            grown = _allocate(capacity, memmap_dir)
+            grown[:filled] = samples[:filled]
+            samples = grown
+        np.multiply(pcm, 1 / 32768, out=samples[filled:filled + len(pcm)], casting="unsafe")
+        filled += len(pcm)
+
+    logger.info(
+        "audio_decoded",
+        video=str(video_path),
+        seconds=round(filled / sample_rate, 1),
+        memmap=memmap_dir is not None,
+    )
+    return samples[:filled]
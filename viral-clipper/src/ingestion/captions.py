@@ -0,0 +1,243 @@
+"""Transcripts from existing word-timed captions (WebVTT and SRV3).
+
+YouTube auto-captions already carry a timestamp per word, either as
+``word<00:00:04.319><c> next</c>`` tags in WebVTT or as ``<s t="...">``
+spans in SRV3. Parsing them takes milliseconds, where WhisperX takes
+minutes of CPU. The parsers here produce the same structure WhisperX
+does (segments with text and words with start/end), so downstream code
+can't tell the difference. The result also has ``"source": "captions"``
+and ``timed_word_ratio``.
+
+Auto-captions "roll": each cue repeats the previous line and adds a new
+one, and 10 ms cues in between repeat text with no new words. Only newly
+added words are kept. Lines without per-word timings (manual captions,
+single-word lines) have their words spread evenly over the cue;
+``timed_word_ratio`` is the fraction of words that had real timings.
+"""
+import glob
+import html
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.config import Settings
+
+logger = structlog.get_logger()
+
+CAPTION_SUFFIXES = (".srv3", ".vtt")
+
+# Cues shorter than this only redisplay text (rolling-caption transitions)
+_TRANSITION_SECONDS = 0.05
+
+# A word's end is the next word's start, capped so pauses aren't absorbed
+MAX_WORD_SECONDS = 1.5
+
+_TIMING_LINE = re.compile(
+    r"^(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+)
+_INLINE_TIMESTAMP = re.compile(r"<(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})>")
+_TAG = re.compile(r"</?[^>]+>")
+# Whole-line annotations such as [Music] or [Applause]
+_ANNOTATION = re.compile(r"^\[[^\]]*\]$")
+
+
+def _seconds(hours, minutes, seconds, millis) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def _clean(text: str) -> str:
+    return " ".join(html.unescape(_TAG.sub("", text)).split())
+
+
+class _Builder:
+    """Collects new words into WhisperX-style segments."""
+
+    def __init__(self):
+        self.segments: list[dict[str, Any]] = []
+        self.timed_words = 0
+        self.untimed_words = 0
+
+    def add_timed(self, words: list[tuple[float, str]], cue_end: float) -> None:
+        """Words with known start times, in order."""
+        entries = []
+        for i, (start, text) in enumerate(words):
+            next_start = words[i + 1][0] if i + 1 < len(words) else cue_end
+            end = min(max(next_start, start), start + MAX_WORD_SECONDS)
+            entries.append({"word": text, "start": round(start, 3), "end": round(end, 3)})
+        self.timed_words += len(entries)
+        self._add(entries)
+
+    def add_untimed(self, text: str, start: float, end: float) -> None:
+        """A line of words with only cue timing: spread them evenly."""
+        words = text.split()
+        if not words:
+            return
+        step = (end - start) / len(words)
+        self.untimed_words += len(words)
+        self._add([
+            {
+                "word": word,
+                "start": round(start + i * step, 3),
+                "end": round(start + (i + 1) * step, 3),
+            }
+            for i, word in enumerate(words)
+        ])
+
+    def _add(self, words: list[dict]) -> None:
+        words = [w for w in words if w["word"]]
+        if not words:
+            return
+        self.segments.append({
+            "start": words[0]["start"],
+            "end": words[-1]["end"],
+            "text": " ".join(w["word"] for w in words),
+            "words": words,
+        })
+
+    def transcript(self, language: str | None) -> dict[str, Any]:
+        total = self.timed_words + self.untimed_words
+        return {
+            "segments": self.segments,
+            "language": language or "en",
+            "source": "captions",
+            "timed_word_ratio": round(self.timed_words / total, 3) if total else 0.0,
+        }
+
+
+def _timed_words(line: str, cue_start: float) -> list[tuple[float, str]]:
+    """Split a VTT line with inline timestamps into (start, word) pairs."""
+    words = []
+    start = cue_start
+    position = 0
+    for match in _INLINE_TIMESTAMP.finditer(line):
+        text = _clean(line[position:match.start()])
+        if text:
+            words.append((start, text))
+        start = _seconds(*match.groups())
+        position = match.end()
+    text = _clean(line[position:])
+    if text:
+        words.append((start, text))
+    return words
+
+
+def parse_vtt(text: str) -> dict[str, Any]:
+    """Parse WebVTT (including YouTube rolling auto-captions)."""
+    language = None
+    match = re.search(r"^Language:\s*(\S+)", text, re.MULTILINE)
+    if match:
+        language = match.group(1)
+
+    builder = _Builder()
+    last_line = None
+    # Cues end at an empty line; YouTube's " " lines are cue text
+    for block in re.split(r"\n{2,}", text.replace("\r\n", "\n")):
+        lines = block.split("\n")
+        timing_index = next(
+            (i for i, line in enumerate(lines) if _TIMING_LINE.match(line.strip())), None
+        )
+        if timing_index is None:
+            continue
+        groups = _TIMING_LINE.match(lines[timing_index].strip()).groups()
+        cue_start, cue_end = _seconds(*groups[:4]), _seconds(*groups[4:])
+        if cue_end - cue_start < _TRANSITION_SECONDS:
+            continue
+
+        for line in lines[timing_index + 1:]:
+            if _INLINE_TIMESTAMP.search(line):
+                words = _timed_words(line, cue_start)
+                builder.add_timed(words, cue_end)
+                last_line = " ".join(word for _, word in words)
+                continue
+            cleaned = _clean(line)
+            # Repeated previous line of a rolling caption, or an annotation
+            if not cleaned or cleaned == last_line or _ANNOTATION.match(cleaned):
+                continue
+            builder.add_untimed(cleaned, cue_start, cue_end)
+            last_line = cleaned
+
+    return builder.transcript(language)
+
+
+def parse_srv3(text: str) -> dict[str, Any]:
+    """Parse YouTube's SRV3 (``<timedtext format="3">``) XML."""
+    root = ET.fromstring(text)
+    builder = _Builder()
+    for p in root.iter("p"):
+        start = int(p.get("t", 0)) / 1000
+        end = start + int(p.get("d", 0)) / 1000
+        spans = list(p.iter("s"))
+        if spans:
+            words = []
+            for s in spans:
+                word = _clean(s.text or "")
+                if word:
+                    words.append((start + int(s.get("t", 0)) / 1000, word))
+            builder.add_timed(words, end)
+            continue
+        cleaned = _clean("".join(p.itertext()))
+        if cleaned and not _ANNOTATION.match(cleaned):
+            builder.add_untimed(cleaned, start, end)
+
+    return builder.transcript(root.get("lang") or None)
+
+
+def parse_captions(path: Path) -> dict[str, Any]:
+    """Parse a .vtt or .srv3 caption file into a WhisperX-style transcript."""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix == ".srv3":
+        return parse_srv3(text)
+    return parse_vtt(text)
+
+
+def find_caption_file(video_path: Path) -> Path | None:
+    """A caption file saved next to a video (``<stem>.<lang>.vtt`` etc.).
+
+    English and SRV3 are preferred when several are present.
+    """
+    candidates = [
+        p for p in video_path.parent.glob(f"{glob.escape(video_path.stem)}.*")
+        if p.suffix in CAPTION_SUFFIXES
+    ]
+    if not candidates:
+        return None
+    return min(
+        candidates,
+        key=lambda p: (
+            ".en" not in p.suffixes,
+            CAPTION_SUFFIXES.index(p.suffix),
+            p.name,
+        ),
+    )
+
+
+def load_caption_transcript(video_path: Path, settings: Settings) -> dict[str, Any] | None:
+    """Transcript from the video's captions if they're good enough to skip ASR.
+
+    Good enough means at least ``caption_min_timed_ratio`` of the words
+    have their own timestamps. Returns None otherwise, or when there are
+    no captions or they can't be parsed.
+    """
+    if not settings.caption_fast_path:
+        return None
+    path = find_caption_file(video_path)
+    if path is None:
+        return None
+
+    try:
+        transcript = parse_captions(path)
+    except (ET.ParseError, ValueError, OSError) as e:
+        logger.warning("captions_unreadable", path=str(path), error=str(e))
+        return None
+
+    quality = transcript["timed_word_ratio"]
+    words = sum(len(s["words"]) for s in transcript["segments"])
+    if quality < settings.caption_min_timed_ratio:
+        logger.info("captions_not_good_enough", path=str(path), words=words, quality=quality)
+        return None
+
+    logger.info("transcript_from_captions", path=str(path), words=words, quality=quality)
+    return transcript
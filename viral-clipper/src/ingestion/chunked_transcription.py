@@ -0,0 +1,207 @@
+"""Parallel transcription of long audio in silence-bounded chunks.
+
+A multi-hour source transcribed as one piece runs on a single model
+instance from start to finish. For long audio on CPU, WhisperXTranscriber
+instead:
+
+1. picks split points near every ``transcription_chunk_seconds`` mark, at
+   the quietest frame (lowest RMS energy) within a search window, so cuts
+   land in pauses rather than mid-word;
+2. transcribes and aligns the chunks on a process pool, each worker
+   holding its own model and using its share of the cores;
+3. stitches the chunk results back together, shifting segment and word
+   timestamps by each chunk's offset.
+
+The split and stitch logic works on plain Python sequences; only the
+energy computation and the workers need numpy/whisperx.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Sequence
+
+import structlog
+
+from src.config import Settings
+from src.ingestion.audio import SAMPLE_RATE
+
+logger = structlog.get_logger()
+
+# Energy frame length for the silence search
+FRAME_SECONDS = 0.1
+
+# How far either side of a chunk mark the quietest frame is looked for
+SPLIT_SEARCH_SECONDS = 30.0
+
+# CPU threads given to each worker's model when the worker count is automatic
+THREADS_PER_WORKER = 4
+
+
+def chunk_workers(settings: Settings, chunks: int) -> int:
+    """Worker processes for a chunked transcription."""
+    workers = settings.transcription_chunk_workers
+    if not workers:
+        workers = (os.cpu_count() or 1) // THREADS_PER_WORKER
+    return max(1, min(workers, chunks))
+
+
+def frame_energies(audio: Any, sample_rate: int = SAMPLE_RATE) -> list[float]:
+    """Mean-square energy of consecutive FRAME_SECONDS frames of a float audio array."""
+    import numpy as np
+
+    frame = int(FRAME_SECONDS * sample_rate)
+    usable = len(audio) // frame * frame
+    frames = np.asarray(audio[:usable], dtype=np.float32).reshape(-1, frame)
+    # einsum avoids a squared copy of the whole (multi-hour) signal
+    return (np.einsum("ij,ij->i", frames, frames) / frame).tolist()
+
+
+def choose_split_points(
+    energies: Sequence[float],
+    chunk_seconds: float,
+    frame_seconds: float = FRAME_SECONDS,
+    search_seconds: float = SPLIT_SEARCH_SECONDS,
+) -> list[float]:
+    """Split times (seconds) near each chunk_seconds mark, at the quietest frame.
+
+    The last chunk absorbs any remainder shorter than half a chunk rather
+    than becoming a tiny chunk of its own.
+    """
+    duration = len(energies) * frame_seconds
+    search = min(search_seconds, chunk_seconds / 4)
+    splits: list[float] = []
+    previous = 0.0
+
+    while duration - previous > chunk_seconds * 1.5:
+        target = previous + chunk_seconds
+        lo = max(0, int((target - search) / frame_seconds))
+        hi = min(len(energies), int((target + search) / frame_seconds) + 1)
+        quietest = min(range(lo, hi), key=lambda i: (energies[i], abs(i * frame_seconds - target)))
+        # Cut in the middle of the quiet frame
+        previous = round((quietest + 0.5) * frame_seconds, 3)
+        splits.append(previous)
+
+    return splits
+
+
+def stitch_chunks(chunks: Sequence[tuple[float, list[dict]]]) -> list[dict]:
+    """Concatenate chunk segments, shifting timestamps by each chunk's offset."""
+    segments: list[dict] = []
+    for offset, chunk_segments in chunks:
+        for segment in chunk_segments:
+            segment = dict(segment)
+            for key in ("start", "end"):
+                if isinstance(segment.get(key), (int, float)):
+                    segment[key] = round(segment[key] + offset, 3)
+            if "words" in segment:
+                segment["words"] = [_shift(word, offset) for word in segment["words"]]
+            segments.append(segment)
+    return segments
+
+
+def _shift(word: dict, offset: float) -> dict:
+    word = dict(word)
+    for key in ("start", "end"):
+        # Words WhisperX couldn't align have no timestamps
+        if isinstance(word.get(key), (int, float)):
+            word[key] = round(word[key] + offset, 3)
+    return word
+
+
+# Per-process state of chunk workers
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(
+    model: str,
+    device: str,
+    compute_type: str,
+    threads: int,
+    batch_size: int,
+) -> None:
+    import whisperx
+
+    _worker["device"] = device
+    _worker["batch_size"] = batch_size
+    _worker["model"] = whisperx.load_model(
+        model, device=device, compute_type=compute_type, threads=threads
+    )
+    _worker["align"] = {}
+
+
+def _transcribe_chunk(audio: Any, language: str) -> tuple[list[dict], str]:
+    """Transcribe and align one chunk in a worker process."""
+    import whisperx
+
+    result = _worker["model"].transcribe(
+        audio, batch_size=_worker["batch_size"], language=language
+    )
+    language = result.get("language", language)
+    try:
+        if language not in _worker["align"]:
+            _worker["align"][language] = whisperx.load_align_model(
+                language_code=language, device=_worker["device"]
+            )
+        align_model, align_metadata = _worker["align"][language]
+        result = whisperx.align(
+            result["segments"],
+            align_model,
+            align_metadata,
+            audio,
+            device=_worker["device"],
+            return_char_alignments=False,
+        )
+    except Exception as e:
+        logger.warning("alignment_failed_using_segment_timestamps", error=str(e))
+    return result.get("segments", []), language
+
+
+def transcribe_chunked(audio: Any, settings: Settings, language: str = "en") -> dict[str, Any]:
+    """Transcribe long audio in parallel chunks.
+
+    Args:
+        audio: 16 kHz mono float32 samples (as from decode_audio).
+        settings: Application settings (model, chunk size, workers).
+        language: Language passed to the model.
+
+    Returns:
+        WhisperX-style dict with aligned, time-shifted segments.
+    """
+    splits = choose_split_points(frame_energies(audio), settings.transcription_chunk_seconds)
+    bounds = [0, *(int(t * SAMPLE_RATE) for t in splits), len(audio)]
+    chunks = [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+    workers = chunk_workers(settings, len(chunks))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    logger.info(
+        "chunked_transcription_started",
+        duration_seconds=round(len(audio) / SAMPLE_RATE, 1),
+        chunks=len(chunks),
+        workers=workers,
+        threads_per_worker=threads,
+    )
+
+    # spawn: forking a process that holds model/server threads isn't safe
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            settings.whisperx_model,
+            settings.whisperx_device,
+            settings.whisperx_compute_type,
+            threads,
+            settings.whisperx_batch_size,
+        ),
+    ) as pool:
+        futures = [
+            pool.submit(_transcribe_chunk, audio[start:end], language)
+            for start, end in chunks
+        ]
+        results = [future.result() for future in futures]
+
+    segments = stitch_chunks([
+        (start / SAMPLE_RATE, chunk_segments)
+        for (start, _), (chunk_segments, _) in zip(chunks, results)
+    ])
+    return {"segments": segments, "language": results[0][1] if results else language}
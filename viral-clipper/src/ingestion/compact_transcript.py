@@ -0,0 +1,377 @@
+"""Compact columnar representation of WhisperX transcripts.
+
+The WhisperX dict format keeps one Python dict per word (plus a float
+object per timestamp and a str per word), which costs a few hundred bytes
+per word; multi-hour sources run to hundreds of thousands of words.
+CompactTranscript stores the same data as typed ``array`` columns:
+
+- segments: start/end, text and speaker (string ids), and the offset of
+  each segment's first word
+- words: start/end/score, word and speaker (string ids)
+- one interned string table shared by every text column
+
+Times and scores are held as int32 thousandths when every value in the
+column is exactly representable that way (WhisperX rounds to 3 decimals),
+otherwise as float64. Speaker columns are only allocated when the
+transcript is diarized. That comes to about 16 bytes per word.
+
+Keys outside the WhisperX schema (or schema keys with unexpected types)
+are kept in sparse side tables, so ``from_dict``/``to_dict`` round-trip
+exactly. Integer times and scores go in the columns like floats, with
+the keys listed under ``__int_keys__`` in the side table so they come
+back as ints.
+
+``to_bytes``/``from_bytes`` give a zlib-compressed binary form: a small
+JSON header (string table, side tables, column types) followed by the raw
+column buffers in little-endian order. (numpy, msgpack and zstd aren't
+dependencies of this project, so only the standard library is used.)
+"""
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Iterator
+
+MAGIC = b"VCTR"
+FORMAT_VERSION = 1
+
+_NO_STRING = -1
+# Missing value in quantized (int32) columns
+_NO_VALUE = -(2**31)
+_QUANTUM = 1000
+
+_SEGMENT_KEYS = {"start", "end", "text", "speaker", "words"}
+_WORD_KEYS = {"word", "start", "end", "score", "speaker"}
+_NUMBER_KEYS = {"start", "end", "score"}
+_STRING_KEYS = {"text", "word", "speaker"}
+# Side-table marker: number keys whose value was an int
+_INT_KEYS = "__int_keys__"
+# Ints beyond this lose precision as float64
+_MAX_EXACT_INT = 2**53
+
+# Columns in serialization order
+_NUMBER_COLUMNS = ("seg_start", "seg_end", "word_start", "word_end", "word_score")
+_STRING_COLUMNS = ("seg_text", "seg_speaker", "word_text", "word_speaker")
+_COLUMNS = (*_NUMBER_COLUMNS, *_STRING_COLUMNS, "seg_word_offset")
+
+
+class CompactTranscript:
+    """WhisperX transcript stored as typed columns and a string table."""
+
+    __slots__ = (
+        "language",
+        "strings",
+        "extra",
+        "seg_extra",
+        "word_extra",
+        "_string_ids",
+        *_COLUMNS,
+    )
+
+    def __init__(self):
+        self.language: str | None = None
+        self.strings: list[str] = []
+        # Top-level keys other than segments/language
+        self.extra: dict[str, Any] = {}
+        # Non-columnar keys per segment/word index (usually empty)
+        self.seg_extra: dict[int, dict] = {}
+        self.word_extra: dict[int, dict] = {}
+        self._string_ids: dict[str, int] = {}
+        for name in _NUMBER_COLUMNS:
+            setattr(self, name, array("d"))
+        for name in _STRING_COLUMNS:
+            setattr(self, name, array("i"))
+        self.seg_word_offset = array("q", [0])
+
+    def __len__(self) -> int:
+        """Number of segments."""
+        return len(self.seg_start)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_start)
+
+    def _intern(self, value: str | None) -> int:
+        if value is None:
+            return _NO_STRING
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def _string(self, column: array, index: int) -> str | None:
+        # Empty speaker columns mean "no speakers"
+        if index >= len(column) or column[index] == _NO_STRING:
+            return None
+        return self.strings[column[index]]
+
+    @staticmethod
+    def _number(column: array, index: int) -> float | None:
+        value = column[index]
+        if column.typecode == "i":
+            return None if value == _NO_VALUE else value / _QUANTUM
+        return None if math.isnan(value) else value
+
+    @classmethod
+    def from_dict(cls, transcript: dict[str, Any]) -> "CompactTranscript":
+        """Build from the WhisperX dict format (Source.transcript_json)."""
+        compact = cls()
+        compact.language = transcript.get("language")
+        compact.extra = {
+            k: v for k, v in transcript.items() if k not in ("segments", "language")
+        }
+
+        for seg_index, segment in enumerate(transcript.get("segments", [])):
+            segment, extra = _split_schema(segment, _SEGMENT_KEYS)
+            compact.seg_start.append(segment.get("start", math.nan))
+            compact.seg_end.append(segment.get("end", math.nan))
+            compact.seg_text.append(compact._intern(segment.get("text")))
+            compact.seg_speaker.append(compact._intern(segment.get("speaker")))
+            if "words" not in segment:
+                extra["__no_words__"] = True
+            if extra:
+                compact.seg_extra[seg_index] = extra
+
+            for word in segment.get("words", []):
+                word_index = len(compact.word_start)
+                word, extra = _split_schema(word, _WORD_KEYS)
+                compact.word_start.append(word.get("start", math.nan))
+                compact.word_end.append(word.get("end", math.nan))
+                compact.word_score.append(word.get("score", math.nan))
+                compact.word_text.append(compact._intern(word.get("word")))
+                compact.word_speaker.append(compact._intern(word.get("speaker")))
+                if extra:
+                    compact.word_extra[word_index] = extra
+
+            compact.seg_word_offset.append(len(compact.word_start))
+
+        for name in _NUMBER_COLUMNS:
+            setattr(compact, name, _quantize(getattr(compact, name)))
+        for name in ("seg_speaker", "word_speaker"):
+            if all(v == _NO_STRING for v in getattr(compact, name)):
+                setattr(compact, name, array("i"))
+        return compact
+
+    def _intervals(
+        self, starts: array, ends: array, extras: dict[int, dict]
+    ) -> list[tuple[float, float]]:
+        # Missing times count as 0, like .get("start", 0) on the dict form.
+        # Times kept in the side table (e.g. ints stored before they were
+        # columnar) are read from there.
+        intervals = []
+        for i in range(len(starts)):
+            start, end = self._number(starts, i), self._number(ends, i)
+            if (start is None or end is None) and i in extras:
+                extra = extras[i]
+                start = _side_number(extra, "start") if start is None else start
+                end = _side_number(extra, "end") if end is None else end
+            intervals.append((start or 0, end or 0))
+        return intervals
+
+    def segment_end(self, index: int) -> float | None:
+        return self._number(self.seg_end, index)
+
+    def segment_intervals(self) -> list[tuple[float, float]]:
+        """(start, end) of every segment, read from the columns."""
+        return self._intervals(self.seg_start, self.seg_end, self.seg_extra)
+
+    def word_intervals(self) -> list[tuple[float, float]]:
+        """(start, end) of every word, read from the columns."""
+        return self._intervals(self.word_start, self.word_end, self.word_extra)
+
+    def segment_spans(self) -> Iterator[tuple[float, float, str]]:
+        """(start, end, text) of every segment, without building word dicts."""
+        for i, (start, end) in enumerate(self.segment_intervals()):
+            yield start, end, self._string(self.seg_text, i) or ""
+
+    def words_in_range(self, start_time: float, end_time: float) -> list[dict[str, Any]]:
+        """Words overlapping [start_time, end_time] as dicts, in transcript order.
+
+        Only the matching words are materialized.
+        """
+        from src.ingestion.transcript_index import get_transcript_index
+
+        return get_transcript_index(self).words_in_range(start_time, end_time)
+
+    def segments_in_range(self, start_time: float, end_time: float) -> list[dict[str, Any]]:
+        """Segments overlapping [start_time, end_time] as dicts, in transcript order."""
+        from src.ingestion.transcript_index import get_transcript_index
+
+        return get_transcript_index(self).segments_in_range(start_time, end_time)
+
+    def word_dict(self, index: int) -> dict[str, Any]:
+        """One word in the WhisperX dict format."""
+        word: dict[str, Any] = {}
+        text = self._string(self.word_text, index)
+        if text is not None:
+            word["word"] = text
+        for key, column in (
+            ("start", self.word_start),
+            ("end", self.word_end),
+            ("score", self.word_score),
+        ):
+            value = self._number(column, index)
+            if value is not None:
+                word[key] = value
+        speaker = self._string(self.word_speaker, index)
+        if speaker is not None:
+            word["speaker"] = speaker
+        extra = dict(self.word_extra.get(index, {}))
+        _restore_ints(word, extra.pop(_INT_KEYS, ()))
+        word.update(extra)
+        return word
+
+    def segment_dict(self, index: int) -> dict[str, Any]:
+        """One segment (with its words) in the WhisperX dict format."""
+        segment: dict[str, Any] = {}
+        for key, column in (("start", self.seg_start), ("end", self.seg_end)):
+            value = self._number(column, index)
+            if value is not None:
+                segment[key] = value
+        text = self._string(self.seg_text, index)
+        if text is not None:
+            segment["text"] = text
+        speaker = self._string(self.seg_speaker, index)
+        if speaker is not None:
+            segment["speaker"] = speaker
+
+        extra = dict(self.seg_extra.get(index, {}))
+        _restore_ints(segment, extra.pop(_INT_KEYS, ()))
+        if not extra.pop("__no_words__", False):
+            first, last = self.seg_word_offset[index], self.seg_word_offset[index + 1]
+            segment["words"] = [self.word_dict(i) for i in range(first, last)]
+        segment.update(extra)
+        return segment
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert back to the WhisperX dict format.
+
+        Builds a dict per segment and word; prefer the range lookups and
+        ``segment_spans`` for reading.
+        """
+        transcript: dict[str, Any] = {
+            "segments": [self.segment_dict(i) for i in range(len(self))],
+        }
+        if self.language is not None:
+            transcript["language"] = self.language
+        transcript.update(self.extra)
+        return transcript
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and string table."""
+        columns = sum(
+            getattr(self, name).itemsize * len(getattr(self, name)) for name in _COLUMNS
+        )
+        strings = sum(sys.getsizeof(s) for s in self.strings)
+        return columns + strings
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compressed binary format."""
+        columns = [getattr(self, name) for name in _COLUMNS]
+        header = json.dumps({
+            "language": self.language,
+            "strings": self.strings,
+            "extra": self.extra,
+            "seg_extra": {str(k): v for k, v in self.seg_extra.items()},
+            "word_extra": {str(k): v for k, v in self.word_extra.items()},
+            "columns": [[c.typecode, len(c)] for c in columns],
+        }, separators=(",", ":")).encode()
+
+        parts = [struct.pack("<I", len(header)), header]
+        for column in columns:
+            if sys.byteorder != "little":
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+
+        payload = zlib.compress(b"".join(parts), level=6)
+        return MAGIC + struct.pack("<H", FORMAT_VERSION) + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactTranscript":
+        """Load from the format written by to_bytes."""
+        if data[:4] != MAGIC:
+            raise ValueError("Not a compact transcript")
+        (version,) = struct.unpack_from("<H", data, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact transcript version {version}")
+
+        payload = zlib.decompress(data[6:])
+        (header_len,) = struct.unpack_from("<I", payload, 0)
+        header = json.loads(payload[4:4 + header_len])
+        offset = 4 + header_len
+
+        compact = cls()
+        compact.language = header["language"]
+        compact.strings = header["strings"]
+        compact._string_ids = {s: i for i, s in enumerate(compact.strings)}
+        compact.extra = header["extra"]
+        compact.seg_extra = {int(k): v for k, v in header["seg_extra"].items()}
+        compact.word_extra = {int(k): v for k, v in header["word_extra"].items()}
+
+        for name, (typecode, length) in zip(_COLUMNS, header["columns"]):
+            column = array(typecode)
+            size = column.itemsize * length
+            column.frombytes(payload[offset:offset + size])
+            if sys.byteorder != "little":
+                column.byteswap()
+            setattr(compact, name, column)
+            offset += size
+
+        return compact
+
+
+def _split_schema(item: dict, schema: set[str]) -> tuple[dict, dict]:
+    """Split a dict into values the columns can hold and everything else.
+
+    Schema keys with unexpected types (None, a non-list "words") go to the
+    side table so round-trips stay exact. Integer numbers stay columnar,
+    listed under ``__int_keys__`` so they come back as ints.
+    """
+    columnar, extra = {}, {}
+    for key, value in item.items():
+        if key not in schema:
+            extra[key] = value
+        elif key in _NUMBER_KEYS and type(value) is int and abs(value) < _MAX_EXACT_INT:
+            columnar[key] = float(value)
+            extra.setdefault(_INT_KEYS, []).append(key)
+        elif key in _NUMBER_KEYS and (type(value) is not float or math.isnan(value)):
+            extra[key] = value
+        elif key in _STRING_KEYS and not isinstance(value, str):
+            extra[key] = value
+        elif key == "words" and not isinstance(value, list):
+            extra[key] = value
+        else:
+            columnar[key] = value
+    return columnar, extra
+
+
+def _restore_ints(item: dict, keys) -> None:
+    for key in keys:
+        if key in item:
+            item[key] = int(item[key])
+
+
+def _side_number(extra: dict, key: str) -> float | None:
+    value = extra.get(key)
+    if type(value) in (int, float) and not math.isnan(value):
+        return value
+    return None
+
+
+def _quantize(column: array) -> array:
+    """int32 thousandths if that's lossless for every value, else unchanged."""
+    quantized = array("i")
+    for value in column:
+        if math.isnan(value):
+            quantized.append(_NO_VALUE)
+            continue
+        scaled = round(value * _QUANTUM)
+        if not (_NO_VALUE < scaled < 2**31) or scaled / _QUANTUM != value:
+            return column
+        quantized.append(scaled)
+    return quantized
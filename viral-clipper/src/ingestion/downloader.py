@@ -128,11 +128,75 @@ class ContentDownloader:
                     title=info.get("title"),
                 )
 
-                return filepath
-
         except yt_dlp.utils.DownloadError as e:
             raise DownloadError(f"yt-dlp download failed: {e}") from e
 
+        if self.settings.download_captions:
+            self.download_captions(validated_url, client_id, info=info)
+        return filepath
+
+    def download_captions(
+        self,
+        url: str,
+        client_id: int,
+        info: dict | None = None,
+    ) -> Path | None:
+        """Fetch captions for a video into its source directory.
+
+        Manual captions are preferred, then automatic ones, as SRV3 or
+        WebVTT (both carry per-word timings for auto-captions). The file
+        is saved as ``<id>.<lang>.<ext>`` next to the video, where
+        find_caption_file looks for it. Failures are logged, not raised:
+        without captions the source is transcribed as usual.
+
+        Args:
+            url: The video URL.
+            client_id: Client ID for storage path organization.
+            info: yt-dlp info dict from an earlier extract_info call (e.g.
+                the download); reused so the page isn't extracted again.
+
+        Returns:
+            Path to the caption file, or None if none was available.
+        """
+        validated_url = validate_url(url)
+        output_dir = self.settings.get_source_storage_path(client_id)
+        language = self.settings.caption_language
+
+        ydl_opts = {
+            "outtmpl": str(output_dir / "%(id)s.%(ext)s"),
+            "skip_download": True,
+            "writesubtitles": True,
+            "writeautomaticsub": True,
+            "subtitleslangs": [language],
+            "subtitlesformat": "srv3/vtt",
+            "quiet": True,
+            "no_warnings": True,
+            "noplaylist": True,
+        }
+
+        if self.settings.proxy_url:
+            ydl_opts["proxy"] = self.settings.proxy_url
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                if info is not None:
+                    # Re-selects subtitles for these options, no new extraction
+                    info = ydl.process_ie_result(dict(info), download=True)
+                else:
+                    info = ydl.extract_info(validated_url, download=True)
+        except yt_dlp.utils.DownloadError as e:
+            logger.warning("captions_download_failed", url=validated_url, error=str(e))
+            return None
+
+        subtitle = ((info or {}).get("requested_subtitles") or {}).get(language)
+        path = Path(subtitle["filepath"]) if subtitle and subtitle.get("filepath") else None
+        if path is None or not path.exists():
+            logger.info("captions_unavailable", url=validated_url, language=language)
+            return None
+
+        logger.info("captions_downloaded", url=validated_url, path=str(path))
+        return path
+
     def get_video_info(self, url: str) -> dict:
         """Extract video metadata without downloading.
 
@@ -1,6 +1,8 @@
 import gc
-import subprocess
+import math
 import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -8,9 +10,25 @@ import structlog
 
 from src.config import Settings
 from src.exceptions import TranscriptionError
+from src.ingestion.audio import SAMPLE_RATE, decode_audio
+from src.ingestion.chunked_transcription import chunk_workers, transcribe_chunked
+from src.ingestion.transcript_cache import audio_fingerprint, get_transcript_cache
 
 logger = structlog.get_logger()
 
+# Assumed size of an alignment model whose parameters can't be measured
+# (the default English wav2vec2 model is about 360 MB)
+DEFAULT_ALIGN_MODEL_BYTES = 400 * 1024**2
+
+
+def _model_bytes(model: Any) -> int:
+    """Memory held by a torch model's parameters and buffers."""
+    try:
+        tensors = [*model.parameters(), *model.buffers()]
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except (AttributeError, TypeError):
+        return DEFAULT_ALIGN_MODEL_BYTES
+
 
 class WhisperXTranscriber:
     """Transcribes audio using WhisperX with word-level timestamps."""
@@ -18,10 +36,16 @@ class WhisperXTranscriber:
     def __init__(self, settings: Settings):
         self.settings = settings
         self._model = None
-        self._align_model = None
-        self._align_metadata = None
+        # Alignment models and metadata by (language, device), least
+        # recently used first, within align_model_cache_max_bytes
+        self._align_model: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._align_metadata: dict[tuple[str, str], Any] = {}
+        self._align_bytes: dict[tuple[str, str], int] = {}
+        self._align_lock = threading.Lock()
         self._semaphore = threading.Semaphore(settings.max_concurrent_transcriptions)
         self._lock = threading.Lock()
+        # Seconds the last ASR model load took (0 until loaded)
+        self.model_load_seconds = 0.0
 
     def _load_model(self) -> None:
         """Lazy-load the WhisperX model on first use."""
@@ -41,46 +65,74 @@ class WhisperXTranscriber:
                 compute_type=self.settings.whisperx_compute_type,
             )
 
+            started = time.monotonic()
             self._model = whisperx.load_model(
                 self.settings.whisperx_model,
                 device=self.settings.whisperx_device,
                 compute_type=self.settings.whisperx_compute_type,
             )
+            self.model_load_seconds = round(time.monotonic() - started, 3)
 
-    def _extract_audio(self, video_path: Path) -> Path:
-        """Extract audio track from video using FFmpeg."""
-        audio_path = video_path.with_suffix(".wav")
-        if audio_path.exists():
-            return audio_path
-
-        cmd = [
-            "ffmpeg",
-            "-i", str(video_path),
-            "-vn",
-            "-acodec", "pcm_s16le",
-            "-ar", "16000",
-            "-ac", "1",
-            "-y",
-            str(audio_path),
-        ]
+    def _load_align_model(self, language: str) -> tuple[Any, Any]:
+        """Alignment model and metadata for a language, from the LRU cache.
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=600,
-                check=False,
+        A model that doesn't fit align_model_cache_max_bytes on its own is
+        returned without being cached (freed after use, as before).
+        """
+        device = self.settings.whisperx_device
+        key = (language, device)
+        with self._align_lock:
+            if key in self._align_model:
+                self._align_model.move_to_end(key)
+                return self._align_model[key], self._align_metadata[key]
+
+            import whisperx
+
+            logger.info("loading_align_model", language=language, device=device)
+            align_model, align_metadata = whisperx.load_align_model(
+                language_code=language,
+                device=device,
             )
-            if result.returncode != 0:
-                raise TranscriptionError(
-                    f"Audio extraction failed: {result.stderr.decode()}"
-                )
-        except subprocess.TimeoutExpired:
-            raise TranscriptionError("Audio extraction timed out after 600 seconds")
 
-        return audio_path
+            size = _model_bytes(align_model)
+            budget = self.settings.align_model_cache_max_bytes
+            if size > budget:
+                return align_model, align_metadata
+
+            while self._align_model and sum(self._align_bytes.values()) + size > budget:
+                evicted, _ = self._align_model.popitem(last=False)
+                del self._align_metadata[evicted]
+                del self._align_bytes[evicted]
+                logger.info("align_model_evicted", language=evicted[0], device=evicted[1])
+
+            self._align_model[key] = align_model
+            self._align_metadata[key] = align_metadata
+            self._align_bytes[key] = size
+            return align_model, align_metadata
+
+    @property
+    def model_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def align_languages(self) -> list[str]:
+        """Languages whose alignment model is cached, least recently used first."""
+        return [language for language, _ in self._align_model]
+
+    def preload(self, language: str = "en") -> None:
+        """Load the ASR model and the alignment model for a language."""
+        self._load_model()
+        self._load_align_model(language)
+
+    def load_audio(self, video_path: Path) -> Any:
+        """Decode a video's audio into a 16 kHz float32 array (no temp files)."""
+        return decode_audio(video_path, self.settings)
 
-    def transcribe(self, video_path: Path) -> dict[str, Any]:
+    def transcribe(
+        self,
+        video_path: Path,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
         """Transcribe a video file and return word-level timestamps.
 
         Uses a semaphore to limit concurrent transcriptions and prevent OOM.
@@ -88,6 +140,9 @@ class WhisperXTranscriber:
 
         Args:
             video_path: Path to the video file.
+            timings: If given, filled with ``asr_seconds`` and
+                ``align_seconds`` (left empty on a cache hit or when the
+                audio is transcribed in chunks).
 
         Returns:
             Dict with segments containing word-level timestamps:
@@ -109,49 +164,122 @@ class WhisperXTranscriber:
         """
         self._semaphore.acquire()
         try:
-            return self._do_transcribe(video_path)
+            return self._do_transcribe(video_path, timings)
         finally:
             self._semaphore.release()
             self._clear_gpu_cache()
 
-    def _do_transcribe(self, video_path: Path) -> dict[str, Any]:
+    def _do_transcribe(
+        self,
+        video_path: Path,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
         """Internal transcription logic."""
-        import whisperx
-
-        self._load_model()
-
-        audio_path = self._extract_audio(video_path)
-
         logger.info("transcription_started", video=str(video_path))
 
-        try:
-            audio = whisperx.load_audio(str(audio_path))
-        except Exception as e:
-            raise TranscriptionError(f"Failed to load audio: {e}") from e
+        audio = self.load_audio(video_path)
+
+        # Checked before any model is loaded
+        cache = fingerprint = None
+        if self.settings.transcript_cache_enabled:
+            cache = get_transcript_cache(
+                self.settings.get_transcript_cache_path(),
+                self.settings.transcript_cache_max_bytes,
+            )
+            fingerprint = audio_fingerprint(audio)
+            cached = cache.get(
+                fingerprint,
+                self.settings.whisperx_model,
+                self.settings.whisperx_compute_type,
+            )
+            if cached is not None:
+                logger.info(
+                    "transcript_cache_hit",
+                    video=str(video_path),
+                    fingerprint=fingerprint,
+                    segments=len(cached.get("segments", [])),
+                )
+                return cached
 
-        # Check if audio is too long (>1 hour) and needs chunking
-        duration_seconds = len(audio) / 16000  # 16kHz sample rate
-        if duration_seconds > 3600:
+        duration_seconds = len(audio) / SAMPLE_RATE
+        chunking = self._should_chunk(duration_seconds)
+        if duration_seconds > self.settings.transcription_chunk_threshold_seconds:
             logger.info(
                 "long_audio_detected",
                 duration_seconds=duration_seconds,
-                chunking=True,
+                chunking=chunking,
+            )
+
+        if chunking:
+            try:
+                result = transcribe_chunked(audio, self.settings)
+            except Exception as e:
+                raise TranscriptionError(f"Chunked transcription failed: {e}") from e
+        else:
+            result = self._transcribe_audio(audio, timings)
+
+        logger.info(
+            "transcription_complete",
+            video=str(video_path),
+            segments=len(result.get("segments", [])),
+        )
+
+        transcript = {
+            "segments": result.get("segments", []),
+            "language": result.get("language", "en"),
+        }
+        if cache is not None:
+            cache.put(
+                fingerprint,
+                self.settings.whisperx_model,
+                self.settings.whisperx_compute_type,
+                transcript,
             )
+        return transcript
+
+    def _should_chunk(self, duration_seconds: float) -> bool:
+        """Whether audio is long enough to split across worker processes.
+
+        Only on CPU: on a GPU the single model is already saturated.
+        """
+        if duration_seconds <= self.settings.transcription_chunk_threshold_seconds:
+            return False
+        if self.settings.whisperx_device != "cpu":
+            return False
+        chunks = math.ceil(duration_seconds / self.settings.transcription_chunk_seconds)
+        return chunk_workers(self.settings, chunks) > 1
+
+    def _transcribe_audio(
+        self,
+        audio: Any,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """Transcribe and align audio with this process's models.
+
+        Args:
+            audio: 16 kHz mono float32 samples.
+            timings: If given, filled with ``asr_seconds`` and
+                ``align_seconds`` (alignment model load included).
+        """
+        import whisperx
 
+        self._load_model()
+
+        started = time.monotonic()
         try:
             result = self._model.transcribe(
                 audio,
-                batch_size=16,
+                batch_size=self.settings.whisperx_batch_size,
                 language="en",
             )
         except Exception as e:
             raise TranscriptionError(f"Transcription failed: {e}") from e
+        transcribed = time.monotonic()
 
         # Align for word-level timestamps
         try:
-            align_model, align_metadata = whisperx.load_align_model(
-                language_code=result.get("language", "en"),
-                device=self.settings.whisperx_device,
+            align_model, align_metadata = self._load_align_model(
+                result.get("language", "en")
             )
             result = whisperx.align(
                 result["segments"],
@@ -161,7 +289,7 @@ class WhisperXTranscriber:
                 device=self.settings.whisperx_device,
                 return_char_alignments=False,
             )
-            # Free alignment model immediately
+            # Drop our references; cached models stay loaded, others are freed
             del align_model, align_metadata
         except Exception as e:
             logger.warning(
@@ -169,20 +297,10 @@ class WhisperXTranscriber:
                 error=str(e),
             )
 
-        # Clean up extracted audio
-        if audio_path.exists() and audio_path != video_path:
-            audio_path.unlink()
-
-        logger.info(
-            "transcription_complete",
-            video=str(video_path),
-            segments=len(result.get("segments", [])),
-        )
-
-        return {
-            "segments": result.get("segments", []),
-            "language": result.get("language", "en"),
-        }
+        if timings is not None:
+            timings["asr_seconds"] = round(transcribed - started, 3)
+            timings["align_seconds"] = round(time.monotonic() - transcribed, 3)
+        return result
 
     def _clear_gpu_cache(self) -> None:
         """Clear GPU memory cache after transcription."""
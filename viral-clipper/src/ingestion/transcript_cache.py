@@ -0,0 +1,153 @@
+"""Cache of finished transcripts keyed by the content of the audio.
+
+Re-running a folder, or ingesting the same video under another filename
+or URL, used to transcribe it again from scratch. Transcripts are cached
+here under a fingerprint of the decoded audio plus the model name and
+compute type, so any copy of the same audio hits the cache regardless
+of its path or container.
+
+The fingerprint hashes every 16th sample of the decoded PCM together
+with the sample count, so it costs a fraction of the decode it follows.
+Entries are stored as CompactTranscript bytes in SQLite and evicted
+least recently used first once the store exceeds its byte budget.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.ingestion.compact_transcript import CompactTranscript
+
+logger = structlog.get_logger()
+
+# Every Nth sample goes into the fingerprint (1 kHz at 16 kHz audio)
+FINGERPRINT_STRIDE = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def audio_fingerprint(audio: Any, stride: int = FINGERPRINT_STRIDE) -> str:
+    """Content fingerprint of decoded audio samples.
+
+    Args:
+        audio: 1-D sample buffer (numpy array, np.memmap or ``array``).
+        stride: Only every ``stride``-th sample is hashed.
+    """
+    samples = memoryview(audio)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{samples.format}:{len(samples)}:{stride}".encode())
+    digest.update(samples[::stride].tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """SQLite store of transcripts with an LRU byte budget."""
+
+    def __init__(self, db_path: Path, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def key(fingerprint: str, model: str, compute_type: str) -> str:
+        return f"{fingerprint}:{model}:{compute_type}"
+
+    def get(self, fingerprint: str, model: str, compute_type: str) -> dict[str, Any] | None:
+        """Cached transcript, or None."""
+        key = self.key(fingerprint, model, compute_type)
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM transcripts WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE transcripts SET last_used = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+        except sqlite3.Error as e:
+            logger.warning("transcript_cache_read_failed", key=key, error=str(e))
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return CompactTranscript.from_bytes(row[0]).to_dict()
+
+    def put(
+        self,
+        fingerprint: str,
+        model: str,
+        compute_type: str,
+        transcript: dict[str, Any],
+    ) -> None:
+        """Store a transcript, evicting the least recently used over budget."""
+        key = self.key(fingerprint, model, compute_type)
+        data = CompactTranscript.from_dict(transcript).to_bytes()
+        if len(data) > self.max_bytes:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO transcripts (key, data, size, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()),
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning("transcript_cache_write_failed", key=key, error=str(e))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM transcripts ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            total -= size
+            logger.info("transcript_cache_evicted", key=key, size=size)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+        return total
+
+
+_shared: dict[Path, TranscriptCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_transcript_cache(db_path: Path, max_bytes: int) -> TranscriptCache:
+    """Process-wide cache for a store, so hit/miss counters are shared."""
+    with _shared_lock:
+        cache = _shared.get(db_path)
+        if cache is None:
+            cache = _shared[db_path] = TranscriptCache(db_path, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
@@ -0,0 +1,158 @@
+"""Time-range index over a WhisperX transcript.
+
+Finding the words or segments of a moment used to mean scanning every
+segment and word of the transcript, once per moment. TranscriptIndex
+flattens words and segments once into sorted ``array`` columns of start
+and end times and answers range queries with bisect, in
+O(log n + matches).
+
+Word and segment ends aren't guaranteed to be monotonic (WhisperX can
+emit overlapping or unaligned words), so each column also keeps a running
+maximum of the end times: the first entry that can overlap a range is
+the first whose running maximum reaches the range start.
+
+Indexes are cached per transcript (see get_transcript_index) so every
+caller in a worker shares one index per source.
+"""
+import bisect
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from src.ingestion.compact_transcript import CompactTranscript
+
+# Transcripts whose index is kept alive per worker process
+INDEX_CACHE_SIZE = 8
+
+
+class _IntervalColumn:
+    """Sorted (start, end) intervals with overlap queries."""
+
+    def __init__(self, intervals: list[tuple[float, float]]):
+        order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+        self.order = array("l", order)
+        self.starts = array("d", (intervals[i][0] for i in order))
+        self.ends = array("d", (intervals[i][1] for i in order))
+
+        running_max = array("d")
+        current = float("-inf")
+        for end in self.ends:
+            current = max(current, end)
+            running_max.append(current)
+        self.max_ends = running_max
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start_time: float, end_time: float) -> list[int]:
+        """Original positions of intervals with end >= start_time and
+        start <= end_time, in original order."""
+        lo = bisect.bisect_left(self.max_ends, start_time)
+        hi = bisect.bisect_right(self.starts, end_time)
+        hits = [self.order[i] for i in range(lo, hi) if self.ends[i] >= start_time]
+        hits.sort()
+        return hits
+
+
+class TranscriptIndex:
+    """Flattened, sorted words and segments of one transcript.
+
+    Built from either the WhisperX dict or a CompactTranscript. For the
+    compact form the intervals are read straight from its columns and only
+    the words or segments a query returns are turned into dicts.
+    """
+
+    def __init__(self, transcript: dict[str, Any] | CompactTranscript):
+        if isinstance(transcript, CompactTranscript):
+            self._compact: CompactTranscript | None = transcript
+            self.segments: list[dict] = []
+            self.words: list[dict] = []
+            self._segment_column = _IntervalColumn(transcript.segment_intervals())
+            self._word_column = _IntervalColumn(transcript.word_intervals())
+            return
+
+        self._compact = None
+        segments = transcript.get("segments", [])
+        self.segments = list(segments)
+        self.words = [
+            word for segment in segments for word in segment.get("words", [])
+        ]
+        self._segment_column = _IntervalColumn(
+            [(s.get("start", 0), s.get("end", 0)) for s in self.segments]
+        )
+        self._word_column = _IntervalColumn(
+            [(w.get("start", 0), w.get("end", 0)) for w in self.words]
+        )
+
+    def words_in_range(self, start_time: float, end_time: float) -> list[dict]:
+        """Words overlapping [start_time, end_time], in transcript order."""
+        hits = self._word_column.overlapping(start_time, end_time)
+        if self._compact is not None:
+            return [self._compact.word_dict(i) for i in hits]
+        return [self.words[i] for i in hits]
+
+    def segments_in_range(self, start_time: float, end_time: float) -> list[dict]:
+        """Segments overlapping [start_time, end_time], in transcript order."""
+        hits = self._segment_column.overlapping(start_time, end_time)
+        if self._compact is not None:
+            return [self._compact.segment_dict(i) for i in hits]
+        return [self.segments[i] for i in hits]
+
+
+def _fingerprint(transcript: dict[str, Any] | CompactTranscript) -> tuple:
+    """Cheap check that a cached index still matches a transcript."""
+    if isinstance(transcript, CompactTranscript):
+        return (
+            len(transcript),
+            transcript.word_count,
+            transcript.segment_end(len(transcript) - 1) if len(transcript) else None,
+        )
+    segments = transcript.get("segments", [])
+    return (
+        len(segments),
+        sum(len(s.get("words", [])) for s in segments),
+        segments[-1].get("end") if segments else None,
+    )
+
+
+_cache: OrderedDict[Hashable, tuple[Any, TranscriptIndex]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_transcript_index(
+    transcript: dict[str, Any] | CompactTranscript,
+    key: Hashable | None = None,
+) -> TranscriptIndex:
+    """Index for a transcript, built once and cached per worker.
+
+    Args:
+        transcript: WhisperX transcript dict or CompactTranscript.
+        key: Stable cache key such as a Source id. Without one the index
+            is cached for this transcript object only.
+    """
+    if key is None:
+        cache_key: Hashable = ("object", id(transcript))
+        check = transcript
+    else:
+        cache_key = ("key", key)
+        check = _fingerprint(transcript)
+
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None:
+            cached_check, index = entry
+            matches = cached_check is check if key is None else cached_check == check
+            if matches:
+                _cache.move_to_end(cache_key)
+                return index
+
+    index = TranscriptIndex(transcript)
+    with _cache_lock:
+        # Object-keyed entries hold the transcript itself, so its id
+        # can't be reused by another dict while cached
+        _cache[cache_key] = (check, index)
+        _cache.move_to_end(cache_key)
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
@@ -0,0 +1,297 @@
+"""Transcription throughput benchmark.
+
+Runs WhisperXTranscriber over a matrix of model, compute type, batch size
+and concurrency settings, on fixture audio of fixed lengths, and reports
+for each combination:
+
+- model load time (ASR model, and the English alignment model separately)
+- ASR and alignment time per fixture
+- real-time factor (wall time / audio seconds; lower is faster)
+- peak RSS
+
+Each combination runs in a fresh (spawned) process per fixture, so model
+loads are cold and peak RSS belongs to that combination and fixture
+alone. Jobs go through ``transcribe()`` on a WAV copy of the fixture, so
+audio decoding and the max_concurrent_transcriptions limit are part of
+the measurement. Everything runs on CPU with the transcript cache and
+chunked transcription off. Fixture audio is either a real
+recording (tiled or cut to each length) or a deterministic synthetic
+signal, and its fingerprint is part of the report so two reports are
+only compared when they used the same input.
+"""
+import itertools
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.config import Settings
+from src.ingestion.audio import SAMPLE_RATE, decode_audio
+from src.ingestion.transcript_cache import audio_fingerprint
+
+logger = structlog.get_logger()
+
+
+class BenchmarkConfig(BaseModel):
+    """One point of the benchmark matrix."""
+
+    model: str
+    compute_type: str
+    batch_size: int
+    concurrency: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}/{self.compute_type}/b{self.batch_size}/c{self.concurrency}"
+
+
+class BenchmarkResult(BaseModel):
+    """Measurements for one configuration and fixture length."""
+
+    key: str = Field(description="Configuration key (model/compute/batch/concurrency)")
+    model: str
+    compute_type: str
+    batch_size: int
+    concurrency: int
+    audio_seconds: int = Field(description="Length of the fixture")
+    model_load_seconds: float = Field(default=0.0, description="ASR model load time")
+    align_load_seconds: float = Field(default=0.0, description="Alignment model load time")
+    asr_seconds: float = Field(default=0.0, description="Mean ASR time per job")
+    align_seconds: float = Field(default=0.0, description="Mean alignment time per job")
+    wall_seconds: float = Field(default=0.0, description="Wall time for all concurrent jobs")
+    rtf: float = Field(default=0.0, description="wall_seconds / total audio seconds")
+    peak_rss_bytes: int = Field(default=0, description="Peak RSS of the fixture's process")
+    error: str | None = Field(default=None, description="Why the configuration failed")
+
+
+class BenchmarkReport(BaseModel):
+    """Full benchmark output, serializable as JSON for later comparison."""
+
+    created_at: str
+    host: dict[str, Any]
+    fixture: str = Field(description="Fingerprint of the fixture audio source")
+    results: list[BenchmarkResult]
+
+
+def benchmark_matrix(
+    models: list[str],
+    compute_types: list[str],
+    batch_sizes: list[int],
+    concurrencies: list[int],
+) -> list[BenchmarkConfig]:
+    """Every combination of the given settings, in a stable order."""
+    return [
+        BenchmarkConfig(model=m, compute_type=c, batch_size=b, concurrency=n)
+        for m, c, b, n in itertools.product(models, compute_types, batch_sizes, concurrencies)
+    ]
+
+
+def synthesize_audio(seconds: int, seed: int = 0) -> Any:
+    """Deterministic speech-like signal: voiced bursts with short pauses.
+
+    Only a load generator; a real recording (``--audio``) gives more
+    representative ASR work.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(seconds * SAMPLE_RATE, dtype=np.float32)
+    position = 0
+    while position < len(audio):
+        length = int(rng.uniform(0.15, 0.5) * SAMPLE_RATE)
+        t = np.arange(length) / SAMPLE_RATE
+        pitch = rng.uniform(90, 250)
+        burst = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        burst *= np.hanning(length) * 0.3
+        end = min(position + length, len(audio))
+        audio[position:end] = burst[: end - position]
+        position = end + int(rng.uniform(0.05, 0.4) * SAMPLE_RATE)
+    return audio
+
+
+def fixture_audio(seconds: int, source: Any | None = None) -> Any:
+    """Fixture of an exact length, tiled from ``source`` or synthesized."""
+    import numpy as np
+
+    if source is None or len(source) == 0:
+        return synthesize_audio(seconds)
+    samples = seconds * SAMPLE_RATE
+    repeats = -(-samples // len(source))
+    return np.tile(np.asarray(source, dtype=np.float32), repeats)[:samples]
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _write_wav(path: Path, audio: Any) -> None:
+    """Write fixture samples as 16-bit mono PCM WAV at SAMPLE_RATE."""
+    import numpy as np
+
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+
+
+def _run_fixture(
+    settings: Settings,
+    config: BenchmarkConfig,
+    seconds: int,
+    audio: Any,
+) -> BenchmarkResult:
+    """Benchmark one configuration on one fixture (runs in its own process)."""
+    from src.ingestion.transcriber import WhisperXTranscriber
+
+    transcriber = WhisperXTranscriber(settings)
+    transcriber._load_model()
+    started = time.monotonic()
+    transcriber._load_align_model("en")
+    align_load_seconds = round(time.monotonic() - started, 3)
+
+    with tempfile.TemporaryDirectory(dir=settings.get_temp_path()) as tmp:
+        fixture_path = Path(tmp) / f"fixture_{seconds}s.wav"
+        _write_wav(fixture_path, audio)
+
+        timings: list[dict[str, float]] = [{} for _ in range(config.concurrency)]
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=config.concurrency) as pool:
+            jobs = [pool.submit(transcriber.transcribe, fixture_path, t) for t in timings]
+            for future in jobs:
+                future.result()
+        wall = time.monotonic() - started
+
+    return BenchmarkResult(
+        key=config.key,
+        **config.model_dump(),
+        audio_seconds=seconds,
+        model_load_seconds=transcriber.model_load_seconds,
+        align_load_seconds=align_load_seconds,
+        asr_seconds=round(sum(t.get("asr_seconds", 0.0) for t in timings) / len(timings), 3),
+        align_seconds=round(
+            sum(t.get("align_seconds", 0.0) for t in timings) / len(timings), 3
+        ),
+        wall_seconds=round(wall, 3),
+        rtf=round(wall / (seconds * config.concurrency), 4),
+        peak_rss_bytes=_peak_rss_bytes(),
+    )
+
+
+def host_info() -> dict[str, Any]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    info: dict[str, Any] = {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+    for package in ("whisperx", "faster-whisper", "ctranslate2", "torch"):
+        try:
+            info[package] = version(package)
+        except PackageNotFoundError:
+            info[package] = None
+    return info
+
+
+def run_benchmark(
+    settings: Settings,
+    configs: list[BenchmarkConfig],
+    lengths: list[int],
+    audio_path: Path | None = None,
+) -> BenchmarkReport:
+    """Run every configuration on fixtures of each length (CPU only)."""
+    source = decode_audio(audio_path, settings) if audio_path else None
+    fixtures = [(seconds, fixture_audio(seconds, source)) for seconds in lengths]
+    fixture = audio_fingerprint(source if source is not None else fixture_audio(lengths[0]))
+
+    results: list[BenchmarkResult] = []
+    for config in configs:
+        config_settings = settings.model_copy(update={
+            "whisperx_model": config.model,
+            "whisperx_compute_type": config.compute_type,
+            "whisperx_batch_size": config.batch_size,
+            "whisperx_device": "cpu",
+            "max_concurrent_transcriptions": config.concurrency,
+            "transcript_cache_enabled": False,
+            # Every job is one whole-file transcription
+            "transcription_chunk_threshold_seconds": max(lengths) + 60,
+        })
+        logger.info("benchmark_config_started", config=config.key)
+        for seconds, audio in fixtures:
+            try:
+                # A fresh process per fixture: cold loads, peak RSS of this fixture only
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=get_context("spawn")
+                ) as pool:
+                    results.append(
+                        pool.submit(_run_fixture, config_settings, config, seconds, audio).result()
+                    )
+            except Exception as e:
+                logger.error(
+                    "benchmark_config_failed", config=config.key, seconds=seconds, error=str(e)
+                )
+                results.append(BenchmarkResult(
+                    key=config.key, **config.model_dump(), audio_seconds=seconds, error=str(e)
+                ))
+
+    return BenchmarkReport(
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        host=host_info(),
+        fixture=fixture,
+        results=results,
+    )
+
+
+def format_table(report: BenchmarkReport) -> str:
+    """Fixed-width text table of a report."""
+    header = (
+        f"{'config':<28} {'audio':>6} {'load':>7} {'a.load':>7} {'asr':>8} "
+        f"{'align':>7} {'wall':>8} {'rtf':>7} {'rss MB':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in report.results:
+        if r.error:
+            lines.append(f"{r.key:<28} {r.audio_seconds:>5}s  failed: {r.error}")
+            continue
+        lines.append(
+            f"{r.key:<28} {r.audio_seconds:>5}s {r.model_load_seconds:>7.2f} "
+            f"{r.align_load_seconds:>7.2f} {r.asr_seconds:>8.2f} {r.align_seconds:>7.2f} "
+            f"{r.wall_seconds:>8.2f} {r.rtf:>7.3f} {r.peak_rss_bytes / 1024**2:>7.0f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_to_baseline(report: BenchmarkReport, baseline: BenchmarkReport) -> list[str]:
+    """Per-row RTF change against an earlier report with the same fixture."""
+    if report.fixture != baseline.fixture:
+        return [
+            f"Baseline used different fixture audio ({baseline.fixture}); not comparable."
+        ]
+    previous = {(r.key, r.audio_seconds): r for r in baseline.results if not r.error}
+    lines = []
+    for r in report.results:
+        before = previous.get((r.key, r.audio_seconds))
+        if r.error or before is None or not before.rtf:
+            continue
+        change = (r.rtf - before.rtf) / before.rtf * 100
+        lines.append(
+            f"{r.key:<28} {r.audio_seconds:>5}s rtf {before.rtf:.3f} -> {r.rtf:.3f} "
+            f"({change:+.1f}%)"
+        )
+    return lines
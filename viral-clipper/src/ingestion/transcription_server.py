@@ -0,0 +1,380 @@
+"""Long-lived transcription server that keeps WhisperX models loaded.
+
+Loading the Whisper model takes 20–60 s on CPU, and the alignment model
+adds more; doing that for every video is pure overhead. The transcription
+server is a separate process that owns one resident WhisperXTranscriber
+and accepts jobs over a Unix socket, so the CLI and every dramatiq worker
+share the same warm models.
+
+Protocol: each message is a 4-byte big-endian length followed by a JSON
+object. Requests are ``{"op": "transcribe", "path": ...}`` or
+``{"op": "status"}``; responses are ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": ...}``. Jobs queue on the server and run
+``max_concurrent_transcriptions`` at a time; on shutdown, jobs still
+waiting are answered with an error.
+
+get_transcriber() returns a TranscriptionClient while the server is
+reachable and falls back to an in-process transcriber otherwise.
+"""
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.config import Settings
+from src.exceptions import TranscriptionError
+from src.ingestion.transcriber import WhisperXTranscriber
+
+logger = structlog.get_logger()
+
+# Seconds allowed for connecting and for status requests
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+_HEADER = struct.Struct("!I")
+
+
+class TranscriptionServerStatus(BaseModel):
+    """Queue and model state reported by a transcription server."""
+
+    queue_depth: int = Field(default=0, description="Jobs waiting to start")
+    active_jobs: int = Field(default=0, description="Jobs being transcribed")
+    jobs_completed: int = Field(default=0, description="Jobs finished successfully")
+    jobs_failed: int = Field(default=0, description="Jobs that raised an error")
+    model_loaded: bool = Field(default=False, description="Whether the ASR model is loaded")
+    align_languages: list[str] = Field(
+        default_factory=list, description="Languages with a loaded alignment model"
+    )
+    model: str = Field(default="", description="WhisperX model name")
+    device: str = Field(default="", description="WhisperX device")
+    compute_type: str = Field(default="", description="WhisperX compute type")
+    uptime_seconds: float = Field(default=0.0, description="Seconds since the server started")
+
+
+def _send_message(sock: socket.socket, payload: dict[str, Any]) -> None:
+    data = json.dumps(payload).encode()
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(sock: socket.socket) -> dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size))
+
+
+class _Job:
+    def __init__(self, video_path: Path):
+        self.video_path = video_path
+        self.done = threading.Event()
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        # Handler thread that answers the client once the job is done
+        self.handler = threading.current_thread()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: "_SocketServer"
+
+    def handle(self) -> None:
+        try:
+            request = _recv_message(self.request)
+        except (ConnectionError, ValueError) as e:
+            logger.warning("transcription_server_bad_request", error=str(e))
+            return
+
+        response = self.server.app.handle_request(request)
+        try:
+            _send_message(self.request, response)
+        except OSError as e:
+            # Client gave up (e.g. its timeout elapsed); the job still counted
+            logger.warning("transcription_server_client_gone", error=str(e))
+
+
+class _SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, app: "TranscriptionServer"):
+        self.app = app
+        super().__init__(socket_path, _RequestHandler)
+
+
+class TranscriptionServer:
+    """Serves transcription jobs from one resident WhisperXTranscriber."""
+
+    def __init__(self, settings: Settings, transcriber: WhisperXTranscriber | None = None):
+        self.settings = settings
+        self.transcriber = transcriber or WhisperXTranscriber(settings)
+        self.socket_path = settings.get_transcription_socket_path()
+        self.workers = settings.max_concurrent_transcriptions
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self._jobs: queue.Queue[_Job | None] = queue.Queue()
+        self._active = 0
+        self._counter_lock = threading.Lock()
+        self._started = time.monotonic()
+        self._server: _SocketServer | None = None
+        self._threads: list[threading.Thread] = []
+        self._stopped = threading.Event()
+        # Guards _closing so no job is queued after close() drained the queue
+        self._queue_lock = threading.Lock()
+        self._closing = False
+
+    def status(self) -> TranscriptionServerStatus:
+        return TranscriptionServerStatus(
+            queue_depth=self._jobs.qsize(),
+            active_jobs=self._active,
+            jobs_completed=self.jobs_completed,
+            jobs_failed=self.jobs_failed,
+            model_loaded=self.transcriber.model_loaded,
+            align_languages=self.transcriber.align_languages,
+            model=self.settings.whisperx_model,
+            device=self.settings.whisperx_device,
+            compute_type=self.settings.whisperx_compute_type,
+            uptime_seconds=round(time.monotonic() - self._started, 1),
+        )
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer one decoded request."""
+        op = request.get("op")
+        if op == "status":
+            return {"ok": True, "result": self.status().model_dump()}
+        if op != "transcribe" or not request.get("path"):
+            return {"ok": False, "error": f"Unknown request: {op!r}"}
+
+        job = _Job(Path(request["path"]))
+        with self._queue_lock:
+            if self._closing:
+                return {"ok": False, "error": "Transcription server is shutting down"}
+            self._jobs.put(job)
+        logger.info(
+            "transcription_job_queued",
+            video=str(job.video_path),
+            queue_depth=self._jobs.qsize(),
+        )
+        job.done.wait()
+        if job.error is not None:
+            return {"ok": False, "error": job.error}
+        return {"ok": True, "result": job.result}
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            with self._counter_lock:
+                self._active += 1
+            started = time.monotonic()
+            try:
+                job.result = self.transcriber.transcribe(job.video_path)
+                with self._counter_lock:
+                    self.jobs_completed += 1
+            except Exception as e:
+                job.error = str(e)
+                with self._counter_lock:
+                    self.jobs_failed += 1
+                logger.error(
+                    "transcription_job_failed", video=str(job.video_path), error=job.error
+                )
+            finally:
+                with self._counter_lock:
+                    self._active -= 1
+                job.done.set()
+            logger.info(
+                "transcription_job_finished",
+                video=str(job.video_path),
+                seconds=round(time.monotonic() - started, 1),
+                queue_depth=self._jobs.qsize(),
+            )
+
+    def start(self, preload: bool = True) -> None:
+        """Load the models, bind the socket and serve on background threads."""
+        if preload:
+            started = time.monotonic()
+            self.transcriber.preload()
+            logger.info(
+                "transcription_models_loaded",
+                seconds=round(time.monotonic() - started, 1),
+            )
+
+        if self.socket_path.exists():
+            if TranscriptionClient(self.socket_path).is_available():
+                raise TranscriptionError(
+                    f"A transcription server is already running on {self.socket_path}"
+                )
+            # Left behind by a server that didn't shut down cleanly
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._server = _SocketServer(str(self.socket_path), self)
+        os.chmod(self.socket_path, 0o600)
+        self._stopped.clear()
+        self._closing = False
+        threads = [
+            threading.Thread(target=self._server.serve_forever, name="transcription-accept")
+        ] + [
+            threading.Thread(target=self._work, name=f"transcription-worker-{i}")
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        self._threads = threads
+        logger.info(
+            "transcription_server_started",
+            socket=str(self.socket_path),
+            workers=self.workers,
+        )
+
+    def serve_forever(self, preload: bool = True) -> None:
+        """Start and block until shutdown() or KeyboardInterrupt."""
+        self.start(preload=preload)
+        try:
+            while not self._stopped.wait(1.0):
+                pass
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Make serve_forever return (call from another thread)."""
+        self._stopped.set()
+
+    def close(self) -> None:
+        """Stop serving and remove the socket.
+
+        Jobs still queued are answered with an error before the server
+        closes, so their clients fail fast instead of waiting out their
+        timeout. Jobs already running finish on their worker.
+        """
+        self._stopped.set()
+        if self._server is None:
+            return
+        self._server.shutdown()
+        dropped = self._fail_queued_jobs("Transcription server shut down before the job started")
+        for job in dropped:
+            job.handler.join(CONNECT_TIMEOUT_SECONDS)
+        self._server.server_close()
+        self._server = None
+        for _ in range(self.workers):
+            self._jobs.put(None)
+        self.socket_path.unlink(missing_ok=True)
+        logger.info(
+            "transcription_server_stopped",
+            jobs_completed=self.jobs_completed,
+            jobs_dropped=len(dropped),
+        )
+
+    def _fail_queued_jobs(self, error: str) -> list[_Job]:
+        """Take every queued job off the queue and fail it with ``error``."""
+        dropped = []
+        with self._queue_lock:
+            self._closing = True
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    continue
+                job.error = error
+                job.done.set()
+                dropped.append(job)
+        return dropped
+
+
+class TranscriptionClient:
+    """Sends jobs to a running TranscriptionServer.
+
+    Has the same ``transcribe(video_path)`` interface as
+    WhisperXTranscriber, so callers can use either.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float | None = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, payload: dict[str, Any], timeout: float | None) -> Any:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+            sock.connect(str(self.socket_path))
+            sock.settimeout(timeout)
+            _send_message(sock, payload)
+            response = _recv_message(sock)
+        finally:
+            sock.close()
+
+        if not response.get("ok"):
+            raise TranscriptionError(response.get("error") or "Transcription server error")
+        return response["result"]
+
+    def status(self) -> TranscriptionServerStatus:
+        """Queue depth and model state of the server.
+
+        Raises:
+            OSError: The server isn't reachable.
+        """
+        return TranscriptionServerStatus(
+            **self._request({"op": "status"}, CONNECT_TIMEOUT_SECONDS)
+        )
+
+    def is_available(self) -> bool:
+        if not self.socket_path.exists():
+            return False
+        try:
+            self.status()
+        except (OSError, ValueError, TranscriptionError):
+            return False
+        return True
+
+    def transcribe(self, video_path: Path) -> dict[str, Any]:
+        """Transcribe a video on the server (waits while the job is queued)."""
+        try:
+            return self._request(
+                {"op": "transcribe", "path": str(Path(video_path).resolve())},
+                self.timeout,
+            )
+        except socket.timeout:
+            raise TranscriptionError(
+                f"Transcription server did not answer within {self.timeout} seconds"
+            )
+        except (OSError, ValueError) as e:
+            raise TranscriptionError(f"Transcription server unavailable: {e}") from e
+
+
+def get_transcriber(
+    settings: Settings,
+    local: WhisperXTranscriber | None = None,
+) -> WhisperXTranscriber | TranscriptionClient:
+    """The transcription server's client if it's running, else a local transcriber.
+
+    Args:
+        settings: Application settings.
+        local: In-process transcriber to fall back to, so callers can keep
+            its models loaded across calls. Created when not given.
+    """
+    if settings.transcription_server_enabled:
+        client = TranscriptionClient(
+            settings.get_transcription_socket_path(),
+            timeout=settings.transcription_server_timeout_seconds,
+        )
+        if client.is_available():
+            return client
+    return local or WhisperXTranscriber(settings)
@@ -1,11 +1,11 @@
 from src.models.base import Base
-from src.models.client import Client, Source, SourceStatus
+from src.models.client import Client, Source, SourceStatus, SourceTranscript
 from src.models.content import ClipMoment, GeneratedClip, MomentStatus
 from src.models.distribution import Account, PostJob, PlatformType, AccountStatus, PostStatus
 
 __all__ = [
     "Base",
-    "Client", "Source", "SourceStatus",
+    "Client", "Source", "SourceStatus", "SourceTranscript",
     "ClipMoment", "GeneratedClip", "MomentStatus",
     "Account", "PostJob", "PlatformType", "AccountStatus", "PostStatus",
 ]
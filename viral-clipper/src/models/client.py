@@ -2,9 +2,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import JSON, Enum as SQLEnum, ForeignKey, Index, String, func
+from sqlalchemy import Enum as SQLEnum, ForeignKey, Index, LargeBinary, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.ingestion.compact_transcript import CompactTranscript
 from src.models.base import Base
 
 
@@ -35,9 +36,11 @@ class Source(Base):
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"))
     url: Mapped[Optional[str]]
     file_path: Mapped[str]
+    mezzanine_path: Mapped[Optional[str]] = mapped_column(default=None)
     title: Mapped[str]
     duration_seconds: Mapped[float]
-    transcript_json: Mapped[Optional[dict]] = mapped_column(JSON)
+    # Size of the stored transcript blob; NULL when not transcribed yet
+    transcript_size: Mapped[Optional[int]] = mapped_column(default=None)
     status: Mapped[SourceStatus] = mapped_column(
         SQLEnum(SourceStatus, native_enum=False),
         default=SourceStatus.PENDING,
@@ -46,3 +49,85 @@ class Source(Base):
 
     client: Mapped["Client"] = relationship(back_populates="sources")
     moments: Mapped[list["ClipMoment"]] = relationship(back_populates="source")
+    # Loaded only when the transcript itself is accessed
+    transcript_record: Mapped[Optional["SourceTranscript"]] = relationship(
+        back_populates="source",
+        cascade="all, delete-orphan",
+        lazy="select",
+    )
+
+    @property
+    def media_path(self) -> str:
+        """File clips are cut from: the mezzanine when one exists."""
+        return self.mezzanine_path or self.file_path
+
+    @property
+    def has_transcript(self) -> bool:
+        """Whether a transcript is stored, without loading it."""
+        return self.transcript_size is not None
+
+    @property
+    def transcript(self) -> Optional[CompactTranscript]:
+        """The transcript in its compact columnar form, fetched on access.
+
+        Use its ``words_in_range``/``segments_in_range``/``segment_spans``
+        instead of building the full WhisperX dict. The decoded form is
+        reused while the stored bytes stay the same object; expiring or
+        refreshing the Source drops it.
+        """
+        if self.transcript_size is None or self.transcript_record is None:
+            return None
+        data = self.transcript_record.data
+        cached = self.__dict__.get("_transcript_cache")
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        compact = CompactTranscript.from_bytes(data)
+        self.__dict__["_transcript_cache"] = (data, compact)
+        return compact
+
+    @property
+    def transcript_json(self) -> Optional[dict]:
+        """The WhisperX transcript dict (legacy callers; prefer ``transcript``)."""
+        compact = self.transcript
+        return compact.to_dict() if compact is not None else None
+
+    @transcript_json.setter
+    def transcript_json(self, transcript: Optional[dict]) -> None:
+        self.__dict__.pop("_transcript_cache", None)
+        if transcript is None:
+            self.transcript_record = None
+            self.transcript_size = None
+            return
+
+        data = CompactTranscript.from_dict(transcript).to_bytes()
+        if self.transcript_record is None:
+            self.transcript_record = SourceTranscript(data=data)
+        else:
+            self.transcript_record.data = data
+        self.transcript_size = len(data)
+
+
+@event.listens_for(Source, "expire")
+def _drop_transcript_cache(source: Source, attrs) -> None:
+    source.__dict__.pop("_transcript_cache", None)
+
+
+@event.listens_for(Source, "refresh")
+def _drop_transcript_cache_on_refresh(source: Source, context, attrs) -> None:
+    source.__dict__.pop("_transcript_cache", None)
+
+
+class SourceTranscript(Base):
+    """Transcript of a Source, kept out of the sources table.
+
+    Stored in the CompactTranscript binary format so listing sources never
+    reads or decodes multi-megabyte transcripts.
+    """
+
+    __tablename__ = "source_transcripts"
+
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(default=func.now())
+
+    source: Mapped["Source"] = relationship(back_populates="transcript_record")
@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from typing import Optional
 
 from sqlalchemy import Enum as SQLEnum, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -57,6 +58,8 @@ class GeneratedClip(Base):
     resolution: Mapped[str] = mapped_column(String(20), default="1080x1920")
     caption_style: Mapped[str]
     hook_type: Mapped[str]
+    # Hook overlay rendered on this clip (differs per A/B variation)
+    hook_text: Mapped[Optional[str]] = mapped_column(default=None)
     variation_number: Mapped[int] = mapped_column(default=1)
     quality_check_passed: Mapped[bool] = mapped_column(default=False)
     created_at: Mapped[datetime] = mapped_column(default=func.now())
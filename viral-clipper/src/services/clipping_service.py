@@ -89,7 +89,9 @@ def get_clip_stats(client_id: int) -> dict:
 def regenerate_clip(moment_id: int) -> None:
     """Re-generate a clip from a moment (e.g., after fixing issues).
 
-    Resets moment status and enqueues clip generation.
+    Resets moment status and enqueues clip generation. Unchanged clips are
+    served from the render cache, and a hook-only change re-renders just
+    the overlay once the clip's base is cached.
     """
     with get_db_session() as session:
         moment = session.query(ClipMoment).get(moment_id)
@@ -86,10 +86,11 @@ def add_source_from_file(
         session.flush()
         source_id = source.id
 
-    # Skip download, go directly to transcription
-    from src.tasks.ingestion_tasks import transcribe_source
+    # Skip download, go directly to transcription (and media preparation)
+    from src.tasks.ingestion_tasks import prepare_source_media, transcribe_source
 
     transcribe_source.send(source_id)
+    prepare_source_media.send(source_id)
 
     logger.info(
         "source_file_added",
@@ -118,7 +119,8 @@ def get_client_sources(client_id: int) -> list[dict]:
                 "status": s.status.value,
                 "duration_seconds": s.duration_seconds,
                 "created_at": s.created_at.isoformat() if s.created_at else None,
-                "has_transcript": s.transcript_json is not None,
+                "has_transcript": s.has_transcript,
+                "transcript_size": s.transcript_size,
             }
             for s in sources
         ]
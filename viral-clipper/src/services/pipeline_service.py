@@ -1,8 +1,10 @@
 """Synchronous pipeline orchestrator — no Redis required.
 
 Processes a video file end-to-end:
-  transcribe → detect moments → generate hooks → extract clips → burn captions → crop to 9:16
+  transcribe → detect moments → generate hooks → render clips (one decode of the
+  source shared by nearby clips, one encode per clip)
 """
+import shutil
 from pathlib import Path
 
 import structlog
@@ -17,6 +19,8 @@ class PipelineService:
 
     def __init__(self, settings: Settings):
         self.settings = settings
+        # Kept across videos so a folder run loads the models once
+        self._transcriber = None
 
     def process_video(self, video_path: Path, output_dir: Path) -> list[Path]:
         """Process a single video through the full pipeline.
@@ -52,18 +56,30 @@ class PipelineService:
         # Step 3: Generate hooks for each moment
         print("  [3/5] Generating hooks...")
         hooks_by_moment = {}
-        for moment in moments:
-            hooks = self._generate_hooks(moment, transcript)
+        for moment, hooks in zip(moments, self._generate_hooks(moments, transcript)):
             hooks_by_moment[id(moment)] = hooks
             print(f"    Moment [{moment.start_time:.1f}s-{moment.end_time:.1f}s] "
                   f"score={moment.viral_score}: {len(hooks)} hook(s)")
 
-        # Step 4-5: Extract, caption, and crop each clip
+        # Step 4-5: Render all clips with shared source decodes
         print("  [4/5] Extracting and processing clips...")
         from src.clipper.ffmpeg_ops import FFmpegService
         ffmpeg = FFmpegService(self.settings)
+        media_path = self._media_path(video_path, ffmpeg)
 
-        finished_clips = []
+        # Captions go to the scratch area when configured (e.g. tmpfs)
+        if self.settings.scratch_dir is not None:
+            temp_dir = self.settings.get_scratch_path() / f"pipeline_{video_path.stem}"
+        else:
+            temp_dir = output_dir / ".temp"
+        temp_dir.mkdir(exist_ok=True)
+
+        plans = []
+        output_paths = []
+        variant_hooks = []
+        variant_paths = []
+        clip_moments = []
+        clip_nums = []
         clip_num = 0
 
         for moment in moments:
@@ -72,129 +88,156 @@ class PipelineService:
                 continue
 
             # Use the best hook (first one)
-            hook = hooks[0]
             clip_num += 1
-
             try:
-                clip_path = self._process_clip(
-                    ffmpeg=ffmpeg,
-                    video_path=video_path,
-                    output_dir=output_dir,
+                plans.append(self._build_render_plan(
+                    video_path=media_path,
+                    temp_dir=temp_dir,
                     clip_num=clip_num,
                     moment=moment,
-                    hook=hook,
+                    hook=hooks[0],
                     transcript=transcript,
-                )
-                if clip_path:
-                    finished_clips.append(clip_path)
-                    print(f"    Clip {clip_num}: {clip_path.name} "
-                          f"[{moment.start_time:.1f}s-{moment.end_time:.1f}s]")
+                ))
             except Exception as e:
                 print(f"    Clip {clip_num} FAILED: {e}")
                 logger.exception("clip_processing_failed", clip_num=clip_num)
+                continue
+            clip_nums.append(clip_num)
+            output_paths.append(output_dir / f"clip_{clip_num:03d}.mp4")
+            clip_moments.append(moment)
+
+            # Extra hooks become clip_NNN_vK.mp4 variants
+            extra_hooks = hooks[1:self.settings.hook_variants_per_clip]
+            variant_hooks.append([h.hook_text or "" for h in extra_hooks])
+            variant_paths.append([
+                output_dir / f"clip_{clip_num:03d}_v{n}.mp4"
+                for n in range(2, len(extra_hooks) + 2)
+            ])
+
+        results = ffmpeg.render_batch(
+            plans,
+            output_paths,
+            priorities=[m.viral_score for m in clip_moments],
+            variant_hooks=variant_hooks,
+            variant_paths=variant_paths,
+        ) if plans else []
+
+        finished_clips = []
+        for clip_num, moment, result in zip(clip_nums, clip_moments, results):
+            clip_path = Path(result["output_path"])
+            if result["success"] and clip_path.exists() and clip_path.stat().st_size > 0:
+                finished_clips.append(clip_path)
+                print(f"    Clip {clip_num}: {clip_path.name} "
+                      f"[{moment.start_time:.1f}s-{moment.end_time:.1f}s]")
+                for variant_path in result.get("variant_paths", []):
+                    if variant_path.exists() and variant_path.stat().st_size > 0:
+                        finished_clips.append(variant_path)
+                        print(f"      Variant: {variant_path.name}")
+            else:
+                print(f"    Clip {clip_num} FAILED: {result['error'] or 'empty output'}")
+                logger.error("clip_processing_failed", clip_num=clip_num, error=result["error"])
+
+        # Clean up temp files
+        for f in temp_dir.iterdir():
+            if f.name.startswith("clip_"):
+                f.unlink(missing_ok=True)
+        if self.settings.scratch_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
         print(f"  [5/5] Done — {len(finished_clips)} clip(s) ready")
         return finished_clips
 
     def _transcribe(self, video_path: Path) -> dict:
-        """Transcribe video using WhisperX."""
+        """Transcribe video using WhisperX (via the transcription server if running).
+
+        Word-timed captions next to the video are used instead when good enough.
+        """
+        from src.ingestion.captions import load_caption_transcript
         from src.ingestion.transcriber import WhisperXTranscriber
-        transcriber = WhisperXTranscriber(self.settings)
+        from src.ingestion.transcription_server import get_transcriber
+        transcript = load_caption_transcript(video_path, self.settings)
+        if transcript is not None:
+            return transcript
+        if self._transcriber is None:
+            self._transcriber = WhisperXTranscriber(self.settings)
+        transcriber = get_transcriber(self.settings, local=self._transcriber)
         return transcriber.transcribe(video_path)
 
+    def _media_path(self, video_path: Path, ffmpeg) -> Path:
+        """File to cut clips from: a short-GOP mezzanine when enabled.
+
+        An up-to-date mezzanine from an earlier run is reused. Falls back to
+        the original file if the transcode fails.
+        """
+        if not self.settings.mezzanine_enabled:
+            return video_path
+
+        from src.clipper.ffmpeg_ops import MEZZANINE_SUFFIX
+        from src.exceptions import FFmpegError
+        mezzanine = video_path.with_name(f"{video_path.stem}{MEZZANINE_SUFFIX}")
+        if mezzanine.exists() and mezzanine.stat().st_mtime >= video_path.stat().st_mtime:
+            return mezzanine
+
+        print("    Transcoding mezzanine...")
+        try:
+            return ffmpeg.transcode_mezzanine(video_path, mezzanine)
+        except FFmpegError as e:
+            logger.warning("mezzanine_failed", source=str(video_path), error=str(e))
+            return video_path
+
     def _detect_moments(self, transcript: dict) -> list:
         """Detect viral moments using Claude."""
         from src.ai.moment_detector import MomentDetector
         detector = MomentDetector(self.settings)
         return detector.detect_moments(transcript, max_moments=10)
 
-    def _generate_hooks(self, moment, transcript: dict) -> list:
-        """Generate hooks for a moment using Claude."""
+    def _generate_hooks(self, moments: list, transcript: dict) -> list[list]:
+        """Generate hooks for all moments using Claude (batched requests)."""
         from src.ai.hook_writer import HookWriter
         writer = HookWriter(self.settings)
-        return writer.generate_hooks(
-            start_time=moment.start_time,
-            end_time=moment.end_time,
-            transcript=transcript,
-            num_variations=3,
+        return writer.generate_hooks_batch(
+            moments,
+            transcript,
+            num_variations=max(3, self.settings.hook_variants_per_clip),
         )
 
-    def _process_clip(
+    def _build_render_plan(
         self,
-        ffmpeg: "FFmpegService",
         video_path: Path,
-        output_dir: Path,
+        temp_dir: Path,
         clip_num: int,
         moment,
         hook,
         transcript: dict,
-    ) -> Path | None:
-        """Extract, caption, and crop a single clip.
+    ) -> "RenderPlan":
+        """Generate captions for a clip and describe its single-pass render.
 
-        Pipeline: extract → burn captions → add hook overlay → crop to 9:16
+        Trim, 9:16 crop, caption burn-in and hook overlay are compiled into
+        one filter graph, so the clip is encoded exactly once.
         """
-        temp_dir = output_dir / ".temp"
-        temp_dir.mkdir(exist_ok=True)
-
-        prefix = f"clip_{clip_num:03d}"
+        from src.clipper.render_plan import RenderPlan
 
-        # Step A: Extract raw clip from source
-        raw_path = temp_dir / f"{prefix}_raw.mp4"
-        ffmpeg.extract_clip(
-            source_path=video_path,
-            output_path=raw_path,
-            start_time=moment.start_time,
-            end_time=moment.end_time,
-        )
-
-        # Step B: Generate and burn captions
         words = self._get_words_for_range(transcript, moment.start_time, moment.end_time)
-        current_input = raw_path
+        ass_path = None
 
         if words:
             from src.clipper.captioner import generate_ass_captions
-            ass_path = temp_dir / f"{prefix}.ass"
+            ass_path = temp_dir / f"clip_{clip_num:03d}.ass"
             generate_ass_captions(
                 words=words,
                 output_path=ass_path,
                 clip_start_time=moment.start_time,
             )
 
-            captioned_path = temp_dir / f"{prefix}_captioned.mp4"
-            ffmpeg.burn_captions(
-                input_path=current_input,
-                ass_path=ass_path,
-                output_path=captioned_path,
-            )
-            current_input = captioned_path
-
-        # Step C: Add hook text overlay
-        if hook.hook_text:
-            hooked_path = temp_dir / f"{prefix}_hooked.mp4"
-            ffmpeg.add_hook_overlay(
-                input_path=current_input,
-                output_path=hooked_path,
-                hook_text=hook.hook_text,
-                duration=3.0,
-            )
-            current_input = hooked_path
-
-        # Step D: Crop to vertical 9:16
-        final_path = output_dir / f"{prefix}.mp4"
-        ffmpeg.crop_to_vertical(
-            input_path=current_input,
-            output_path=final_path,
+        return RenderPlan(
+            source_path=video_path,
+            start_time=moment.start_time,
+            end_time=moment.end_time,
+            ass_path=ass_path,
+            hook_text=hook.hook_text or "",
+            hook_duration=3.0,
         )
 
-        # Clean up temp files
-        for f in temp_dir.iterdir():
-            if f.name.startswith(prefix):
-                f.unlink(missing_ok=True)
-
-        if final_path.exists() and final_path.stat().st_size > 0:
-            return final_path
-        return None
-
     def _get_words_for_range(
         self,
         transcript: dict,
@@ -202,11 +245,5 @@ class PipelineService:
         end_time: float,
     ) -> list[dict]:
         """Extract word-level timestamps for a time range from the transcript."""
-        words = []
-        for segment in transcript.get("segments", []):
-            for word in segment.get("words", []):
-                w_start = word.get("start", 0)
-                w_end = word.get("end", 0)
-                if w_end >= start_time and w_start <= end_time:
-                    words.append(word)
-        return words
+        from src.ingestion.transcript_index import get_transcript_index
+        return get_transcript_index(transcript).words_in_range(start_time, end_time)
@@ -16,7 +16,7 @@ def detect_moments(source_id: int, max_moments: int = 10) -> None:
     """Detect viral moments in a transcribed source using Claude.
 
     Creates ClipMoment records for each detected moment.
-    On success, enqueues clip generation for each moment.
+    On success, enqueues batch clip generation for the source.
     """
     settings = get_settings()
     detector = MomentDetector(settings)
@@ -35,13 +35,14 @@ def detect_moments(source_id: int, max_moments: int = 10) -> None:
             )
             return
 
-        if not source.transcript_json:
+        transcript = source.transcript
+        if not transcript:
             logger.error("source_has_no_transcript", source_id=source_id)
             return
 
         try:
             moments = detector.detect_moments(
-                transcript=source.transcript_json,
+                transcript=transcript,
                 max_moments=max_moments,
             )
 
@@ -67,17 +68,11 @@ def detect_moments(source_id: int, max_moments: int = 10) -> None:
                 count=len(moments),
             )
 
-            # Enqueue clip generation for each moment
-            from src.tasks.clipper_tasks import generate_clip
+            # Enqueue one batch render for all of this source's moments, so
+            # the source is decoded once instead of once per moment
+            from src.tasks.clipper_tasks import generate_source_clips
 
-            detected_moments = (
-                session.query(ClipMoment)
-                .filter_by(source_id=source_id, status=MomentStatus.DETECTED)
-                .all()
-            )
-
-            for cm in detected_moments:
-                generate_clip.send(cm.id)
+            generate_source_clips.send(source_id)
 
         except AIDetectionError as e:
             logger.error(
@@ -4,11 +4,13 @@ import dramatiq
 import structlog
 
 from src.clipper.captioner import generate_ass_captions
-from src.clipper.cropper import VideoCropper
 from src.clipper.ffmpeg_ops import FFmpegService
 from src.clipper.profanity import ProfanityFilter
+from src.clipper.render_plan import RenderPlan
 from src.config import get_settings
 from src.database import get_db_session
+from src.ingestion.compact_transcript import CompactTranscript
+from src.ingestion.transcript_index import get_transcript_index
 from src.models.client import Source
 from src.models.content import ClipMoment, GeneratedClip, MomentStatus
 
@@ -20,18 +22,15 @@ def generate_clip(moment_id: int) -> None:
     """Generate a finished clip from a detected moment.
 
     Pipeline:
-    1. Extract clip at timestamps
-    2. Crop to vertical 9:16
-    3. Generate ASS captions with word-by-word highlighting
-    4. Burn captions into video
-    5. Add hook text overlay
-    6. Detect and mute profanity
-    7. Validate quality
-    8. Save GeneratedClip record
+    1. Generate ASS captions with word-by-word highlighting
+    2. Detect profanity to mute
+    3. Render in one FFmpeg pass: trim, crop to 9:16, burn captions,
+       add hook overlay, mute profanity
+    4. Validate quality
+    5. Save GeneratedClip record
     """
     settings = get_settings()
     ffmpeg = FFmpegService(settings)
-    cropper = VideoCropper(ffmpeg)
     profanity_filter = ProfanityFilter(ffmpeg)
 
     with get_db_session() as session:
@@ -48,84 +47,29 @@ def generate_clip(moment_id: int) -> None:
         moment.status = MomentStatus.GENERATING
         session.flush()
 
-        source_path = Path(source.file_path)
+        source_path = Path(source.media_path)
         if not source_path.exists():
             logger.error("source_file_missing", path=str(source_path))
             moment.status = MomentStatus.FAILED
             return
 
         clip_dir = settings.get_clip_storage_path(moment.client_id)
-        temp_dir = settings.get_temp_path()
-        clip_name = f"clip_{moment.id}"
+        temp_dir = settings.get_scratch_path()
+        final_clip = clip_dir / f"clip_{moment.id}_final.mp4"
 
         try:
-            # Step 1: Extract clip at timestamps
-            raw_clip = temp_dir / f"{clip_name}_raw.mp4"
-            ffmpeg.extract_clip(source_path, raw_clip, moment.start_time, moment.end_time)
+            # Steps 1-2: Captions and profanity segments
+            plan = _build_render_plan(moment, source, temp_dir, profanity_filter)
 
-            # Step 2: Crop to vertical
-            vertical_clip = temp_dir / f"{clip_name}_vertical.mp4"
-            cropper.crop_to_vertical(raw_clip, vertical_clip)
+            # Step 3: Render everything in a single encode
+            ffmpeg.render_clip(plan, final_clip)
 
-            # Step 3: Generate ASS captions from word timestamps
-            words = _extract_words_for_range(
-                source.transcript_json, moment.start_time, moment.end_time
-            )
-            ass_path = temp_dir / f"{clip_name}.ass"
-            generate_ass_captions(words, ass_path, clip_start_time=moment.start_time)
-
-            # Step 4: Burn captions
-            captioned_clip = temp_dir / f"{clip_name}_captioned.mp4"
-            ffmpeg.burn_captions(vertical_clip, ass_path, captioned_clip)
-
-            # Step 5: Add hook overlay
-            hooked_clip = temp_dir / f"{clip_name}_hooked.mp4"
-            ffmpeg.add_hook_overlay(captioned_clip, hooked_clip, moment.hook_text)
-
-            # Step 6: Mute profanity
-            final_clip = clip_dir / f"{clip_name}_final.mp4"
-            # Adjust word timestamps relative to clip start
-            clip_words = [
-                {**w, "start": w["start"] - moment.start_time, "end": w["end"] - moment.start_time}
-                for w in words
-            ]
-            profanity_filter.mute_profanity(hooked_clip, final_clip, clip_words)
-
-            # Step 7: Validate quality
-            validation = ffmpeg.validate_clip(final_clip)
-            quality_passed = validation["passed"]
-
-            if not quality_passed:
-                logger.warning(
-                    "clip_quality_issues",
-                    moment_id=moment_id,
-                    issues=validation["issues"],
-                )
-
-            # Step 8: Save GeneratedClip record
-            generated = GeneratedClip(
-                moment_id=moment.id,
-                client_id=moment.client_id,
-                file_path=str(final_clip),
-                duration=validation.get("duration", moment.end_time - moment.start_time),
-                caption_style="word_highlight_yellow",
-                hook_type="text_overlay",
-                quality_check_passed=quality_passed,
-            )
-            session.add(generated)
-            moment.status = MomentStatus.READY
-
-            logger.info(
-                "clip_generated",
-                moment_id=moment_id,
-                output=str(final_clip),
-                quality_passed=quality_passed,
-            )
+            # Steps 4-5: Validate and save GeneratedClip record
+            _record_generated_clip(session, ffmpeg, moment, final_clip)
 
             # Cleanup temp files
-            for temp_file in [raw_clip, vertical_clip, captioned_clip, hooked_clip, ass_path]:
-                if temp_file.exists():
-                    temp_file.unlink()
+            if plan.ass_path and plan.ass_path.exists():
+                plan.ass_path.unlink()
 
         except Exception as e:
             logger.error("clip_generation_failed", moment_id=moment_id, error=str(e))
@@ -133,17 +77,275 @@ def generate_clip(moment_id: int) -> None:
             raise
 
 
+@dramatiq.actor(max_retries=2, min_backoff=30_000, max_backoff=300_000)
+def generate_source_clips(source_id: int) -> None:
+    """Generate finished clips for every detected moment of a source.
+
+    Same per-clip pipeline as generate_clip, but all clips are rendered
+    with FFmpegService.render_batch, so each region of the (often hours
+    long) source is opened, seeked and decoded once for all nearby
+    moments instead of once per moment. Render and validate jobs run on a
+    JobGraph within the CPU-thread budget, highest viral score first.
+
+    A moment whose captions, render group or record fails is marked
+    FAILED; the rest are kept. With hook_variants_per_clip > 1,
+    generate_hook_variants is enqueued for every rendered clip to add the
+    extra hook variants.
+    """
+    settings = get_settings()
+    ffmpeg = FFmpegService(settings)
+    profanity_filter = ProfanityFilter(ffmpeg)
+    variant_moments: list[int] = []
+
+    with get_db_session() as session:
+        source = session.query(Source).get(source_id)
+        if source is None:
+            logger.error("source_not_found", source_id=source_id)
+            return
+
+        moments = (
+            session.query(ClipMoment)
+            .filter_by(source_id=source_id, status=MomentStatus.DETECTED)
+            .order_by(ClipMoment.start_time)
+            .all()
+        )
+        if not moments:
+            logger.info("no_moments_to_generate", source_id=source_id)
+            return
+
+        source_path = Path(source.media_path)
+        if not source_path.exists():
+            logger.error("source_file_missing", path=str(source_path))
+            for moment in moments:
+                moment.status = MomentStatus.FAILED
+            return
+
+        for moment in moments:
+            moment.status = MomentStatus.GENERATING
+        session.flush()
+
+        clip_dir = settings.get_clip_storage_path(source.client_id)
+        temp_dir = settings.get_scratch_path()
+
+        # A moment whose captions can't be built fails alone
+        planned = []
+        plans = []
+        for moment in moments:
+            try:
+                plans.append(_build_render_plan(moment, source, temp_dir, profanity_filter))
+            except Exception as e:
+                logger.error("clip_generation_failed", moment_id=moment.id, error=str(e))
+                moment.status = MomentStatus.FAILED
+                continue
+            planned.append(moment)
+        output_paths = [clip_dir / f"clip_{moment.id}_final.mp4" for moment in planned]
+
+        results = ffmpeg.render_batch(
+            plans,
+            output_paths,
+            priorities=[moment.viral_score for moment in planned],
+            validate=True,
+        ) if plans else []
+
+        for moment, result in zip(planned, results):
+            if not result["success"]:
+                logger.error(
+                    "clip_generation_failed",
+                    moment_id=moment.id,
+                    error=result["error"],
+                )
+                moment.status = MomentStatus.FAILED
+                continue
+            try:
+                _record_generated_clip(
+                    session,
+                    ffmpeg,
+                    moment,
+                    Path(result["output_path"]),
+                    validation=result["validation"],
+                )
+            except Exception as e:
+                logger.error("clip_generation_failed", moment_id=moment.id, error=str(e))
+                moment.status = MomentStatus.FAILED
+                continue
+            if settings.hook_variants_per_clip > 1:
+                variant_moments.append(moment.id)
+
+        for plan in plans:
+            if plan.ass_path and plan.ass_path.exists():
+                plan.ass_path.unlink()
+
+    # Enqueued after the session commits, so the workers see the READY clips
+    for moment_id in variant_moments:
+        generate_hook_variants.send(moment_id, settings.hook_variants_per_clip - 1)
+
+
+@dramatiq.actor(max_retries=2, min_backoff=30_000, max_backoff=300_000)
+def generate_hook_variants(moment_id: int, num_variations: int = 3) -> None:
+    """Render A/B hook variants of a moment's clip.
+
+    Writes fresh hooks with HookWriter and renders one clip per hook via
+    FFmpegService.render_hook_variants: the captioned body is encoded once
+    and only the short head segment carrying the hook overlay is re-encoded
+    per variant. Each variant is saved as its own GeneratedClip, numbered
+    after any variations the moment already has.
+    """
+    from src.ai.hook_writer import HookWriter
+
+    settings = get_settings()
+    ffmpeg = FFmpegService(settings)
+    profanity_filter = ProfanityFilter(ffmpeg)
+
+    with get_db_session() as session:
+        moment = session.query(ClipMoment).get(moment_id)
+        if moment is None:
+            logger.error("moment_not_found", moment_id=moment_id)
+            return
+
+        source = session.query(Source).get(moment.source_id)
+        if source is None:
+            logger.error("source_not_found", source_id=moment.source_id)
+            return
+
+        source_path = Path(source.media_path)
+        if not source_path.exists():
+            logger.error("source_file_missing", path=str(source_path))
+            return
+
+        hooks = HookWriter(settings).generate_hooks(
+            start_time=moment.start_time,
+            end_time=moment.end_time,
+            transcript=source.transcript,
+            num_variations=num_variations,
+        )
+        hook_texts = [h.hook_text for h in hooks if h.hook_text]
+        if not hook_texts:
+            logger.warning("no_hooks_generated", moment_id=moment_id)
+            return
+
+        existing = [
+            clip.variation_number
+            for clip in session.query(GeneratedClip).filter_by(moment_id=moment.id).all()
+        ]
+        first_number = max(existing, default=0) + 1
+        numbers = range(first_number, first_number + len(hook_texts))
+
+        clip_dir = settings.get_clip_storage_path(moment.client_id)
+        temp_dir = settings.get_scratch_path()
+        output_paths = [clip_dir / f"clip_{moment.id}_v{n}.mp4" for n in numbers]
+
+        plan = _build_render_plan(moment, source, temp_dir, profanity_filter)
+        try:
+            ffmpeg.render_hook_variants(plan, hook_texts, output_paths)
+        except Exception as e:
+            logger.error("hook_variants_failed", moment_id=moment_id, error=str(e))
+            raise
+        finally:
+            if plan.ass_path and plan.ass_path.exists():
+                plan.ass_path.unlink()
+
+        for number, hook_text, output_path in zip(numbers, hook_texts, output_paths):
+            _record_generated_clip(
+                session,
+                ffmpeg,
+                moment,
+                output_path,
+                variation_number=number,
+                hook_text=hook_text,
+            )
+
+
+def _build_render_plan(
+    moment: ClipMoment,
+    source: Source,
+    temp_dir: Path,
+    profanity_filter: ProfanityFilter,
+) -> RenderPlan:
+    """Write captions for a moment and describe its single-pass render."""
+    words = _extract_words_for_range(
+        source.transcript, moment.start_time, moment.end_time, source_id=source.id
+    )
+    ass_path = temp_dir / f"clip_{moment.id}.ass"
+    generate_ass_captions(words, ass_path, clip_start_time=moment.start_time)
+
+    # Adjust word timestamps relative to clip start
+    clip_words = [
+        {**w, "start": w["start"] - moment.start_time, "end": w["end"] - moment.start_time}
+        for w in words
+    ]
+    mute_segments = profanity_filter.detect_profanity(clip_words)
+
+    return RenderPlan(
+        source_path=Path(source.media_path),
+        start_time=moment.start_time,
+        end_time=moment.end_time,
+        ass_path=ass_path,
+        hook_text=moment.hook_text,
+        mute_segments=mute_segments,
+    )
+
+
+def _record_generated_clip(
+    session,
+    ffmpeg: FFmpegService,
+    moment: ClipMoment,
+    final_clip: Path,
+    variation_number: int = 1,
+    validation: dict | None = None,
+    hook_text: str | None = None,
+) -> GeneratedClip:
+    """Validate a rendered clip and save its GeneratedClip record.
+
+    Pass ``validation`` when the clip was already validated (render_batch
+    with validate=True) to skip probing it again, and ``hook_text`` when the
+    clip carries a hook other than the moment's own.
+    """
+    if validation is None:
+        validation = ffmpeg.validate_clip(final_clip)
+    quality_passed = validation["passed"]
+
+    if not quality_passed:
+        logger.warning(
+            "clip_quality_issues",
+            moment_id=moment.id,
+            issues=validation["issues"],
+        )
+
+    generated = GeneratedClip(
+        moment_id=moment.id,
+        client_id=moment.client_id,
+        file_path=str(final_clip),
+        duration=validation.get("duration", moment.end_time - moment.start_time),
+        caption_style="word_highlight_yellow",
+        hook_type="text_overlay",
+        hook_text=hook_text if hook_text is not None else moment.hook_text,
+        variation_number=variation_number,
+        quality_check_passed=quality_passed,
+    )
+    session.add(generated)
+    moment.status = MomentStatus.READY
+
+    logger.info(
+        "clip_generated",
+        moment_id=moment.id,
+        output=str(final_clip),
+        quality_passed=quality_passed,
+    )
+
+    return generated
+
+
 def _extract_words_for_range(
-    transcript: dict,
+    transcript: dict | CompactTranscript,
     start_time: float,
     end_time: float,
+    source_id: int | None = None,
 ) -> list[dict]:
-    """Extract word-level timestamps from transcript for a time range."""
-    words = []
-    for segment in transcript.get("segments", []):
-        for word in segment.get("words", []):
-            w_start = word.get("start", 0)
-            w_end = word.get("end", 0)
-            if w_end >= start_time and w_start <= end_time:
-                words.append(word)
-    return words
+    """Extract word-level timestamps from transcript for a time range.
+
+    Uses the worker's cached TranscriptIndex for the source, so repeated
+    moments of one source don't rescan the whole transcript.
+    """
+    return get_transcript_index(transcript, key=source_id).words_in_range(
+        start_time, end_time
+    )
@@ -3,24 +3,51 @@ from pathlib import Path
 import dramatiq
 import structlog
 
+from src.clipper.ffmpeg_ops import FFmpegService
 from src.config import get_settings
 from src.database import get_db_session
-from src.exceptions import DownloadError, TranscriptionError
+from src.exceptions import DownloadError, FFmpegError, TranscriptionError
+from src.ingestion.captions import load_caption_transcript
 from src.ingestion.downloader import ContentDownloader
 from src.ingestion.transcriber import WhisperXTranscriber
+from src.ingestion.transcription_server import TranscriptionClient, get_transcriber
 from src.models.client import Source, SourceStatus
 
 logger = structlog.get_logger()
 
-# Shared transcriber instance (lazy-loads model on first use)
+# Shared transcriber instance (lazy-loads model on first use), used when
+# the transcription server isn't running
 _transcriber: WhisperXTranscriber | None = None
 
 
-def _get_transcriber() -> WhisperXTranscriber:
+def _get_transcriber() -> WhisperXTranscriber | TranscriptionClient:
     global _transcriber
+    settings = get_settings()
     if _transcriber is None:
-        _transcriber = WhisperXTranscriber(get_settings())
-    return _transcriber
+        _transcriber = WhisperXTranscriber(settings)
+    return get_transcriber(settings, local=_transcriber)
+
+
+def _prepare_media(source: Source) -> None:
+    """Prepare a source for clipping: optional mezzanine, then keyframe index.
+
+    Non-fatal: without a mezzanine clips are cut from the original file,
+    and the keyframe index is rebuilt on demand if building it fails here.
+    """
+    settings = get_settings()
+    ffmpeg = FFmpegService(settings)
+
+    if settings.mezzanine_enabled and not source.mezzanine_path:
+        try:
+            mezzanine = ffmpeg.transcode_mezzanine(Path(source.file_path))
+            source.mezzanine_path = str(mezzanine)
+        except FFmpegError as e:
+            logger.warning("mezzanine_failed", source_id=source.id, error=str(e))
+
+    try:
+        ffmpeg.get_keyframe_index(Path(source.media_path))
+    except (FFmpegError, OSError) as e:
+        logger.warning("keyframe_index_failed", source_id=source.id, error=str(e))
 
 
 @dramatiq.actor(max_retries=2, min_backoff=30_000, max_backoff=300_000)
@@ -59,16 +86,18 @@ def download_source(source_id: int) -> None:
             source.status = SourceStatus.FAILED
             return
 
-    # Enqueue transcription after successful download
+    # Enqueue transcription after successful download; media preparation
+    # runs alongside it instead of holding up moment detection
     transcribe_source.send(source_id)
+    prepare_source_media.send(source_id)
 
 
 @dramatiq.actor(max_retries=1, min_backoff=60_000, max_backoff=600_000)
 def transcribe_source(source_id: int) -> None:
-    """Transcribe a downloaded source video using WhisperX.
+    """Transcribe a downloaded source video using WhisperX (or its captions).
 
-    Updates the Source record with transcript JSON.
-    On success, enqueues moment detection.
+    Updates the Source record with transcript JSON. On success, enqueues
+    moment detection.
     """
     transcriber = _get_transcriber()
 
@@ -91,7 +120,10 @@ def transcribe_source(source_id: int) -> None:
             if not video_path.exists():
                 raise TranscriptionError(f"Video file not found: {video_path}")
 
-            transcript = transcriber.transcribe(video_path)
+            # Word-timed captions, when good enough, make ASR unnecessary
+            transcript = load_caption_transcript(video_path, get_settings())
+            if transcript is None:
+                transcript = transcriber.transcribe(video_path)
             source.transcript_json = transcript
             source.status = SourceStatus.READY
 
@@ -110,3 +142,24 @@ def transcribe_source(source_id: int) -> None:
     from src.tasks.ai_tasks import detect_moments
 
     detect_moments.send(source_id)
+
+
+@dramatiq.actor(max_retries=0)
+def prepare_source_media(source_id: int) -> None:
+    """Create the optional mezzanine and the keyframe index for a source.
+
+    Runs as its own step next to transcription, so the transcode never
+    delays moment detection or keeps the transcription transaction open.
+    Clips rendered before it finishes are cut from the original file.
+    """
+    with get_db_session() as session:
+        source = session.query(Source).get(source_id)
+        if source is None:
+            logger.error("source_not_found", source_id=source_id)
+            return
+
+        if not source.file_path or not Path(source.file_path).exists():
+            logger.warning("source_media_missing", source_id=source_id)
+            return
+
+        _prepare_media(source)
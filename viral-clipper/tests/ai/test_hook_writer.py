@@ -1,3 +1,4 @@
+import re
 from unittest.mock import MagicMock
 import json
 
@@ -74,3 +75,120 @@ class TestGenerateHooks:
         result = writer.generate_hooks(0.0, 30.0, transcript)
         assert len(result) == 1
         assert result[0].hook_text == "You won't believe this"
+
+
+class TestGenerateHooksBatch:
+    def _moments(self, count):
+        from src.ai.moment_detector import ViralMoment
+
+        return [
+            ViralMoment(
+                start_time=i * 60.0,
+                end_time=i * 60.0 + 30,
+                hook_text="h",
+                caption_text="c",
+                viral_score=50,
+                reasoning="r",
+            )
+            for i in range(count)
+        ]
+
+    def _transcript(self, count):
+        return {
+            "segments": [
+                {"start": i * 60.0, "end": i * 60.0 + 30, "text": f"moment {i} content"}
+                for i in range(count)
+            ]
+        }
+
+    def _hooks(self, text):
+        return {"hooks": [{"hook_text": text, "post_caption": "cap #x", "hook_style": "story"}]}
+
+    def _fake_claude(self, calls, drop=()):
+        """Answers batches keyed by clip ID (minus ``drop``) and single prompts."""
+
+        def fake(**kwargs):
+            prompt = kwargs["user_prompt"]
+            calls.append(prompt)
+            clip_ids = re.findall(r"^CLIP (m\d+):", prompt, re.MULTILINE)
+            if clip_ids:
+                return json.dumps({"clips": {
+                    clip_id: self._hooks(f"batch {clip_id}")
+                    for clip_id in clip_ids if clip_id not in drop
+                }})
+            start = re.search(r"Start: ([\d.]+)s", prompt).group(1)
+            return json.dumps(self._hooks(f"single {start}"))
+
+        return fake
+
+    def test_one_request_for_all_moments(self, settings, monkeypatch):
+        calls = []
+        monkeypatch.setattr("src.ai.hook_writer.call_claude", self._fake_claude(calls))
+        result = HookWriter(settings).generate_hooks_batch(self._moments(5), self._transcript(5))
+        assert len(calls) == 1
+        assert [hooks[0].hook_text for hooks in result] == [f"batch m{i}" for i in range(1, 6)]
+        assert "moment 3 content" in calls[0]
+
+    def test_missing_clip_falls_back_to_single_call(self, settings, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "src.ai.hook_writer.call_claude", self._fake_claude(calls, drop={"m2"})
+        )
+        result = HookWriter(settings).generate_hooks_batch(self._moments(3), self._transcript(3))
+        assert len(calls) == 2
+        assert [hooks[0].hook_text for hooks in result] == ["batch m1", "single 60.0", "batch m3"]
+
+    def test_invalid_batch_falls_back_to_per_moment(self, settings, monkeypatch):
+        calls = []
+        single = self._fake_claude(calls)
+
+        def fake(**kwargs):
+            if "CLIP m1:" in kwargs["user_prompt"]:
+                calls.append(kwargs["user_prompt"])
+                return '{"clips": {"m1": {"hooks": "not a list"}}}'
+            return single(**kwargs)
+
+        monkeypatch.setattr("src.ai.hook_writer.call_claude", fake)
+        result = HookWriter(settings).generate_hooks_batch(self._moments(3), self._transcript(3))
+        assert len(calls) == 4
+        assert [hooks[0].hook_text for hooks in result] == [
+            "single 0.0", "single 60.0", "single 120.0"
+        ]
+
+    def test_split_by_batch_size(self, settings, monkeypatch):
+        settings.hook_batch_size = 2
+        calls = []
+        monkeypatch.setattr("src.ai.hook_writer.call_claude", self._fake_claude(calls))
+        result = HookWriter(settings).generate_hooks_batch(self._moments(5), self._transcript(5))
+        # 2 + 2 batched, the last one on its own uses the single-moment prompt
+        assert len(calls) == 3
+        assert len(result) == 5
+        assert result[4][0].hook_text == "single 240.0"
+
+    def test_split_by_token_budget(self, settings, monkeypatch):
+        writer = HookWriter(settings)
+        moments = self._moments(6)
+        excerpts = ["x" * 8000] * 6  # ~2000 tokens each
+        settings.hook_batch_max_tokens = 5000
+        batches = writer._plan_batches(moments, excerpts, num_variations=3)
+        assert [i for batch in batches for i in batch] == list(range(6))
+        assert all(len(batch) == 2 for batch in batches)
+
+    def test_batch_size_one_is_per_moment(self, settings, monkeypatch):
+        settings.hook_batch_size = 1
+        calls = []
+        monkeypatch.setattr("src.ai.hook_writer.call_claude", self._fake_claude(calls))
+        result = HookWriter(settings).generate_hooks_batch(self._moments(3), self._transcript(3))
+        assert len(calls) == 3
+        assert all("CLIP m" not in prompt for prompt in calls)
+        assert result[2][0].hook_text == "single 120.0"
+
+    def test_empty(self, settings):
+        assert HookWriter(settings).generate_hooks_batch([], {"segments": []}) == []
+
+    def test_stub_backend(self, settings):
+        settings.llm_backend = "stub"
+        result = HookWriter(settings).generate_hooks_batch(
+            self._moments(4), self._transcript(4), num_variations=3
+        )
+        assert [len(hooks) for hooks in result] == [3, 3, 3, 3]
@@ -0,0 +1,164 @@
+import json
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai import llm_backend
+from src.ai.hook_writer import HookWriter
+from src.ai.llm_backend import (
+    CLIBackend,
+    LLMBackend,
+    SDKBackend,
+    StubBackend,
+    get_llm_backend,
+    strip_code_fences,
+)
+from src.ai.moment_detector import MomentDetector
+from src.ai.prompts import HOOK_GENERATION_SYSTEM, MOMENT_DETECTION_SYSTEM
+
+
+class TestStripCodeFences:
+    def test_fenced(self):
+        assert strip_code_fences('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_plain(self):
+        assert strip_code_fences('{"a": 1}') == '{"a": 1}'
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        LLMBackend()
+
+
+class TestGetLLMBackend:
+    def test_cli_without_settings(self):
+        assert isinstance(get_llm_backend(), CLIBackend)
+
+    @pytest.mark.parametrize("name,cls", [("cli", CLIBackend), ("sdk", SDKBackend), ("stub", StubBackend)])
+    def test_selected_by_settings(self, settings, name, cls):
+        settings.llm_backend = name
+        assert isinstance(get_llm_backend(settings), cls)
+
+    def test_unknown(self, settings):
+        settings.llm_backend = "carrier-pigeon"
+        with pytest.raises(ValueError, match="Unknown LLM backend"):
+            get_llm_backend(settings)
+
+
+class TestCLIBackend:
+    def test_parses_result(self, monkeypatch):
+        seen = {}
+
+        def fake_run(cmd, **kwargs):
+            seen.update(cmd=cmd, env=kwargs["env"])
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout=json.dumps({"result": '```json\n{"ok": true}\n```'}), stderr=""
+            )
+
+        monkeypatch.setenv("CLAUDECODE", "1")
+        monkeypatch.setattr(llm_backend.subprocess, "run", fake_run)
+        assert CLIBackend().complete("sys", "user") == '{"ok": true}'
+        assert seen["cmd"][:2] == ["claude", "-p"]
+        assert "--model" not in seen["cmd"]
+        assert "CLAUDECODE" not in seen["env"]
+
+    def test_failure_raises(self, monkeypatch):
+        monkeypatch.setattr(
+            llm_backend.subprocess,
+            "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1, stdout="", stderr="nope"),
+        )
+        with pytest.raises(RuntimeError, match="Claude CLI failed"):
+            CLIBackend().complete("sys", "user")
+
+    def test_timeout_raises_runtime_error(self, monkeypatch):
+        def fake_run(cmd, **kwargs):
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+        monkeypatch.setattr(llm_backend.subprocess, "run", fake_run)
+        with pytest.raises(RuntimeError, match="timed out") as excinfo:
+            CLIBackend(timeout=5).complete("sys", "user")
+        assert isinstance(excinfo.value.__cause__, subprocess.TimeoutExpired)
+
+    @pytest.mark.parametrize("stdout", ["not json", json.dumps({"error": "x"})])
+    def test_unexpected_output_raises_runtime_error(self, monkeypatch, stdout):
+        monkeypatch.setattr(
+            llm_backend.subprocess,
+            "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=""),
+        )
+        with pytest.raises(RuntimeError, match="unexpected output"):
+            CLIBackend().complete("sys", "user")
+
+
+class TestSDKBackend:
+    def test_requires_api_key(self, settings):
+        settings.claude_api_key = ""
+        with pytest.raises(RuntimeError, match="CLAUDE_API_KEY"):
+            SDKBackend(settings)
+
+    def test_client_is_shared(self, settings):
+        assert SDKBackend(settings).client is SDKBackend(settings).client
+
+    def test_complete_uses_bulk_model(self, settings):
+        backend = SDKBackend(settings)
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(type="text", text='```\n{"ok": 1}\n```')])
+
+        backend.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        assert backend.complete("sys", "user") == '{"ok": 1}'
+        assert calls[0]["model"] == settings.claude_model_bulk
+        assert calls[0]["system"] == "sys"
+        assert calls[0]["messages"] == [{"role": "user", "content": "user"}]
+
+        backend.complete("sys", "user", model=settings.claude_model_complex)
+        assert calls[1]["model"] == settings.claude_model_complex
+
+    def test_api_error_raises_runtime_error(self, settings):
+        import anthropic
+        import httpx
+
+        backend = SDKBackend(settings)
+
+        def create(**kwargs):
+            raise anthropic.APIConnectionError(request=httpx.Request("POST", "https://api"))
+
+        backend.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        with pytest.raises(RuntimeError, match="Claude API failed"):
+            backend.complete("sys", "user")
+
+
+class TestStubBackend:
+    def test_deterministic(self):
+        stub = StubBackend()
+        prompt = "Analyze ... top 3 viral clip moments.\n[0.0s - 5.0s] hi\n[40.0s - 45.0s] there"
+        assert stub.complete(MOMENT_DETECTION_SYSTEM, prompt) == stub.complete(
+            MOMENT_DETECTION_SYSTEM, prompt
+        )
+
+    def test_hook_count(self):
+        response = json.loads(
+            StubBackend().complete(HOOK_GENERATION_SYSTEM, "Generate 4 different hook variations")
+        )
+        assert len(response["hooks"]) == 4
+
+    def test_moment_detector_end_to_end(self, settings):
+        settings.llm_backend = "stub"
+        transcript = {
+            "segments": [
+                {"start": float(t), "end": float(t + 5), "text": f"line {t}"}
+                for t in range(0, 600, 5)
+            ]
+        }
+        moments = MomentDetector(settings).detect_moments(transcript, max_moments=5)
+        assert 0 < len(moments) <= 5
+        assert all(m.start_time < m.end_time for m in moments)
+
+    def test_hook_writer_end_to_end(self, settings, sample_transcript):
+        settings.llm_backend = "stub"
+        hooks = HookWriter(settings).generate_hooks(0.0, 30.0, sample_transcript, num_variations=3)
+        assert len(hooks) == 3
@@ -1,4 +1,7 @@
 import json
+import re
+import threading
+import time
 from unittest.mock import MagicMock
 
 import pytest
@@ -66,50 +69,6 @@ class TestDeduplicateMoments:
         assert len(result) == 2
 
 
-class TestFormatTranscript:
-    def _make_detector(self, settings):
-        detector = MomentDetector.__new__(MomentDetector)
-        detector.settings = settings
-        return detector
-
-    def test_empty_transcript(self, settings):
-        detector = self._make_detector(settings)
-        assert detector._format_transcript({"segments": []}) == ""
-
-    def test_empty_dict(self, settings):
-        detector = self._make_detector(settings)
-        assert detector._format_transcript({}) == ""
-
-    def test_single_segment(self, settings):
-        detector = self._make_detector(settings)
-        transcript = {
-            "segments": [{"start": 0.0, "end": 5.0, "text": "Hello world"}]
-        }
-        result = detector._format_transcript(transcript)
-        assert result == "[0.0s - 5.0s] Hello world"
-
-    def test_multi_segment(self, settings):
-        detector = self._make_detector(settings)
-        result = detector._format_transcript(
-            {
-                "segments": [
-                    {"start": 0.0, "end": 5.0, "text": "First"},
-                    {"start": 5.0, "end": 10.0, "text": "Second"},
-                ]
-            }
-        )
-        lines = result.split("\n")
-        assert len(lines) == 2
-
-    def test_strips_whitespace(self, settings):
-        detector = self._make_detector(settings)
-        result = detector._format_transcript(
-            {"segments": [{"start": 0.0, "end": 1.0, "text": "  padded  "}]}
-        )
-        assert "padded" in result
-        assert "  padded  " not in result
-
-
 class TestDetectMoments:
     def test_sorted_output(self, settings, monkeypatch):
         detector = MomentDetector(settings)
@@ -168,3 +127,112 @@ class TestDetectMoments:
 
         with pytest.raises(AIDetectionError, match="Moment detection failed"):
             detector.detect_moments({"segments": [{"start": 0, "end": 5, "text": "test"}]})
+
+
+class TestDetectWithWindows:
+    def _long_transcript(self, seconds=3 * 3600):
+        return {
+            "segments": [
+                {"start": float(t), "end": float(t + 10), "text": "word " * 10}
+                for t in range(0, seconds, 10)
+            ]
+        }
+
+    def test_windows_run_concurrently_and_merge_in_order(self, settings, monkeypatch):
+        settings.llm_max_concurrency = 4
+        settings.moment_window_max_tokens = 2000
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        calls = []
+
+        def fake_call_claude(**kwargs):
+            nonlocal active, peak
+            first = float(re.search(r"^\[(\d+)\]", kwargs["user_prompt"], re.M).group(1))
+            with lock:
+                calls.append(first)
+                active += 1
+                peak = max(peak, active)
+            # Later windows answer first
+            time.sleep(0.05 if first < 1000 else 0.01)
+            with lock:
+                active -= 1
+            return json.dumps({"moments": [{
+                "start_time": first,
+                "end_time": first + 30,
+                "hook_text": "h",
+                "caption_text": "c",
+                "viral_score": 50,
+                "reasoning": "r",
+            }]})
+
+        monkeypatch.setattr("src.ai.moment_detector.call_claude", fake_call_claude)
+        detector = MomentDetector(settings)
+        seen = []
+        original = detector._deduplicate_moments
+        monkeypatch.setattr(
+            detector,
+            "_deduplicate_moments",
+            lambda moments: seen.extend(moments) or original(moments),
+        )
+
+        result = detector.detect_moments(self._long_transcript(), max_moments=20)
+
+        assert len(calls) > 4
+        assert 1 < peak <= 4
+        starts = [m.start_time for m in seen]
+        assert starts == sorted(starts)
+        assert len(result) == len(calls)
+
+    def test_concurrency_limit_of_one_is_sequential(self, settings, monkeypatch):
+        settings.llm_max_concurrency = 1
+        active = 0
+        peak = 0
+
+        def fake_call_claude(**kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            time.sleep(0.005)
+            active -= 1
+            return json.dumps({"moments": []})
+
+        monkeypatch.setattr("src.ai.moment_detector.call_claude", fake_call_claude)
+        MomentDetector(settings).detect_moments(self._long_transcript())
+        assert peak == 1
+
+    def test_window_failure_raises(self, settings, monkeypatch):
+        def fake_call_claude(**kwargs):
+            raise RuntimeError("Claude CLI failed: boom")
+
+        monkeypatch.setattr("src.ai.moment_detector.call_claude", fake_call_claude)
+        from src.exceptions import AIDetectionError
+
+        with pytest.raises(AIDetectionError, match="Moment detection failed"):
+            MomentDetector(settings).detect_moments(self._long_transcript())
+
+
+class TestTranscriptEncoding:
+    def _prompt(self, settings, monkeypatch):
+        prompts = []
+
+        def fake_call_claude(**kwargs):
+            prompts.append(kwargs["user_prompt"])
+            return json.dumps({"moments": []})
+
+        monkeypatch.setattr("src.ai.moment_detector.call_claude", fake_call_claude)
+        MomentDetector(settings).detect_moments({"segments": [
+            {"start": 0.0, "end": 5.0, "text": "Hello"},
+            {"start": 5.2, "end": 9.6, "text": "world"},
+        ]})
+        return prompts[0]
+
+    def test_compact_by_default(self, settings, monkeypatch):
+        prompt = self._prompt(settings, monkeypatch)
+        assert "[0] Hello\n[5] world\n[10]" in prompt
+        assert "whole seconds" in prompt
+
+    def test_full_encoding(self, settings, monkeypatch):
+        settings.transcript_compact_encoding = False
+        prompt = self._prompt(settings, monkeypatch)
+        assert "[0.0s - 5.0s] Hello\n[5.2s - 9.6s] world" in prompt
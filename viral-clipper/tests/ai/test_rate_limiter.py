@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+from src.ai import rate_limiter
+from src.ai.rate_limiter import RateLimiter, get_rate_limiter
+
+
+class TestRateLimiter:
+    def test_unlimited_never_waits(self):
+        limiter = RateLimiter(0, burst=1)
+        assert all(limiter.acquire() == 0 for _ in range(100))
+
+    def test_burst_then_spaced(self, monkeypatch):
+        clock = [1000.0]
+        sleeps = []
+        monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(rate_limiter.time, "sleep", sleeps.append)
+
+        limiter = RateLimiter(60, burst=3)  # one per second
+        waits = [limiter.acquire() for _ in range(5)]
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3:] == pytest.approx([1.0, 2.0])
+        assert sleeps == pytest.approx([1.0, 2.0])
+
+    def test_refills_over_time(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(rate_limiter.time, "sleep", lambda s: None)
+
+        limiter = RateLimiter(60, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        clock[0] += 2
+        assert limiter.acquire() == 0
+
+    def test_threads_share_the_budget(self):
+        limiter = RateLimiter(600, burst=2)  # 10 per second after the burst
+        started = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.monotonic() - started >= 0.19
+
+    def test_shared_limiter_is_updated(self):
+        first = get_rate_limiter(30, 2)
+        second = get_rate_limiter(120, 4)
+        assert first is second
+        assert (second.requests_per_minute, second.burst) == (120, 4)
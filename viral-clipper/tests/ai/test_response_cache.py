@@ -0,0 +1,173 @@
+import json
+import subprocess
+import time
+
+import pytest
+
+from src.ai import claude_cli, llm_backend
+from src.ai.response_cache import ResponseCache, get_response_cache, response_key
+
+
+def _cache(tmp_path, max_bytes=1024**2, ttl_seconds=3600):
+    return ResponseCache(tmp_path / "llm.sqlite3", max_bytes, ttl_seconds)
+
+
+class TestResponseKey:
+    def test_stable(self):
+        assert response_key("s", "u", "m", "1") == response_key("s", "u", "m", "1")
+
+    @pytest.mark.parametrize("changed", [
+        ("s2", "u", "m", "1"),
+        ("s", "u2", "m", "1"),
+        ("s", "u", "m2", "1"),
+        ("s", "u", "m", "2"),
+    ])
+    def test_every_part_matters(self, changed):
+        assert response_key(*changed) != response_key("s", "u", "m", "1")
+
+    def test_parts_do_not_run_together(self):
+        assert response_key("ab", "c", "m", "1") != response_key("a", "bc", "m", "1")
+
+
+class TestResponseCache:
+    def test_round_trip_and_counters(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.get("k") is None
+        cache.put("k", '{"moments": []}')
+        assert cache.get("k") == '{"moments": []}'
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        _cache(tmp_path).put("k", "response")
+        assert _cache(tmp_path).get("k") == "response"
+
+    def test_expired_entry_is_a_miss(self, tmp_path, monkeypatch):
+        cache = _cache(tmp_path, ttl_seconds=60)
+        cache.put("k", "response")
+        now = time.time()
+        monkeypatch.setattr("src.ai.response_cache.time.time", lambda: now + 61)
+        assert cache.get("k") is None
+        assert cache.total_bytes == 0
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        clock = iter(range(1000, 2000))
+        monkeypatch.setattr("src.ai.response_cache.time.time", lambda: next(clock))
+        cache = _cache(tmp_path, max_bytes=25)
+        cache.put("a", "x" * 10)
+        cache.put("b", "x" * 10)
+        cache.get("a")
+        cache.put("c", "x" * 10)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.total_bytes <= 25
+
+    def test_oversized_response_not_stored(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=4)
+        cache.put("k", "too long")
+        assert cache.get("k") is None
+
+    def test_delete(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put("k", "response")
+        cache.delete("k")
+        assert cache.get("k") is None
+
+    def test_shared_instance_per_path(self, tmp_path):
+        path = tmp_path / "shared.sqlite3"
+        first = get_response_cache(path, 100, 60)
+        second = get_response_cache(path, 200, 120)
+        assert first is second
+        assert (second.max_bytes, second.ttl_seconds) == (200, 120)
+
+
+class TestCallClaudeCache:
+    @pytest.fixture
+    def cli(self, settings, monkeypatch):
+        settings.llm_requests_per_minute = 0
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout=json.dumps({"result": f"response {len(calls)}"}), stderr=""
+            )
+
+        monkeypatch.setattr(llm_backend.subprocess, "run", fake_run)
+        return calls
+
+    def test_second_call_is_served_from_cache(self, settings, cli):
+        first = claude_cli.call_claude("system", "user", settings=settings)
+        second = claude_cli.call_claude("system", "user", settings=settings)
+        assert first == second == "response 1"
+        assert len(cli) == 1
+
+    def test_different_prompt_misses(self, settings, cli):
+        claude_cli.call_claude("system", "user", settings=settings)
+        claude_cli.call_claude("system", "other", settings=settings)
+        assert len(cli) == 2
+
+    def test_refresh_bypasses_and_overwrites(self, settings, cli):
+        claude_cli.call_claude("system", "user", settings=settings)
+        assert claude_cli.call_claude("system", "user", settings=settings, refresh=True) == "response 2"
+        assert claude_cli.call_claude("system", "user", settings=settings) == "response 2"
+        assert len(cli) == 2
+
+    def test_refresh_setting(self, settings, cli):
+        claude_cli.call_claude("system", "user", settings=settings)
+        settings.llm_cache_refresh = True
+        claude_cli.call_claude("system", "user", settings=settings)
+        assert len(cli) == 2
+
+    def test_disabled(self, settings, cli):
+        settings.llm_cache_enabled = False
+        claude_cli.call_claude("system", "user", settings=settings)
+        claude_cli.call_claude("system", "user", settings=settings)
+        assert len(cli) == 2
+        assert not settings.get_llm_cache_path().exists()
+
+    def test_failures_are_not_cached(self, settings, monkeypatch):
+        monkeypatch.setattr(
+            llm_backend.subprocess,
+            "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1, stdout="", stderr="boom"),
+        )
+        with pytest.raises(RuntimeError, match="Claude CLI failed"):
+            claude_cli.call_claude("system", "user", settings=settings)
+        assert get_response_cache(
+            settings.get_llm_cache_path(), settings.llm_cache_max_bytes, 60
+        ).total_bytes == 0
+
+    def test_invalid_response_is_not_cached(self, settings, cli):
+        def validate(text):
+            if text == "response 1":
+                raise ValueError("malformed")
+
+        with pytest.raises(ValueError):
+            claude_cli.call_claude("system", "user", settings=settings, validate=validate)
+        assert claude_cli.call_claude(
+            "system", "user", settings=settings, validate=validate
+        ) == "response 2"
+        assert claude_cli.call_claude(
+            "system", "user", settings=settings, validate=validate
+        ) == "response 2"
+        assert len(cli) == 2
+
+    def test_cached_entry_failing_validation_is_replaced(self, settings, cli):
+        claude_cli.call_claude("system", "user", settings=settings)
+
+        def validate(text):
+            if text == "response 1":
+                raise ValueError("malformed")
+
+        assert claude_cli.call_claude(
+            "system", "user", settings=settings, validate=validate
+        ) == "response 2"
+        assert claude_cli.call_claude("system", "user", settings=settings) == "response 2"
+        assert len(cli) == 2
+
+    def test_model_is_passed_and_keyed(self, settings, cli):
+        claude_cli.call_claude("system", "user", settings=settings)
+        claude_cli.call_claude("system", "user", settings=settings, model="claude-haiku")
+        assert len(cli) == 2
+        assert cli[1][-2:] == ["--model", "claude-haiku"]
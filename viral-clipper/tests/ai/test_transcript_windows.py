@@ -0,0 +1,110 @@
+from src.ai.transcript_windows import (
+    build_windows,
+    format_lines,
+    transcript_lines,
+)
+
+
+def _transcript(count, length=4.0, gap=0.2, words=8):
+    segments = []
+    t = 0.0
+    for i in range(count):
+        segments.append({"start": t, "end": t + length, "text": f"s{i} " + "word " * words})
+        t += length + gap
+    return {"segments": segments}
+
+
+class TestTranscriptLines:
+    def test_skips_empty_segments(self):
+        lines = transcript_lines({"segments": [
+            {"start": 0.0, "end": 1.0, "text": "  "},
+            {"start": 1.0, "end": 2.0, "text": " hi "},
+        ]})
+        assert [(line.start, line.text) for line in lines] == [(1.0, "hi")]
+
+    def test_no_merge_by_default(self):
+        assert len(transcript_lines(_transcript(5, length=1.0))) == 5
+
+    def test_merges_short_segments(self):
+        lines = transcript_lines(_transcript(6, length=1.0, gap=0.1, words=1), merge_seconds=3.5)
+        assert [line.text for line in lines] == ["s0 word s1 word s2 word", "s3 word s4 word s5 word"]
+        assert (lines[0].start, lines[0].end) == (0.0, 3.2)
+
+    def test_never_merges_across_pause(self):
+        transcript = {"segments": [
+            {"start": 0.0, "end": 1.0, "text": "before"},
+            {"start": 2.5, "end": 3.0, "text": "after"},
+        ]}
+        assert len(transcript_lines(transcript, merge_seconds=10)) == 2
+
+
+class TestFormatLines:
+    def test_full(self):
+        lines = transcript_lines({"segments": [{"start": 1.25, "end": 4.0, "text": "Hi"}]})
+        assert format_lines(lines, compact=False) == "[1.2s - 4.0s] Hi"
+
+    def test_compact_uses_start_seconds_and_final_end(self):
+        lines = transcript_lines({"segments": [
+            {"start": 1.7, "end": 4.0, "text": "One"},
+            {"start": 4.2, "end": 9.1, "text": "Two"},
+        ]})
+        assert format_lines(lines, compact=True) == "[1] One\n[4] Two\n[10]"
+
+    def test_compact_is_smaller(self):
+        lines = transcript_lines(_transcript(200))
+        assert len(format_lines(lines, True)) < len(format_lines(lines, False)) * 0.9
+
+    def test_empty(self):
+        assert format_lines([], compact=True) == ""
+
+
+class TestBuildWindows:
+    def test_single_window_when_it_fits(self):
+        windows = build_windows(transcript_lines(_transcript(10)), 10_000, 60)
+        assert len(windows) == 1
+        assert windows[0].line_count == 10
+
+    def test_windows_respect_budget_and_cover_everything(self):
+        lines = transcript_lines(_transcript(600))
+        windows = build_windows(lines, max_tokens=1000, overlap_seconds=60)
+        assert len(windows) > 3
+        assert all(w.tokens <= 1000 + 5 for w in windows)
+        assert windows[0].start == lines[0].start
+        assert windows[-1].end == lines[-1].end
+
+    def test_windows_are_whole_lines(self):
+        lines = transcript_lines(_transcript(300))
+        for window in build_windows(lines, max_tokens=800, overlap_seconds=30):
+            for text_line in window.text.split("\n")[:-1]:
+                assert text_line.startswith("[") and "word" in text_line
+
+    def test_overlap_in_seconds(self):
+        lines = transcript_lines(_transcript(600))
+        windows = build_windows(lines, max_tokens=1000, overlap_seconds=60)
+        for previous, following in zip(windows, windows[1:]):
+            overlap = previous.end - following.start
+            assert 60 <= overlap < 60 + 4.2 * 2
+            assert following.start > previous.start
+
+    def test_zero_overlap(self):
+        lines = transcript_lines(_transcript(600))
+        windows = build_windows(lines, max_tokens=1000, overlap_seconds=0)
+        assert sum(w.line_count for w in windows) == len(lines)
+
+    def test_overlap_capped_at_half_a_window(self):
+        lines = transcript_lines(_transcript(200))
+        windows = build_windows(lines, max_tokens=200, overlap_seconds=3600)
+        # Every window advances by at least half of its lines
+        assert len(windows) < len(lines)
+
+    def test_oversized_line_gets_own_window(self):
+        transcript = {"segments": [
+            {"start": 0.0, "end": 5.0, "text": "short"},
+            {"start": 5.0, "end": 60.0, "text": "long " * 2000},
+            {"start": 60.0, "end": 65.0, "text": "short again"},
+        ]}
+        windows = build_windows(transcript_lines(transcript), max_tokens=500, overlap_seconds=0)
+        assert [w.line_count for w in windows] == [1, 1, 1]
+
+    def test_empty(self):
+        assert build_windows([], 1000, 60) == []
@@ -5,9 +5,19 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.clipper.ffmpeg_ops import FFmpegService
+from src.clipper.ffmpeg_runner import CancelToken, FFmpegResult, FFmpegRunStats
+from src.clipper.keyframes import KeyframeIndex
+from src.clipper.render_cache import RenderCache, render_key
+from src.clipper.render_plan import RenderPlan
 from src.exceptions import FFmpegError
 
 
+def _result(returncode=0, stdout=b"", stderr=b""):
+    """What run_ffmpeg returns, with its stats."""
+    stats = FFmpegRunStats(command="ffmpeg", returncode=returncode, wall_seconds=0.1)
+    return FFmpegResult(["ffmpeg"], returncode, stdout, stderr, stats)
+
+
 class TestGetEncoderArgs:
     def test_nvenc_off(self, settings):
         settings.use_nvenc = False
@@ -27,23 +37,23 @@ class TestGetEncoderArgs:
 
 
 class TestRun:
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_success(self, mock_run, settings):
-        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
+        mock_run.return_value = _result(returncode=0, stdout=b"ok", stderr=b"")
         ffmpeg = FFmpegService(settings)
         result = ffmpeg._run(["ffmpeg", "-version"])
         assert result.returncode == 0
 
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_nonzero_exit_raises(self, mock_run, settings):
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = _result(
             returncode=1, stdout=b"", stderr=b"error occurred"
         )
         ffmpeg = FFmpegService(settings)
         with pytest.raises(FFmpegError, match="exit code 1"):
             ffmpeg._run(["ffmpeg", "-invalid"])
 
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_timeout_raises(self, mock_run, settings):
         mock_run.side_effect = subprocess.TimeoutExpired(cmd=["ffmpeg"], timeout=300)
         ffmpeg = FFmpegService(settings)
@@ -51,10 +61,26 @@ class TestRun:
             ffmpeg._run(["ffmpeg", "-slow"])
 
 
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_passes_progress_and_cancel_and_keeps_stats(self, mock_run, settings):
+        mock_run.return_value = _result()
+        stats = mock_run.return_value.stats
+        on_progress = MagicMock()
+        token = CancelToken()
+        ffmpeg = FFmpegService(settings, on_progress=on_progress, cancel_token=token)
+
+        ffmpeg._run(["ffmpeg", "-version"])
+
+        assert mock_run.call_args.kwargs["on_progress"] is on_progress
+        assert mock_run.call_args.kwargs["cancel"] is token
+        assert ffmpeg.run_stats == [stats]
+
+
 class TestExtractClip:
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_command_args(self, mock_run, settings, tmp_path):
-        mock_run.return_value = MagicMock(returncode=0, stdout=b"", stderr=b"")
+        settings.ffmpeg_smart_cut = False
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
         ffmpeg = FFmpegService(settings)
         source = tmp_path / "source.mp4"
         output = tmp_path / "clip.mp4"
@@ -67,6 +93,394 @@ class TestExtractClip:
         assert "10.0" in cmd
         assert "-to" in cmd
         assert "40.0" in cmd
+        assert "copy" in cmd
+
+    def test_smart_cut_setting_applies_to_batch_jobs(self, settings, tmp_path):
+        ffmpeg = FFmpegService(settings)
+        ffmpeg._smart_cut = MagicMock(return_value=tmp_path / "clip.mp4")
+        ffmpeg._run = MagicMock()
+
+        results = ffmpeg.process_batch([{
+            "function": "extract_clip",
+            "kwargs": {
+                "source_path": tmp_path / "source.mp4",
+                "output_path": tmp_path / "clip.mp4",
+                "start_time": 10.0,
+                "end_time": 40.0,
+            },
+        }])
+
+        assert results[0]["success"] is True
+        ffmpeg._smart_cut.assert_called_once()
+        ffmpeg._run.assert_not_called()
+
+
+class TestTranscodeMezzanine:
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_command_args(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
+        settings.mezzanine_fps = 30
+        settings.mezzanine_keyframe_seconds = 1.0
+        settings.mezzanine_audio_rate = 48000
+        ffmpeg = FFmpegService(settings)
+        source = tmp_path / "source.webm"
+
+        output = ffmpeg.transcode_mezzanine(source)
+
+        assert output == tmp_path / "source.mezzanine.mp4"
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-vf") + 1] == "fps=30"
+        assert cmd[cmd.index("-g") + 1] == "30"
+        assert cmd[cmd.index("-sc_threshold") + 1] == "0"
+        assert cmd[cmd.index("-ar") + 1] == "48000"
+        assert "+faststart" in cmd
+        assert mock_run.call_args.kwargs["timeout"] == settings.mezzanine_timeout_seconds
+
+
+class TestKeyframeIndex:
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_builds_once_then_uses_sidecar(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(
+            returncode=0, stdout=b"0.000000,K__\n1.000000,___\n2.000000,K__\n", stderr=b""
+        )
+        source = tmp_path / "source.mp4"
+        source.write_bytes(b"\x00" * 64)
+        ffmpeg = FFmpegService(settings)
+
+        first = ffmpeg.get_keyframe_index(source)
+        second = ffmpeg.get_keyframe_index(source)
+
+        assert first.times == [0.0, 2.0]
+        assert second.times == [0.0, 2.0]
+        mock_run.assert_called_once()
+
+
+class TestSmartCut:
+    H264_INFO = {
+        "streams": [
+            {"codec_type": "video", "codec_name": "h264", "pix_fmt": "yuv420p"},
+            {"codec_type": "audio", "codec_name": "aac", "sample_rate": "44100", "channels": 2},
+        ],
+    }
+
+    def _service(self, settings, keyframes, info):
+        ffmpeg = FFmpegService(settings)
+        ffmpeg.get_keyframe_index = MagicMock(return_value=KeyframeIndex(keyframes))
+        ffmpeg.get_video_info = MagicMock(return_value=info)
+        ffmpeg._run = MagicMock()
+        return ffmpeg
+
+    def test_reencodes_head_and_tail_copies_middle(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0, 10.0, 20.0, 30.0, 40.0], self.H264_INFO)
+
+        ffmpeg.extract_clip(tmp_path / "s.mp4", tmp_path / "out.mp4", 12.5, 33.0, smart_cut=True)
+
+        cmds = [c.args[0] for c in ffmpeg._run.call_args_list]
+        assert len(cmds) == 4  # head, middle, tail, concat
+        head, middle, tail, concat = cmds
+        assert head[head.index("-ss") + 1] == "12.5"
+        assert head[head.index("-t") + 1] == "7.5"
+        assert "libx264" in head
+        assert middle[middle.index("-ss") + 1] == "20.0"
+        assert middle[middle.index("-c") + 1] == "copy"
+        assert tail[tail.index("-ss") + 1] == "30.0"
+        assert "concat" in concat
+        assert not (tmp_path / ".out_smartcut").exists()
+
+    def test_keyframe_aligned_start_skips_head(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0, 10.0, 20.0, 30.0], self.H264_INFO)
+
+        ffmpeg.extract_clip(tmp_path / "s.mp4", tmp_path / "out.mp4", 10.0, 30.0, smart_cut=True)
+
+        # Both ends on keyframes: just the copy and the concat
+        assert ffmpeg._run.call_count == 2
+
+    def test_within_one_gop_falls_back_to_reencode(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0, 10.0], self.H264_INFO)
+
+        ffmpeg.extract_clip(tmp_path / "s.mp4", tmp_path / "out.mp4", 2.0, 8.0, smart_cut=True)
+
+        ffmpeg._run.assert_called_once()
+        cmd = ffmpeg._run.call_args[0][0]
+        assert "libx264" in cmd
+        assert "copy" not in cmd
+
+    def test_non_h264_falls_back_to_reencode(self, settings, tmp_path):
+        info = {"streams": [{"codec_type": "video", "codec_name": "vp9"}]}
+        ffmpeg = self._service(settings, [0.0, 10.0, 20.0, 30.0], info)
+
+        ffmpeg.extract_clip(tmp_path / "s.mp4", tmp_path / "out.mp4", 5.0, 25.0, smart_cut=True)
+
+        ffmpeg._run.assert_called_once()
+
+
+class TestRenderClip:
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_single_invocation(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
+        ffmpeg = FFmpegService(settings)
+        plan = RenderPlan(
+            source_path=tmp_path / "source.mp4",
+            start_time=10.0,
+            end_time=40.0,
+            ass_path=tmp_path / "clip.ass",
+            hook_text="Wait for it",
+            mute_segments=[(1.0, 2.0)],
+        )
+
+        ffmpeg.render_clip(plan, tmp_path / "final.mp4")
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-ss") + 1] == "10.0"
+        assert cmd.index("-ss") < cmd.index("-i")
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert "trim=duration=30.0" in graph
+        assert "ass=" in graph
+        assert "drawtext=" in graph
+        assert "volume=0" in graph
+        assert cmd.count("-c:v") == 1
+
+
+class TestRenderClipCache:
+    def _service(self, settings, tmp_path):
+        ffmpeg = FFmpegService(settings)
+
+        def fake_run(cmd, **kwargs):
+            # Every output path of the command gets a non-empty file
+            for i, arg in enumerate(cmd):
+                if arg == "-y":
+                    Path(cmd[i + 1]).write_bytes(b"\x00" * 16)
+
+        ffmpeg._run = MagicMock(side_effect=fake_run)
+        return ffmpeg
+
+    def _plan(self, tmp_path, hook_text):
+        source = tmp_path / "source.mp4"
+        if not source.exists():
+            source.write_bytes(b"\x00" * 32)
+        return RenderPlan(
+            source_path=source, start_time=10.0, end_time=40.0, hook_text=hook_text
+        )
+
+    def test_unchanged_clip_is_not_rerendered(self, settings, tmp_path):
+        ffmpeg = self._service(settings, tmp_path)
+        plan = self._plan(tmp_path, "Wait for it")
+
+        ffmpeg.render_clip(plan, tmp_path / "a.mp4")
+        (tmp_path / "a.mp4").unlink()
+        ffmpeg.render_clip(plan, tmp_path / "a.mp4")
+
+        assert ffmpeg._run.call_count == 1
+        assert (tmp_path / "a.mp4").exists()
+
+    def test_hook_iteration_reuses_base(self, settings, tmp_path):
+        ffmpeg = self._service(settings, tmp_path)
+        output = tmp_path / "a.mp4"
+
+        ffmpeg.render_clip(self._plan(tmp_path, "Hook one"), output)
+        ffmpeg.render_clip(self._plan(tmp_path, "Hook two"), output)
+        ffmpeg.render_clip(self._plan(tmp_path, "Hook three"), output)
+
+        first, second, third = [c.args[0] for c in ffmpeg._run.call_args_list]
+        # First render: single pass from the source
+        assert first.count("-map") == 2
+        # Second (hook changed): base + final from one decode
+        assert second.count("-map") == 4
+        # Third: overlay only, read from the cached base instead of the source
+        assert str(tmp_path / "source.mp4") not in third
+        assert "drawtext" in third[third.index("-vf") + 1]
+        # ...via a private copy, never the cache entry eviction could delete
+        overlay_input = third[third.index("-i") + 1]
+        assert not overlay_input.startswith(str(ffmpeg.render_cache.root))
+
+    def test_disabled_cache_always_renders(self, settings, tmp_path):
+        settings.render_cache_enabled = False
+        ffmpeg = self._service(settings, tmp_path)
+        plan = self._plan(tmp_path, "Wait for it")
+
+        ffmpeg.render_clip(plan, tmp_path / "a.mp4")
+        ffmpeg.render_clip(plan, tmp_path / "a.mp4")
+
+        assert ffmpeg._run.call_count == 2
+
+
+class TestRenderBatch:
+    def _plan(self, tmp_path, start, end):
+        return RenderPlan(source_path=tmp_path / "source.mp4", start_time=start, end_time=end)
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_cached_clips_are_skipped(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
+        ffmpeg = FFmpegService(settings)
+        plans = [self._plan(tmp_path, 10.0, 40.0), self._plan(tmp_path, 60.0, 90.0)]
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+        cached = tmp_path / "cached.mp4"
+        cached.write_bytes(b"\x00" * 16)
+        ffmpeg.render_cache.put(render_key(plans[0], ffmpeg._render_settings()), cached)
+
+        results = ffmpeg.render_batch(plans, outputs)
+
+        cmd = mock_run.call_args[0][0]
+        assert str(outputs[0]) not in cmd
+        assert str(outputs[1]) in cmd
+        assert outputs[0].exists()
+        assert [r["success"] for r in results] == [True, True]
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_one_process_for_nearby_moments(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
+        ffmpeg = FFmpegService(settings)
+        plans = [self._plan(tmp_path, 10.0, 40.0), self._plan(tmp_path, 60.0, 90.0)]
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+
+        results = ffmpeg.render_batch(plans, outputs)
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count("-i") == 1
+        assert cmd[cmd.index("-ss") + 1] == "10.0"
+        assert cmd[cmd.index("-t") + 1] == "80.0"
+        assert str(outputs[0]) in cmd and str(outputs[1]) in cmd
+        assert [r["success"] for r in results] == [True, True]
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_failed_group_is_isolated(self, mock_run, settings, tmp_path):
+        def fake_run(cmd, **kwargs):
+            if cmd[cmd.index("-ss") + 1] == "10.0":
+                return _result(returncode=1, stdout=b"", stderr=b"boom")
+            return _result(returncode=0, stdout=b"", stderr=b"")
+
+        mock_run.side_effect = fake_run
+        ffmpeg = FFmpegService(settings)
+        plans = [self._plan(tmp_path, 10.0, 40.0), self._plan(tmp_path, 5000.0, 5030.0)]
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+
+        results = ffmpeg.render_batch(plans, outputs)
+
+        assert mock_run.call_count == 2
+        assert results[0]["success"] is False
+        assert "exit code 1" in results[0]["error"]
+        assert results[1]["success"] is True
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_threads_per_encoder(self, mock_run, settings, tmp_path):
+        settings.ffmpeg_threads_per_job = 3
+        settings.ffmpeg_thread_budget = 12
+        mock_run.return_value = _result(returncode=0, stdout=b"", stderr=b"")
+        ffmpeg = FFmpegService(settings)
+        plans = [self._plan(tmp_path, 10.0, 40.0), self._plan(tmp_path, 60.0, 90.0)]
+
+        ffmpeg.render_batch(plans, [tmp_path / "a.mp4", tmp_path / "b.mp4"])
+
+        cmd = mock_run.call_args[0][0]
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-threads"] == ["3", "3"]
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_validate_after_render(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=1, stdout=b"", stderr=b"boom")
+        ffmpeg = FFmpegService(settings)
+        ffmpeg.validate_clip = MagicMock(return_value={"passed": True, "issues": []})
+
+        results = ffmpeg.render_batch(
+            [self._plan(tmp_path, 10.0, 40.0)], [tmp_path / "a.mp4"], validate=True
+        )
+
+        ffmpeg.validate_clip.assert_not_called()
+        assert results[0]["success"] is False
+        assert results[0]["validation"] is None
+
+    def test_hook_variants_share_the_group_decode(self, settings, tmp_path):
+        settings.render_cache_enabled = False
+        ffmpeg = FFmpegService(settings)
+        ffmpeg.probe_keyframes = MagicMock(return_value=[0.0, 3.0, 6.0])
+        ffmpeg._run = MagicMock()
+        plans = [
+            self._plan(tmp_path, 10.0, 40.0).model_copy(update={"hook_text": "own"}),
+            self._plan(tmp_path, 60.0, 90.0),
+        ]
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+
+        results = ffmpeg.render_batch(
+            plans,
+            outputs,
+            variant_hooks=[["other"], []],
+            variant_paths=[[tmp_path / "a_v2.mp4"], []],
+        )
+
+        cmds = [c.args[0] for c in ffmpeg._run.call_args_list]
+        fanout_cmds = [c for c in cmds if "-filter_complex" in c]
+        head_cmds = [c for c in cmds if "-vf" in c]
+        assert len(fanout_cmds) == 1
+        fanout = fanout_cmds[0]
+        assert "drawtext" not in fanout[fanout.index("-filter_complex") + 1]
+        assert fanout[fanout.index("-force_key_frames") + 1] == "3.0"
+        assert str(outputs[1]) in fanout and str(outputs[0]) not in fanout
+        assert ["own" in c[c.index("-vf") + 1] for c in head_cmds] == [True, False]
+        assert [c[-1] for c in cmds if "concat" in c] == [
+            str(outputs[0]), str(tmp_path / "a_v2.mp4")
+        ]
+        assert [r["success"] for r in results] == [True, True]
+        assert results[0]["variant_paths"] == [tmp_path / "a_v2.mp4"]
+
+    def test_length_mismatch_raises(self, settings, tmp_path):
+        ffmpeg = FFmpegService(settings)
+        with pytest.raises(ValueError):
+            ffmpeg.render_batch([self._plan(tmp_path, 0.0, 30.0)], [])
+        with pytest.raises(ValueError):
+            ffmpeg.render_batch(
+                [self._plan(tmp_path, 0.0, 30.0)],
+                [tmp_path / "a.mp4"],
+                variant_hooks=[["one"]],
+                variant_paths=[[]],
+            )
+
+
+class TestGetVideoInfo:
+    PROBE = b'{"format": {"duration": "45.0"}, "streams": [{"codec_type": "video"}]}'
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_repeat_probe_is_cached(self, mock_run, settings, tmp_path):
+        mock_run.return_value = _result(returncode=0, stdout=self.PROBE, stderr=b"")
+        video = tmp_path / "a.mp4"
+        video.write_bytes(b"\x00" * 16)
+
+        first = FFmpegService(settings).get_video_info(video)
+        second = FFmpegService(settings).get_video_info(video)
+
+        mock_run.assert_called_once()
+        assert first == second
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_cache_disabled(self, mock_run, settings, tmp_path):
+        settings.probe_cache_enabled = False
+        mock_run.return_value = _result(returncode=0, stdout=self.PROBE, stderr=b"")
+        video = tmp_path / "a.mp4"
+        video.write_bytes(b"\x00" * 16)
+        ffmpeg = FFmpegService(settings)
+
+        ffmpeg.get_video_info(video)
+        ffmpeg.get_video_info(video)
+
+        assert mock_run.call_count == 2
+
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
+    def test_probe_many(self, mock_run, settings, tmp_path):
+        good = tmp_path / "good.mp4"
+        bad = tmp_path / "bad.mp4"
+        for path in (good, bad):
+            path.write_bytes(b"\x00" * 16)
+
+        def fake_run(cmd, **kwargs):
+            if cmd[-1] == str(bad):
+                return _result(returncode=1, stdout=b"", stderr=b"invalid data")
+            return _result(returncode=0, stdout=self.PROBE, stderr=b"")
+
+        mock_run.side_effect = fake_run
+        results = FFmpegService(settings).probe_many([good, bad])
+
+        assert results[good]["format"]["duration"] == "45.0"
+        assert results[bad] is None
 
 
 class TestValidateClip:
@@ -84,7 +498,7 @@ class TestValidateClip:
         assert result["passed"] is False
         assert "empty" in result["issues"][0]
 
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_valid_clip(self, mock_run, settings, tmp_path):
         video_file = tmp_path / "valid.mp4"
         video_file.write_bytes(b"\x00" * 1024)
@@ -100,7 +514,7 @@ class TestValidateClip:
                 ],
             }
         )
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = _result(
             returncode=0, stdout=probe_output.encode(), stderr=b""
         )
         ffmpeg = FFmpegService(settings)
@@ -108,7 +522,7 @@ class TestValidateClip:
         assert result["passed"] is True
         assert result["issues"] == []
 
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_wrong_resolution(self, mock_run, settings, tmp_path):
         video_file = tmp_path / "wrong_res.mp4"
         video_file.write_bytes(b"\x00" * 1024)
@@ -124,7 +538,7 @@ class TestValidateClip:
                 ],
             }
         )
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = _result(
             returncode=0, stdout=probe_output.encode(), stderr=b""
         )
         ffmpeg = FFmpegService(settings)
@@ -132,7 +546,7 @@ class TestValidateClip:
         assert result["passed"] is False
         assert any("1080x1920" in i for i in result["issues"])
 
-    @patch("src.clipper.ffmpeg_ops.subprocess.run")
+    @patch("src.clipper.ffmpeg_ops.run_ffmpeg")
     def test_too_short(self, mock_run, settings, tmp_path):
         video_file = tmp_path / "short.mp4"
         video_file.write_bytes(b"\x00" * 1024)
@@ -148,10 +562,94 @@ class TestValidateClip:
                 ],
             }
         )
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = _result(
             returncode=0, stdout=probe_output.encode(), stderr=b""
         )
         ffmpeg = FFmpegService(settings)
         result = ffmpeg.validate_clip(video_file)
         assert result["passed"] is False
         assert any("15-120s" in i for i in result["issues"])
+
+
+class TestRenderHookVariants:
+    def _service(self, settings, keyframes):
+        settings.render_cache_enabled = False
+        ffmpeg = FFmpegService(settings)
+        ffmpeg.probe_keyframes = MagicMock(return_value=keyframes)
+        ffmpeg._run = MagicMock()
+        return ffmpeg
+
+    def _plan(self, tmp_path):
+        return RenderPlan(
+            source_path=tmp_path / "source.mp4",
+            start_time=100.0,
+            end_time=130.0,
+            hook_text="ignored",
+        )
+
+    def test_body_encoded_once_heads_per_variant(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0, 3.0, 6.0])
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4", tmp_path / "c.mp4"]
+
+        ffmpeg.render_hook_variants(self._plan(tmp_path), ["one", "two", "three"], outputs)
+
+        cmds = [c.args[0] for c in ffmpeg._run.call_args_list]
+        base_cmds = [c for c in cmds if "-filter_complex" in c]
+        body_cmds = [c for c in cmds if "-c" in c and "copy" in c and "-ss" in c]
+        head_cmds = [c for c in cmds if "-vf" in c]
+        concat_cmds = [c for c in cmds if "concat" in c]
+
+        assert len(base_cmds) == 1
+        assert "drawtext" not in base_cmds[0][base_cmds[0].index("-filter_complex") + 1]
+        assert base_cmds[0][base_cmds[0].index("-force_key_frames") + 1] == "3.0"
+        assert len(body_cmds) == 1
+        assert body_cmds[0][body_cmds[0].index("-ss") + 1] == "3.0"
+        assert len(head_cmds) == 3
+        assert all(c[c.index("-t") + 1] == "3.0" for c in head_cmds)
+        assert "one" in head_cmds[0][head_cmds[0].index("-vf") + 1]
+        assert len(concat_cmds) == 3
+        assert not (tmp_path / ".a_variants").exists()
+
+    def test_intermediates_in_scratch_dir(self, settings, tmp_path):
+        settings.scratch_dir = tmp_path / "shm"
+        ffmpeg = self._service(settings, [0.0, 3.0, 6.0])
+
+        ffmpeg.render_hook_variants(
+            self._plan(tmp_path), ["one", "two"], [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+        )
+
+        cmds = [c.args[0] for c in ffmpeg._run.call_args_list]
+        base_cmd = next(c for c in cmds if "-filter_complex" in c)
+        assert base_cmd[-1].startswith(str(tmp_path / "shm"))
+        assert ffmpeg.scratch.reserved_bytes == 0
+
+    def test_full_overlay_without_split_keyframe(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0])
+        ffmpeg.add_hook_overlay = MagicMock()
+        outputs = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+
+        ffmpeg.render_hook_variants(self._plan(tmp_path), ["one", "two"], outputs)
+
+        assert ffmpeg.add_hook_overlay.call_count == 2
+        assert not any("concat" in c.args[0] for c in ffmpeg._run.call_args_list)
+
+    def test_length_mismatch_raises(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0])
+        with pytest.raises(ValueError):
+            ffmpeg.render_hook_variants(self._plan(tmp_path), ["one"], [])
+
+    def test_cached_base_copied_into_work_dir(self, settings, tmp_path):
+        ffmpeg = self._service(settings, [0.0, 3.0])
+        ffmpeg.render_cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        plan = self._plan(tmp_path)
+        base_key = render_key(
+            plan.model_copy(update={"hook_text": ""}), ffmpeg._render_settings()
+        )
+        base = tmp_path / "base.mp4"
+        base.write_bytes(b"\x00" * 16)
+        ffmpeg.render_cache.put(base_key, base)
+        work_path = tmp_path / "work" / "base.mp4"
+
+        assert ffmpeg._variant_base(plan, work_path) == work_path
+        assert work_path.stat().st_size == 16
+        ffmpeg._run.assert_not_called()
@@ -0,0 +1,131 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.clipper.ffmpeg_runner import (
+    CancelToken,
+    parse_progress_block,
+    run_ffmpeg,
+    with_progress_args,
+)
+from src.exceptions import FFmpegCancelledError
+
+PROGRESS_SCRIPT = """
+import sys
+args = sys.argv[1:]
+assert args[:3] == ["-progress", "pipe:1", "-nostats"], args
+for i, state in enumerate(["continue", "end"], 1):
+    print(f"frame={i * 30}")
+    print("fps=60.0")
+    print(f"out_time=00:00:0{i}.000000")
+    print("speed=2.0x")
+    print(f"progress={state}", flush=True)
+sys.stderr.write("encoder log\\n")
+"""
+
+
+def _fake_ffmpeg(tmp_path, body):
+    """An executable named 'ffmpeg' running the given Python code."""
+    path = tmp_path / "ffmpeg"
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestParseProgressBlock:
+    def test_fields(self):
+        progress = parse_progress_block({
+            "frame": "120",
+            "fps": "59.94",
+            "out_time": "00:01:02.500000",
+            "speed": "1.5x",
+            "progress": "continue",
+        })
+        assert progress.frame == 120
+        assert progress.fps == 59.94
+        assert progress.out_time == 62.5
+        assert progress.speed == 1.5
+        assert progress.finished is False
+
+    def test_out_time_us_and_na_values(self):
+        progress = parse_progress_block({
+            "out_time_us": "2500000",
+            "speed": "N/A",
+            "progress": "end",
+        })
+        assert progress.out_time == 2.5
+        assert progress.speed == 0.0
+        assert progress.finished is True
+
+
+class TestWithProgressArgs:
+    def test_adds_progress_to_ffmpeg(self):
+        cmd = ["ffmpeg", "-i", "in.mp4", "out.mp4"]
+        assert with_progress_args(cmd) == [
+            "ffmpeg", "-progress", "pipe:1", "-nostats", "-i", "in.mp4", "out.mp4",
+        ]
+
+    def test_leaves_ffprobe_and_stdout_output_alone(self):
+        probe = ["ffprobe", "-show_format", "in.mp4"]
+        piped = ["ffmpeg", "-i", "in.mp4", "-f", "nut", "pipe:1"]
+        assert with_progress_args(probe) is probe
+        assert with_progress_args(piped) is piped
+
+
+class TestRunFFmpeg:
+    def test_streams_progress_and_records_stats(self, tmp_path):
+        reports = []
+        result = run_ffmpeg(
+            [_fake_ffmpeg(tmp_path, PROGRESS_SCRIPT)],
+            timeout=30,
+            on_progress=reports.append,
+        )
+
+        assert result.returncode == 0
+        assert [r.out_time for r in reports] == [1.0, 2.0]
+        assert reports[-1].finished is True
+        assert reports[0].speed == 2.0
+        assert b"encoder log" in result.stderr
+        assert result.stats.command == "ffmpeg"
+        assert result.stats.wall_seconds > 0
+        assert result.stats.peak_rss_bytes > 0
+
+    def test_captures_stdout_of_other_commands(self, tmp_path):
+        result = run_ffmpeg([sys.executable, "-c", "print('{\"format\": {}}')"])
+        assert result.stdout.strip() == b'{"format": {}}'
+
+    def test_nonzero_exit_is_returned(self, tmp_path):
+        result = run_ffmpeg([sys.executable, "-c", "import sys; sys.exit(3)"])
+        assert result.returncode == 3
+        assert result.stats.returncode == 3
+
+    def test_cancel(self, tmp_path):
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(FFmpegCancelledError):
+            run_ffmpeg(
+                [_fake_ffmpeg(tmp_path, "import time; time.sleep(30)")],
+                cancel=token,
+            )
+
+    def test_timeout(self, tmp_path):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_ffmpeg(
+                [_fake_ffmpeg(tmp_path, "import time; time.sleep(30)")],
+                timeout=0.5,
+            )
+
+    def test_failing_progress_callback_kills_process(self, tmp_path):
+        script = PROGRESS_SCRIPT.replace(
+            'sys.stderr.write("encoder log\\n")', "import time; time.sleep(30)"
+        )
+
+        def on_progress(progress):
+            raise ValueError("callback broke")
+
+        started = time.monotonic()
+        with pytest.raises(ValueError, match="callback broke"):
+            run_ffmpeg([_fake_ffmpeg(tmp_path, script)], timeout=60, on_progress=on_progress)
+        assert time.monotonic() - started < 10
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from src.clipper.job_graph import JobGraph, JobStatus, threads_per_job
+
+
+class TestJobGraph:
+    def test_dependencies_run_in_order(self):
+        graph = JobGraph(thread_budget=4, max_workers=4)
+        order = []
+        graph.add("extract", lambda t: order.append("extract") or "clip.mp4")
+        graph.add(
+            "render",
+            lambda t: order.append("render") or graph.result("extract") + ".out",
+            deps=["extract"],
+        )
+        graph.add("validate", lambda t: order.append("validate"), deps=["render"])
+
+        jobs = graph.run()
+
+        assert order == ["extract", "render", "validate"]
+        assert jobs["render"].result == "clip.mp4.out"
+        assert all(j.status == JobStatus.SUCCEEDED for j in jobs.values())
+
+    def test_failure_skips_only_dependents(self):
+        graph = JobGraph(thread_budget=2, max_workers=2)
+
+        def boom(threads):
+            raise RuntimeError("encode failed")
+
+        graph.add("render_a", boom)
+        graph.add("validate_a", lambda t: "ok", deps=["render_a"])
+        graph.add("publish_a", lambda t: "ok", deps=["validate_a"])
+        graph.add("render_b", lambda t: "ok")
+
+        jobs = graph.run()
+
+        assert jobs["render_a"].status == JobStatus.FAILED
+        assert jobs["render_a"].error == "encode failed"
+        assert jobs["validate_a"].status == JobStatus.SKIPPED
+        assert jobs["publish_a"].status == JobStatus.SKIPPED
+        assert jobs["render_b"].status == JobStatus.SUCCEEDED
+
+    def test_thread_budget_limits_concurrency(self):
+        graph = JobGraph(thread_budget=4, max_workers=8)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def work(threads):
+            with lock:
+                active[0] += threads
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= threads
+
+        for n in range(6):
+            graph.add(f"job_{n}", work, threads=2)
+        graph.run()
+
+        assert peak[0] == 4
+
+    def test_threads_clamped_to_budget(self):
+        graph = JobGraph(thread_budget=2, max_workers=1)
+        granted = []
+        graph.add("big", granted.append, threads=16)
+        graph.run()
+        assert granted == [2]
+
+    def test_priority_order(self):
+        graph = JobGraph(thread_budget=1, max_workers=1)
+        order = []
+        for name, priority in [("low", 0), ("high", 10), ("mid", 5)]:
+            graph.add(name, lambda t, n=name: order.append(n), priority=priority)
+        graph.run()
+        assert order == ["high", "mid", "low"]
+
+    def test_unknown_dependency_raises(self):
+        graph = JobGraph(thread_budget=1, max_workers=1)
+        with pytest.raises(ValueError, match="unknown"):
+            graph.add("render", lambda t: None, deps=["extract"])
+
+    def test_duplicate_name_raises(self):
+        graph = JobGraph(thread_budget=1, max_workers=1)
+        graph.add("render", lambda t: None)
+        with pytest.raises(ValueError, match="Duplicate"):
+            graph.add("render", lambda t: None)
+
+
+def test_threads_per_job_defaults_to_budget_share(settings):
+    settings.ffmpeg_thread_budget = 8
+    settings.ffmpeg_max_workers = 2
+    assert threads_per_job(settings) == 4
+    settings.ffmpeg_threads_per_job = 3
+    assert threads_per_job(settings) == 3
@@ -0,0 +1,61 @@
+import os
+
+from src.clipper.keyframes import (
+    KeyframeIndex,
+    load_index,
+    parse_packet_csv,
+    save_index,
+    sidecar_path,
+)
+
+
+class TestParsePacketCsv:
+    def test_keeps_only_keyframes(self):
+        output = "0.000000,K__\n0.033367,___\n2.002000,K__\n2.035367,___\n"
+        assert parse_packet_csv(output) == [0.0, 2.002]
+
+    def test_skips_missing_timestamps(self):
+        output = "N/A,K__\n4.000000,K_\n\n"
+        assert parse_packet_csv(output) == [4.0]
+
+
+class TestKeyframeIndex:
+    def test_lookups(self):
+        index = KeyframeIndex([0.0, 2.0, 4.0, 6.0])
+        assert index.at_or_after(2.5) == 4.0
+        assert index.at_or_after(4.0) == 4.0
+        assert index.at_or_after(6.5) is None
+        assert index.at_or_before(5.9) == 4.0
+        assert index.at_or_before(4.0) == 4.0
+        assert index.at_or_before(-1.0) is None
+
+    def test_sorts_times(self):
+        assert KeyframeIndex([4.0, 0.0, 2.0]).times == [0.0, 2.0, 4.0]
+
+
+class TestSidecar:
+    def test_round_trip(self, tmp_path):
+        source = tmp_path / "video.mp4"
+        source.write_bytes(b"\x00" * 64)
+        stat = source.stat()
+
+        save_index(source, KeyframeIndex([0.0, 2.0], stat.st_size, stat.st_mtime_ns))
+
+        assert sidecar_path(source).name == "video.mp4.keyframes.json"
+        loaded = load_index(source)
+        assert loaded is not None
+        assert loaded.times == [0.0, 2.0]
+
+    def test_stale_when_source_changes(self, tmp_path):
+        source = tmp_path / "video.mp4"
+        source.write_bytes(b"\x00" * 64)
+        stat = source.stat()
+        save_index(source, KeyframeIndex([0.0], stat.st_size, stat.st_mtime_ns))
+
+        source.write_bytes(b"\x00" * 128)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_index(source) is None
+
+    def test_missing(self, tmp_path):
+        assert load_index(tmp_path / "nope.mp4") is None
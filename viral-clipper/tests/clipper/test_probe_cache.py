@@ -0,0 +1,80 @@
+import os
+import pickle
+
+from src.clipper.probe_cache import ProbeCache, file_identity, get_probe_cache
+
+INFO = {"format": {"duration": "30.0"}, "streams": [{"codec_type": "video"}]}
+
+
+def _video(tmp_path, name="a.mp4", data=b"\x00" * 16):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+class TestFileIdentity:
+    def test_includes_size_mtime_and_inode(self, tmp_path):
+        path = _video(tmp_path)
+        stat = path.stat()
+        assert file_identity(path) == (
+            str(path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino
+        )
+
+
+class TestProbeCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = ProbeCache(tmp_path / "probe.sqlite3")
+        path = _video(tmp_path)
+
+        assert cache.get(path) is None
+        cache.put(path, INFO)
+        assert cache.get(path) == INFO
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        db_path = tmp_path / "probe.sqlite3"
+        path = _video(tmp_path)
+        ProbeCache(db_path).put(path, INFO)
+
+        assert ProbeCache(db_path).get(path) == INFO
+
+    def test_modified_file_is_stale(self, tmp_path):
+        db_path = tmp_path / "probe.sqlite3"
+        cache = ProbeCache(db_path)
+        path = _video(tmp_path)
+        cache.put(path, INFO)
+
+        path.write_bytes(b"\x00" * 32)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get(path) is None
+        assert ProbeCache(db_path).get(path) is None
+
+    def test_missing_file(self, tmp_path):
+        cache = ProbeCache(None)
+        cache.put(tmp_path / "missing.mp4", INFO)
+        assert cache.get(tmp_path / "missing.mp4") is None
+
+    def test_memory_is_bounded(self, tmp_path):
+        cache = ProbeCache(None, max_entries=2)
+        paths = [_video(tmp_path, f"{i}.mp4") for i in range(3)]
+        for path in paths:
+            cache.put(path, INFO)
+
+        assert cache.get(paths[0]) is None
+        assert cache.get(paths[2]) == INFO
+
+    def test_picklable(self, tmp_path):
+        db_path = tmp_path / "probe.sqlite3"
+        path = _video(tmp_path)
+        cache = ProbeCache(db_path)
+        cache.put(path, INFO)
+
+        restored = pickle.loads(pickle.dumps(cache))
+        assert restored.get(path) == INFO
+
+
+def test_shared_cache_per_store(tmp_path):
+    db_path = tmp_path / "probe.sqlite3"
+    assert get_probe_cache(db_path) is get_probe_cache(db_path)
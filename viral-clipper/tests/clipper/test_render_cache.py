@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.clipper import render_cache
+from src.clipper.render_cache import RenderCache, render_key
+from src.clipper.render_plan import RenderPlan
+
+SETTINGS = {"video": ["-c:v", "libx264"], "font": "/fonts/a.ttf"}
+
+
+def _plan(tmp_path, **overrides):
+    source = tmp_path / "source.mp4"
+    if not source.exists():
+        source.write_bytes(b"\x00" * 32)
+    ass = tmp_path / "clip.ass"
+    if not ass.exists():
+        ass.write_text("[Events]\nDialogue: hello\n")
+    defaults = {
+        "source_path": source,
+        "start_time": 10.0,
+        "end_time": 40.0,
+        "ass_path": ass,
+        "hook_text": "Wait for it",
+    }
+    defaults.update(overrides)
+    return RenderPlan(**defaults)
+
+
+class TestRenderKey:
+    def test_stable(self, tmp_path):
+        assert render_key(_plan(tmp_path), SETTINGS) == render_key(_plan(tmp_path), SETTINGS)
+
+    def test_changes_with_each_input(self, tmp_path):
+        base = render_key(_plan(tmp_path), SETTINGS)
+        assert render_key(_plan(tmp_path, hook_text="Other"), SETTINGS) != base
+        assert render_key(_plan(tmp_path, end_time=41.0), SETTINGS) != base
+        assert render_key(_plan(tmp_path, mute_segments=[(1.0, 2.0)]), SETTINGS) != base
+        assert render_key(_plan(tmp_path), {**SETTINGS, "font": "/fonts/b.ttf"}) != base
+
+    def test_changes_with_caption_content(self, tmp_path):
+        plan = _plan(tmp_path)
+        before = render_key(plan, SETTINGS)
+        plan.ass_path.write_text("[Events]\nDialogue: changed\n")
+        assert render_key(plan, SETTINGS) != before
+
+    def test_changes_with_source_file(self, tmp_path):
+        plan = _plan(tmp_path)
+        before = render_key(plan, SETTINGS)
+        plan.source_path.write_bytes(b"\x01" * 64)
+        assert render_key(plan, SETTINGS) != before
+
+
+class TestRenderCache:
+    def _rendered(self, tmp_path, name, size):
+        path = tmp_path / name
+        path.write_bytes(b"\x00" * size)
+        return path
+
+    def test_put_and_fetch(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.put("ab" * 32, self._rendered(tmp_path, "r.mp4", 100))
+
+        output = tmp_path / "out" / "clip.mp4"
+        assert cache.fetch("ab" * 32, output) is True
+        assert output.stat().st_size == 100
+
+    def test_miss(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        assert cache.fetch("cd" * 32, tmp_path / "clip.mp4") is False
+        assert cache.get("cd" * 32) is None
+
+    def test_empty_render_not_stored(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        assert cache.put("ab" * 32, self._rendered(tmp_path, "r.mp4", 0)) is None
+        assert cache.put("ab" * 32, tmp_path / "missing.mp4") is None
+
+    def test_larger_than_quota_not_stored(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=150)
+        kept = cache.put("aa" * 32, self._rendered(tmp_path, "1.mp4", 100))
+
+        assert cache.put("bb" * 32, self._rendered(tmp_path, "2.mp4", 200)) is None
+        assert cache.get("bb" * 32) is None
+        assert kept.exists()
+
+    def test_new_entry_survives_its_own_eviction(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=150)
+        old = cache.put("aa" * 32, self._rendered(tmp_path, "1.mp4", 100))
+        os.utime(old, (9_999_999_999, 9_999_999_999))  # newer mtime than the next put
+
+        new = cache.put("bb" * 32, self._rendered(tmp_path, "2.mp4", 100))
+
+        assert new is not None and new.exists()
+        assert not old.exists()
+
+    def test_linked_fetch_outlives_eviction(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.put("ab" * 32, self._rendered(tmp_path, "r.mp4", 100))
+        output = tmp_path / "work" / "base.mp4"
+
+        assert cache.fetch("ab" * 32, output, link=True) is True
+        cache.max_bytes = 0
+        cache.evict()
+
+        assert cache.get("ab" * 32) is None
+        assert output.stat().st_size == 100
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=250)
+        old, used, new = "aa" * 32, "bb" * 32, "cc" * 32
+        cache.put(old, self._rendered(tmp_path, "1.mp4", 100))
+        cache.put(used, self._rendered(tmp_path, "2.mp4", 100))
+        for i, key in enumerate([old, used]):
+            path = cache.get(key)
+            os.utime(path, (1000 + i, 1000 + i))
+        cache.get(old)  # refresh: now the most recently used
+
+        cache.put(new, self._rendered(tmp_path, "3.mp4", 100))
+
+        assert cache.get(used) is None
+        assert cache.get(old) is not None
+        assert cache.get(new) is not None
+        assert cache.total_bytes() == 200
+
+    def test_seen_markers(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        assert cache.seen("ee" * 32) is False
+        cache.mark_seen("ee" * 32)
+        assert cache.seen("ee" * 32) is True
+
+    def test_put_clears_seen_marker(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.mark_seen("ee" * 32)
+        cache.put("ee" * 32, self._rendered(tmp_path, "r.mp4", 10))
+        assert cache.seen("ee" * 32) is False
+
+    def test_seen_markers_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(render_cache, "MAX_SEEN_MARKERS", 2)
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        for i, key in enumerate(["a1", "a2", "a3"]):
+            cache.mark_seen(key)
+            os.utime(cache.root / "seen" / key, (1000 + i, 1000 + i))
+
+        cache.evict()
+
+        assert [cache.seen(k) for k in ["a1", "a2", "a3"]] == [False, True, True]
+
+    def test_entry_removed_during_evict_is_skipped(self, tmp_path, monkeypatch):
+        cache = RenderCache(tmp_path / "cache", max_bytes=150)
+        cache.put("aa" * 32, self._rendered(tmp_path, "1.mp4", 100))
+        gone = cache.put("bb" * 32, self._rendered(tmp_path, "2.mp4", 100))
+        real_glob = Path.glob
+
+        def glob_then_delete(self, pattern):
+            paths = list(real_glob(self, pattern))
+            gone.unlink(missing_ok=True)  # another worker evicts it meanwhile
+            return paths
+
+        monkeypatch.setattr(Path, "glob", glob_then_delete)
+        cache.evict()
+        assert cache.total_bytes() <= 150
+
+    def test_concurrent_puts(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=500)
+        rendered = [self._rendered(tmp_path, f"{i}.mp4", 100) for i in range(8)]
+
+        def put(i):
+            return cache.put(f"{i:02d}" * 32, rendered[i])
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(put, list(range(8)) * 4))
+
+        assert cache.total_bytes() <= 500
+        assert not list(cache.root.glob("*/*.tmp"))
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+from src.clipper.render_plan import (
+    AUDIO_OUT,
+    VIDEO_OUT,
+    RenderPlan,
+    build_fanout_filter_complex,
+    build_filter_complex,
+    drawtext_filter,
+    escape_filter_path,
+    group_for_fanout,
+)
+
+
+def _plan(**overrides):
+    defaults = {
+        "source_path": Path("/videos/source.mp4"),
+        "start_time": 10.0,
+        "end_time": 40.0,
+    }
+    defaults.update(overrides)
+    return RenderPlan(**defaults)
+
+
+class TestRenderPlan:
+    def test_duration(self):
+        assert _plan().duration == 30.0
+
+    def test_duration_never_negative(self):
+        assert _plan(start_time=40.0, end_time=10.0).duration == 0.0
+
+
+class TestEscapeFilterPath:
+    def test_escapes_colon_and_backslash(self):
+        assert escape_filter_path("C:\\subs\\a.ass") == "C\\:\\\\subs\\\\a.ass"
+
+    def test_escapes_quote(self):
+        assert escape_filter_path("it's.ttf") == "it\\'s.ttf"
+
+
+class TestDrawtextFilter:
+    def test_sanitizes_text(self):
+        result = drawtext_filter("Don't: stop", "/fonts/a.ttf", 3.0)
+        assert "Don\u2019t\\: stop" in result
+        assert "between(t,0,3.0)" in result
+
+
+class TestBuildFilterComplex:
+    def test_minimal_plan_trims_and_crops(self):
+        graph = build_filter_complex(_plan(), "/fonts/a.ttf")
+        video, audio = graph.split(";")
+        assert video.startswith("[0:v]trim=duration=30.0,setpts=PTS-STARTPTS")
+        assert "crop=ih*9/16:ih,scale=1080:1920" in video
+        assert video.endswith(VIDEO_OUT)
+        assert audio == f"[0:a]atrim=duration=30.0,asetpts=PTS-STARTPTS{AUDIO_OUT}"
+        assert "ass=" not in graph
+        assert "drawtext" not in graph
+
+    def test_full_plan_orders_filters(self):
+        plan = _plan(
+            ass_path=Path("/tmp/clip.ass"),
+            hook_text="Wait for it",
+            mute_segments=[(1.0, 1.5), (4.0, 4.2)],
+        )
+        graph = build_filter_complex(plan, "/fonts/a.ttf")
+        video, audio = graph.split(";")
+        # Captions are burned after the crop so they land on the 1080x1920 frame
+        assert video.index("crop=") < video.index("ass=") < video.index("drawtext=")
+        assert "volume=enable='between(t,1.0,1.5)':volume=0" in audio
+        assert "volume=enable='between(t,4.0,4.2)':volume=0" in audio
+
+
+class TestGroupForFanout:
+    def test_nearby_moments_share_a_group(self):
+        plans = [_plan(start_time=100.0, end_time=130.0), _plan(start_time=10.0, end_time=40.0)]
+        assert group_for_fanout(plans, max_gap=120.0) == [[1, 0]]
+
+    def test_large_gap_splits_groups(self):
+        plans = [_plan(start_time=10.0, end_time=40.0), _plan(start_time=3600.0, end_time=3630.0)]
+        assert group_for_fanout(plans, max_gap=120.0) == [[0], [1]]
+
+    def test_max_outputs_splits_groups(self):
+        plans = [_plan(start_time=i * 10.0, end_time=i * 10.0 + 30.0) for i in range(5)]
+        assert group_for_fanout(plans, max_outputs=2) == [[0, 1], [2, 3], [4]]
+
+    def test_different_sources_never_share(self):
+        plans = [_plan(), _plan(source_path=Path("/videos/other.mp4"))]
+        assert len(group_for_fanout(plans)) == 2
+
+
+class TestBuildFanoutFilterComplex:
+    def test_split_and_per_clip_trims(self):
+        plans = [_plan(start_time=10.0, end_time=40.0), _plan(start_time=50.0, end_time=80.0)]
+        graph, labels = build_fanout_filter_complex(plans, "/fonts/a.ttf")
+        assert "[0:v]split=2[v0][v1]" in graph
+        assert "[0:a]asplit=2[a0][a1]" in graph
+        # Offsets are relative to the earliest clip (where the input is seeked)
+        assert "[v0]trim=duration=30.0," in graph
+        assert "[v1]trim=start=40.0:duration=30.0," in graph
+        assert "[a1]atrim=start=40.0:duration=30.0," in graph
+        assert labels == [("[vout0]", "[aout0]"), ("[vout1]", "[aout1]")]
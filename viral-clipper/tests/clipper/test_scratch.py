@@ -0,0 +1,47 @@
+from src.clipper.scratch import ScratchSpace, disk_workdir, get_scratch_space
+
+
+class TestScratchSpace:
+    def test_workdir_in_scratch_and_released(self, tmp_path):
+        scratch = ScratchSpace(tmp_path / "shm", max_bytes=1000)
+
+        with scratch.workdir("smartcut", 400, tmp_path / "fallback") as work_dir:
+            assert work_dir.parent == tmp_path / "shm"
+            assert scratch.reserved_bytes == 400
+            (work_dir / "head.ts").write_bytes(b"\x00" * 10)
+
+        assert not work_dir.exists()
+        assert scratch.reserved_bytes == 0
+        assert scratch.peak_bytes == 400
+
+    def test_falls_back_to_disk_when_over_quota(self, tmp_path):
+        scratch = ScratchSpace(tmp_path / "shm", max_bytes=1000)
+        fallback = tmp_path / ".clip_smartcut"
+
+        with scratch.workdir("a", 800, tmp_path / "unused"):
+            with scratch.workdir("b", 800, fallback) as work_dir:
+                assert work_dir == fallback
+                assert scratch.reserved_bytes == 800
+
+        assert not fallback.exists()
+        assert scratch.reserved_bytes == 0
+
+    def test_released_on_error(self, tmp_path):
+        scratch = ScratchSpace(tmp_path / "shm", max_bytes=1000)
+        try:
+            with scratch.workdir("a", 500, tmp_path / "fallback"):
+                raise RuntimeError("encode failed")
+        except RuntimeError:
+            pass
+        assert scratch.reserved_bytes == 0
+        assert list((tmp_path / "shm").iterdir()) == []
+
+
+def test_disk_workdir_removed(tmp_path):
+    with disk_workdir(tmp_path / ".work") as work_dir:
+        (work_dir / "part.ts").write_bytes(b"\x00")
+    assert not (tmp_path / ".work").exists()
+
+
+def test_shared_scratch_per_root(tmp_path):
+    assert get_scratch_space(tmp_path, 10) is get_scratch_space(tmp_path, 10)
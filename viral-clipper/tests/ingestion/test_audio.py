@@ -0,0 +1,87 @@
+import os
+import struct
+import sys
+
+import pytest
+
+from src.exceptions import TranscriptionError
+from src.ingestion.audio import audio_decode_command, decode_audio, stream_pcm
+
+PCM_SCRIPT = """
+import struct, sys
+samples = [0, 16384, -32768, 32767, -16384]
+data = struct.pack("<5h", *samples)
+# Odd-sized writes: blocks must still split on whole samples
+sys.stdout.buffer.write(data[:3])
+sys.stdout.buffer.flush()
+sys.stdout.buffer.write(data[3:])
+"""
+
+
+def _fake_ffmpeg(tmp_path, body):
+    """An executable named 'ffmpeg' running the given Python code."""
+    path = tmp_path / "ffmpeg"
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestAudioDecodeCommand:
+    def test_writes_mono_s16le_to_stdout(self, tmp_path):
+        cmd = audio_decode_command(tmp_path / "in.mp4")
+
+        assert cmd[0] == "ffmpeg"
+        assert cmd[cmd.index("-f") + 1] == "s16le"
+        assert cmd[cmd.index("-ar") + 1] == "16000"
+        assert cmd[cmd.index("-ac") + 1] == "1"
+        assert cmd[-1] == "pipe:1"
+
+
+class TestStreamPcm:
+    def test_yields_whole_samples(self, tmp_path):
+        blocks = list(stream_pcm([_fake_ffmpeg(tmp_path, PCM_SCRIPT)], block_bytes=3))
+
+        assert all(len(b) % 2 == 0 for b in blocks)
+        assert struct.unpack("<5h", b"".join(blocks)) == (0, 16384, -32768, 32767, -16384)
+
+    def test_ffmpeg_failure(self, tmp_path):
+        script = "import sys\nsys.stderr.write('no audio stream')\nsys.exit(1)\n"
+
+        with pytest.raises(TranscriptionError, match="Audio extraction failed: no audio stream"):
+            list(stream_pcm([_fake_ffmpeg(tmp_path, script)]))
+
+    def test_timeout(self, tmp_path):
+        script = "import time\ntime.sleep(30)\n"
+
+        with pytest.raises(TranscriptionError, match="timed out"):
+            list(stream_pcm([_fake_ffmpeg(tmp_path, script)], timeout=0.5))
+
+
+class TestDecodeAudio:
+    @pytest.fixture
+    def fake_ffmpeg_on_path(self, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        _fake_ffmpeg(bin_dir, PCM_SCRIPT)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def test_decodes_to_float32(self, settings, tmp_path, fake_ffmpeg_on_path):
+        np = pytest.importorskip("numpy")
+
+        audio = decode_audio(tmp_path / "in.mp4", settings)
+
+        assert audio.dtype == np.float32
+        assert audio.tolist() == [0.0, 0.5, -1.0, 32767 / 32768, -0.5]
+        assert not list(tmp_path.glob("*.wav"))
+
+    def test_long_sources_use_memmap(self, settings, tmp_path, fake_ffmpeg_on_path, monkeypatch):
+        np = pytest.importorskip("numpy")
+        settings.audio_memmap_threshold_seconds = 1
+        monkeypatch.setattr("src.ingestion.audio._probe_duration", lambda path, s: 2.0)
+
+        audio = decode_audio(tmp_path / "in.mp4", settings)
+
+        assert isinstance(audio, np.memmap)
+        assert len(audio) == 5
+        # The backing file is unlinked as soon as it's mapped
+        assert not list(settings.get_temp_path().glob("audio_*"))
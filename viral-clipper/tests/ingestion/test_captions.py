@@ -0,0 +1,150 @@
+from src.ingestion.captions import (
+    find_caption_file,
+    load_caption_transcript,
+    parse_srv3,
+    parse_vtt,
+)
+
+# Excerpt of a YouTube auto-caption file (clips/raw/nett_gq_10things.en.vtt)
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.090 --> 00:00:03.990 align:start position:0%
+ 
+[Music]
+
+00:00:03.990 --> 00:00:04.000 align:start position:0%
+[Music]
+ 
+
+00:00:04.000 --> 00:00:06.150 align:start position:0%
+[Music]
+Hey<00:00:04.319><c> GQ</c><00:00:04.640><c> is</c><00:00:04.960><c> that</c>
+
+00:00:06.150 --> 00:00:06.160 align:start position:0%
+Hey GQ is that
+ 
+
+00:00:06.160 --> 00:00:08.250 align:start position:0%
+Hey GQ is that
+things<00:00:06.319><c> I</c><00:00:06.560><c> cannot</c><00:00:06.960><c> live</c>
+
+00:00:08.250 --> 00:00:08.260 align:start position:0%
+things I cannot live
+ 
+
+00:00:08.260 --> 00:00:09.000 align:start position:0%
+things I cannot live
+without
+"""
+
+SRV3 = """<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">
+<body>
+<p t="4000" d="2150" w="1"><s ac="0">Hey</s><s t="319" ac="0"> GQ</s><s t="640" ac="0"> is</s></p>
+<p t="6150" d="10" w="1" a="1">
+</p>
+<p t="6160" d="2090"><s ac="0">things</s><s t="159" ac="0"> I&#39;m</s></p>
+</body>
+</timedtext>
+"""
+
+
+class TestParseVtt:
+    def test_word_timings_from_rolling_captions(self):
+        transcript = parse_vtt(ROLLING_VTT)
+
+        assert transcript["language"] == "en"
+        assert transcript["source"] == "captions"
+        assert [s["text"] for s in transcript["segments"]] == [
+            "Hey GQ is that",
+            "things I cannot live",
+            "without",
+        ]
+        first = transcript["segments"][0]
+        assert first["words"][0] == {"word": "Hey", "start": 4.0, "end": 4.319}
+        assert first["words"][1] == {"word": "GQ", "start": 4.319, "end": 4.64}
+        # Last word ends at the cue end
+        assert first["words"][-1] == {"word": "that", "start": 4.96, "end": 6.15}
+        assert (first["start"], first["end"]) == (4.0, 6.15)
+
+    def test_untimed_lines_are_spread_over_cue(self):
+        transcript = parse_vtt(ROLLING_VTT)
+
+        assert transcript["segments"][-1]["words"] == [
+            {"word": "without", "start": 8.26, "end": 9.0},
+        ]
+        assert transcript["timed_word_ratio"] == round(8 / 9, 3)
+
+    def test_long_pause_is_not_absorbed(self):
+        vtt = (
+            "WEBVTT\n\n00:00:01.000 --> 00:00:09.000\n"
+            "so<00:00:01.200><c> then</c>\n"
+        )
+
+        words = parse_vtt(vtt)["segments"][0]["words"]
+
+        assert words[-1] == {"word": "then", "start": 1.2, "end": 2.7}
+
+    def test_plain_captions(self):
+        vtt = "WEBVTT\n\n1\n00:01:00.000 --> 00:01:02.000\nHello <b>there</b> &amp; you\n"
+
+        transcript = parse_vtt(vtt)
+
+        assert transcript["segments"][0]["words"] == [
+            {"word": "Hello", "start": 60.0, "end": 60.5},
+            {"word": "there", "start": 60.5, "end": 61.0},
+            {"word": "&", "start": 61.0, "end": 61.5},
+            {"word": "you", "start": 61.5, "end": 62.0},
+        ]
+        assert transcript["timed_word_ratio"] == 0.0
+
+
+class TestParseSrv3:
+    def test_word_offsets_are_relative_to_paragraph(self):
+        transcript = parse_srv3(SRV3)
+
+        segments = transcript["segments"]
+        assert [s["text"] for s in segments] == ["Hey GQ is", "things I'm"]
+        assert segments[0]["words"][1] == {"word": "GQ", "start": 4.319, "end": 4.64}
+        assert segments[1]["words"][-1] == {"word": "I'm", "start": 6.319, "end": 7.819}
+        assert transcript["timed_word_ratio"] == 1.0
+
+
+class TestLoadCaptionTranscript:
+    def test_finds_captions_next_to_video(self, tmp_path):
+        video = tmp_path / "talk.mp4"
+        (tmp_path / "talk.de.vtt").write_text(ROLLING_VTT)
+        (tmp_path / "talk.en.vtt").write_text(ROLLING_VTT)
+        (tmp_path / "talk.en.srv3").write_text(SRV3)
+        (tmp_path / "talk2.en.vtt").write_text(ROLLING_VTT)
+
+        assert find_caption_file(video) == tmp_path / "talk.en.srv3"
+        assert find_caption_file(tmp_path / "other.mp4") is None
+
+    def test_good_captions_skip_asr(self, settings, tmp_path):
+        video = tmp_path / "talk.mp4"
+        (tmp_path / "talk.en.srv3").write_text(SRV3)
+
+        transcript = load_caption_transcript(video, settings)
+
+        assert transcript is not None
+        assert len(transcript["segments"]) == 2
+
+    def test_mostly_untimed_captions_are_rejected(self, settings, tmp_path):
+        video = tmp_path / "talk.mp4"
+        (tmp_path / "talk.en.vtt").write_text(ROLLING_VTT)
+
+        settings.caption_min_timed_ratio = 0.95
+        assert load_caption_transcript(video, settings) is None
+        settings.caption_min_timed_ratio = 0.8
+        assert load_caption_transcript(video, settings) is not None
+
+    def test_disabled_or_unreadable(self, settings, tmp_path):
+        video = tmp_path / "talk.mp4"
+        (tmp_path / "talk.en.srv3").write_text("<timedtext")
+
+        assert load_caption_transcript(video, settings) is None
+        (tmp_path / "talk.en.srv3").write_text(SRV3)
+        settings.caption_fast_path = False
+        assert load_caption_transcript(video, settings) is None
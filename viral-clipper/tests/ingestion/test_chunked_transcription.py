@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.ingestion.chunked_transcription import (
+    FRAME_SECONDS,
+    choose_split_points,
+    chunk_workers,
+    stitch_chunks,
+)
+
+
+def _energies(duration_seconds, quiet_at=()):
+    """Loud frames everywhere except one frame at each quiet time."""
+    energies = [1.0] * int(duration_seconds / FRAME_SECONDS)
+    for t in quiet_at:
+        energies[int(t / FRAME_SECONDS)] = 0.0
+    return energies
+
+
+class TestChooseSplitPoints:
+    def test_cuts_at_silence_near_each_mark(self):
+        energies = _energies(1900, quiet_at=[612.0, 1190.0])
+
+        splits = choose_split_points(energies, chunk_seconds=600)
+
+        assert splits == [pytest.approx(612.05), pytest.approx(1190.05)]
+
+    def test_without_silence_cuts_at_mark(self):
+        splits = choose_split_points(_energies(1300), chunk_seconds=600)
+
+        assert splits == [pytest.approx(600.05)]
+
+    def test_short_remainder_joins_last_chunk(self):
+        # 1400 s: a split at 600 leaves 800 s, less than 1.5 chunks
+        assert len(choose_split_points(_energies(1400), chunk_seconds=600)) == 1
+        assert choose_split_points(_energies(800), chunk_seconds=600) == []
+
+    def test_ignores_silence_outside_search_window(self):
+        energies = _energies(1300, quiet_at=[500.0])
+
+        assert choose_split_points(energies, chunk_seconds=600) == [pytest.approx(600.05)]
+
+
+class TestStitchChunks:
+    def test_offsets_segments_and_words(self):
+        first = [{"start": 0.0, "end": 1.0, "text": "a", "words": [{"word": "a", "start": 0.1, "end": 0.9}]}]
+        second = [{"start": 0.5, "end": 2.0, "text": "b", "words": [
+            {"word": "b", "start": 0.5, "end": 1.0},
+            {"word": "2"},
+        ]}]
+
+        segments = stitch_chunks([(0.0, first), (600.05, second)])
+
+        assert [s["start"] for s in segments] == [0.0, 600.55]
+        assert segments[1]["end"] == 602.05
+        assert segments[1]["words"][0] == {"word": "b", "start": 600.55, "end": 601.05}
+        # Unaligned words stay without timestamps
+        assert segments[1]["words"][1] == {"word": "2"}
+        # Inputs aren't modified
+        assert second[0]["start"] == 0.5
+
+
+class TestChunkWorkers:
+    def test_auto_uses_one_worker_per_four_cores(self, settings):
+        with patch("src.ingestion.chunked_transcription.os.cpu_count", return_value=16):
+            assert chunk_workers(settings, chunks=18) == 4
+            assert chunk_workers(settings, chunks=2) == 2
+
+    def test_configured(self, settings):
+        settings.transcription_chunk_workers = 3
+
+        assert chunk_workers(settings, chunks=18) == 3
+
+
+class TestShouldChunk:
+    def _make_transcriber(self, settings):
+        from src.ingestion.transcriber import WhisperXTranscriber
+
+        return WhisperXTranscriber(settings)
+
+    def test_long_audio_on_multicore_cpu(self, settings):
+        transcriber = self._make_transcriber(settings)
+        with patch("src.ingestion.chunked_transcription.os.cpu_count", return_value=16):
+            assert transcriber._should_chunk(3 * 3600)
+            assert not transcriber._should_chunk(1800)
+
+    def test_not_on_gpu_or_single_worker(self, settings):
+        transcriber = self._make_transcriber(settings)
+        with patch("src.ingestion.chunked_transcription.os.cpu_count", return_value=4):
+            assert not transcriber._should_chunk(3 * 3600)
+
+        settings.whisperx_device = "cuda"
+        settings.transcription_chunk_workers = 4
+        assert not transcriber._should_chunk(3 * 3600)
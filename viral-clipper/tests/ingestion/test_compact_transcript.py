@@ -0,0 +1,160 @@
+import json
+import random
+
+import pytest
+
+from src.ingestion.compact_transcript import CompactTranscript
+
+
+def _long_transcript(words=5000, seed=0):
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(300)]
+    segments = []
+    t = 0.0
+    for n in range(words // 10):
+        seg_words = []
+        for _ in range(10):
+            start = round(t, 3)
+            t += rng.uniform(0.1, 0.5)
+            seg_words.append({
+                "word": rng.choice(vocab),
+                "start": start,
+                "end": round(t, 3),
+                "score": round(rng.random(), 3),
+            })
+        segments.append({
+            "start": seg_words[0]["start"],
+            "end": seg_words[-1]["end"],
+            "text": " ".join(w["word"] for w in seg_words),
+            "words": seg_words,
+        })
+    return {"segments": segments, "language": "en"}
+
+
+def _deep_size(obj, seen=None):
+    import sys
+
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, list):
+        size += sum(_deep_size(v, seen) for v in obj)
+    return size
+
+
+class TestRoundTrip:
+    def test_sample_transcript(self, sample_transcript):
+        compact = CompactTranscript.from_dict(sample_transcript)
+        assert compact.to_dict() == sample_transcript
+
+    def test_missing_fields_and_extra_keys(self):
+        transcript = {
+            "language": "en",
+            "word_segments": [{"word": "hi"}],
+            "segments": [
+                {
+                    "start": 0.5,
+                    "end": 2.0,
+                    "text": "Hi 2024",
+                    "speaker": "SPEAKER_00",
+                    "avg_logprob": -0.2,
+                    "words": [
+                        {"word": "Hi", "start": 0.5, "end": 0.9, "score": 0.9},
+                        {"word": "2024"},
+                        {"word": "x", "start": 1, "end": None, "speaker": "SPEAKER_01"},
+                    ],
+                },
+                {"start": 2.0, "end": 3.0, "text": "no words"},
+            ],
+        }
+        compact = CompactTranscript.from_dict(transcript)
+        assert compact.to_dict() == transcript
+        assert compact.word_count == 3
+        assert len(compact) == 2
+
+    def test_binary_round_trip(self, sample_transcript):
+        data = CompactTranscript.from_dict(sample_transcript).to_bytes()
+        assert CompactTranscript.from_bytes(data).to_dict() == sample_transcript
+
+    def test_long_transcript_binary_round_trip(self):
+        transcript = _long_transcript()
+        data = CompactTranscript.from_dict(transcript).to_bytes()
+        assert CompactTranscript.from_bytes(data).to_dict() == transcript
+        assert len(data) < len(json.dumps(transcript)) / 2
+
+    def test_unquantizable_times_kept_exactly(self):
+        transcript = {"segments": [{"start": 0.1 + 0.2, "end": 1e-7, "text": "x", "words": []}]}
+        compact = CompactTranscript.from_dict(transcript)
+        assert compact.seg_start.typecode == "d"
+        assert CompactTranscript.from_bytes(compact.to_bytes()).to_dict() == transcript
+
+    def test_integer_times_come_back_as_ints(self):
+        transcript = {"segments": [{
+            "start": 10, "end": 12.5, "text": "x",
+            "words": [{"word": "x", "start": 10, "end": 11, "score": 1}],
+        }]}
+        restored = CompactTranscript.from_bytes(
+            CompactTranscript.from_dict(transcript).to_bytes()
+        ).to_dict()
+        assert restored == transcript
+        word = restored["segments"][0]["words"][0]
+        assert [type(word[k]) for k in ("start", "end", "score")] == [int, int, int]
+        assert type(restored["segments"][0]["start"]) is int
+        assert type(restored["segments"][0]["end"]) is float
+
+    def test_rejects_other_data(self):
+        with pytest.raises(ValueError):
+            CompactTranscript.from_bytes(b"{}")
+
+
+class TestReading:
+    def test_segment_spans(self, sample_transcript):
+        compact = CompactTranscript.from_dict(sample_transcript)
+        assert list(compact.segment_spans()) == [
+            (s["start"], s["end"], s["text"]) for s in sample_transcript["segments"]
+        ]
+
+    def test_words_in_range(self, sample_transcript):
+        compact = CompactTranscript.from_dict(sample_transcript)
+        words = [w for s in sample_transcript["segments"] for w in s["words"]]
+        assert compact.words_in_range(0.0, 0.45) == [
+            w for w in words if w["end"] >= 0.0 and w["start"] <= 0.45
+        ]
+        assert compact.words_in_range(1000, 1001) == []
+
+
+    def test_integer_timestamps_in_range_queries(self):
+        transcript = {"segments": [{
+            "start": 10, "end": 14, "text": "one two",
+            "words": [
+                {"word": "one", "start": 10, "end": 11},
+                {"word": "two", "start": 12, "end": 14},
+            ],
+        }]}
+        compact = CompactTranscript.from_dict(transcript)
+        assert [w["word"] for w in compact.words_in_range(9, 14)] == ["one", "two"]
+        assert [w["word"] for w in compact.words_in_range(11.5, 13)] == ["two"]
+        assert compact.words_in_range(0, 5) == []
+        assert len(compact.segments_in_range(13, 20)) == 1
+        assert list(compact.segment_spans()) == [(10, 14, "one two")]
+
+    def test_times_kept_in_side_table_are_indexed(self):
+        # Layout written before integer times were stored in the columns
+        compact = CompactTranscript.from_dict(
+            {"segments": [{"text": "one", "words": [{"word": "one"}]}]}
+        )
+        compact.word_extra[0] = {"start": 10, "end": 11}
+        compact.seg_extra[0] = {"start": 10, "end": 11}
+        assert [w["word"] for w in compact.words_in_range(9, 14)] == ["one"]
+        assert list(compact.segment_spans()) == [(10, 11, "one")]
+
+
+def test_memory_order_of_magnitude_smaller():
+    # Decoded from JSON like Source.transcript_json, so no shared strings
+    transcript = json.loads(json.dumps(_long_transcript()))
+    compact = CompactTranscript.from_dict(transcript)
+    assert compact.nbytes * 10 < _deep_size(transcript)
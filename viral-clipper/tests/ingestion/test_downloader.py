@@ -100,3 +100,72 @@ class TestContentDownloaderDownload:
         downloader = ContentDownloader(settings)
         result = downloader.download("https://youtube.com/watch?v=test", 1)
         assert result == output_file
+
+
+class TestContentDownloaderCaptions:
+    @patch("src.ingestion.downloader.yt_dlp.YoutubeDL")
+    @patch("src.ingestion.downloader.validate_url", return_value="https://youtube.com/watch?v=test")
+    def test_downloads_subtitles_only(self, mock_validate, mock_ydl_class, settings):
+        from src.ingestion.downloader import ContentDownloader
+
+        captions = settings.get_source_storage_path(1) / "test123.en.srv3"
+        captions.write_text("<timedtext/>")
+
+        mock_ydl = MagicMock()
+        mock_ydl.__enter__ = MagicMock(return_value=mock_ydl)
+        mock_ydl.__exit__ = MagicMock(return_value=False)
+        mock_ydl.extract_info.return_value = {
+            "id": "test123",
+            "requested_subtitles": {"en": {"ext": "srv3", "filepath": str(captions)}},
+        }
+        mock_ydl_class.return_value = mock_ydl
+
+        result = ContentDownloader(settings).download_captions("https://youtube.com/watch?v=test", 1)
+
+        assert result == captions
+        opts = mock_ydl_class.call_args[0][0]
+        assert opts["skip_download"] is True
+        assert opts["writeautomaticsub"] is True
+        assert opts["subtitleslangs"] == ["en"]
+
+    @patch("src.ingestion.downloader.yt_dlp.YoutubeDL")
+    @patch("src.ingestion.downloader.validate_url", return_value="https://youtube.com/watch?v=test")
+    def test_reuses_download_info(self, mock_validate, mock_ydl_class, settings):
+        from src.ingestion.downloader import ContentDownloader
+
+        settings.download_captions = True
+        output_file = settings.get_source_storage_path(1) / "test123.mp4"
+        output_file.write_bytes(b"fake video")
+        captions = settings.get_source_storage_path(1) / "test123.en.srv3"
+        captions.write_text("<timedtext/>")
+        info = {"id": "test123", "title": "Test"}
+
+        mock_ydl = MagicMock()
+        mock_ydl.__enter__ = MagicMock(return_value=mock_ydl)
+        mock_ydl.__exit__ = MagicMock(return_value=False)
+        mock_ydl.extract_info.return_value = info
+        mock_ydl.prepare_filename.return_value = str(output_file)
+        mock_ydl.process_ie_result.return_value = {
+            **info,
+            "requested_subtitles": {"en": {"ext": "srv3", "filepath": str(captions)}},
+        }
+        mock_ydl_class.return_value = mock_ydl
+
+        ContentDownloader(settings).download("https://youtube.com/watch?v=test", 1)
+
+        mock_ydl.extract_info.assert_called_once()
+        assert mock_ydl.process_ie_result.call_args == ((info,), {"download": True})
+        assert mock_ydl_class.call_args_list[1][0][0]["skip_download"] is True
+
+    @patch("src.ingestion.downloader.yt_dlp.YoutubeDL")
+    @patch("src.ingestion.downloader.validate_url", return_value="https://youtube.com/watch?v=test")
+    def test_failure_is_not_raised(self, mock_validate, mock_ydl_class, settings):
+        import yt_dlp
+
+        from src.ingestion.downloader import ContentDownloader
+
+        mock_ydl_class.return_value.__enter__.return_value.extract_info.side_effect = (
+            yt_dlp.utils.DownloadError("no subtitles")
+        )
+
+        assert ContentDownloader(settings).download_captions("https://youtube.com/watch?v=test", 1) is None
@@ -1,61 +1,64 @@
-import subprocess
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.exceptions import TranscriptionError
 
+class TestAlignModelCache:
+    @pytest.fixture
+    def fake_whisperx(self, monkeypatch):
+        import sys
 
-class TestExtractAudio:
-    def _make_transcriber(self, settings):
-        from src.ingestion.transcriber import WhisperXTranscriber
+        fake = MagicMock()
+        fake.load_align_model.side_effect = lambda language_code, device: (
+            f"model-{language_code}", f"meta-{language_code}"
+        )
+        monkeypatch.setitem(sys.modules, "whisperx", fake)
+        return fake
+
+    def _make_transcriber(self, settings, budget_models):
+        from src.ingestion.transcriber import DEFAULT_ALIGN_MODEL_BYTES, WhisperXTranscriber
 
+        settings.align_model_cache_max_bytes = budget_models * DEFAULT_ALIGN_MODEL_BYTES
         return WhisperXTranscriber(settings)
 
-    @patch("src.ingestion.transcriber.subprocess.run")
-    def test_success(self, mock_run, settings, tmp_path):
-        mock_run.return_value = MagicMock(returncode=0, stdout=b"", stderr=b"")
-        transcriber = self._make_transcriber(settings)
+    def test_same_language_loads_once(self, settings, fake_whisperx):
+        transcriber = self._make_transcriber(settings, budget_models=2)
 
-        video = tmp_path / "test.mp4"
-        video.write_bytes(b"fake")
+        first = transcriber._load_align_model("en")
+        second = transcriber._load_align_model("en")
 
-        result = transcriber._extract_audio(video)
-        assert result == video.with_suffix(".wav")
-        mock_run.assert_called_once()
+        assert first == second == ("model-en", "meta-en")
+        assert fake_whisperx.load_align_model.call_count == 1
+        assert transcriber.align_languages == ["en"]
 
-    def test_already_extracted(self, settings, tmp_path):
-        transcriber = self._make_transcriber(settings)
+    def test_evicts_least_recently_used(self, settings, fake_whisperx):
+        transcriber = self._make_transcriber(settings, budget_models=2)
 
-        video = tmp_path / "test.mp4"
-        video.write_bytes(b"fake")
-        wav = tmp_path / "test.wav"
-        wav.write_bytes(b"existing audio")
+        transcriber._load_align_model("en")
+        transcriber._load_align_model("de")
+        transcriber._load_align_model("en")
+        transcriber._load_align_model("fr")
 
-        result = transcriber._extract_audio(video)
-        assert result == wav
+        assert transcriber.align_languages == ["en", "fr"]
+        assert set(transcriber._align_metadata) == {("en", "cpu"), ("fr", "cpu")}
 
-    @patch("src.ingestion.transcriber.subprocess.run")
-    def test_ffmpeg_failure(self, mock_run, settings, tmp_path):
-        mock_run.return_value = MagicMock(
-            returncode=1, stdout=b"", stderr=b"ffmpeg error"
-        )
-        transcriber = self._make_transcriber(settings)
+    def test_zero_budget_never_caches(self, settings, fake_whisperx):
+        transcriber = self._make_transcriber(settings, budget_models=0)
 
-        video = tmp_path / "test.mp4"
-        video.write_bytes(b"fake")
+        transcriber._load_align_model("en")
+        transcriber._load_align_model("en")
 
-        with pytest.raises(TranscriptionError, match="Audio extraction failed"):
-            transcriber._extract_audio(video)
+        assert fake_whisperx.load_align_model.call_count == 2
+        assert transcriber.align_languages == []
 
-    @patch("src.ingestion.transcriber.subprocess.run")
-    def test_timeout(self, mock_run, settings, tmp_path):
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd=["ffmpeg"], timeout=600)
-        transcriber = self._make_transcriber(settings)
+    def test_measures_torch_models(self):
+        from src.ingestion.transcriber import _model_bytes
 
-        video = tmp_path / "test.mp4"
-        video.write_bytes(b"fake")
+        tensor = MagicMock()
+        tensor.numel.return_value = 1000
+        tensor.element_size.return_value = 4
+        model = MagicMock()
+        model.parameters.return_value = [tensor, tensor]
+        model.buffers.return_value = [tensor]
 
-        with pytest.raises(TranscriptionError, match="timed out"):
-            transcriber._extract_audio(video)
+        assert _model_bytes(model) == 12_000
@@ -0,0 +1,80 @@
+from array import array
+from unittest.mock import MagicMock, patch
+
+from src.ingestion.transcript_cache import TranscriptCache, audio_fingerprint
+
+
+def _audio(values, length=3200):
+    return array("f", (values[i % len(values)] for i in range(length)))
+
+
+class TestAudioFingerprint:
+    def test_identical_audio_matches(self):
+        assert audio_fingerprint(_audio([0.1, 0.2])) == audio_fingerprint(_audio([0.1, 0.2]))
+
+    def test_content_and_length_change_it(self):
+        base = audio_fingerprint(_audio([0.1, 0.2, 0.3]))
+
+        assert audio_fingerprint(_audio([0.1, 0.2, 0.4])) != base
+        assert audio_fingerprint(_audio([0.1, 0.2, 0.3], length=3216)) != base
+
+
+class TestTranscriptCache:
+    def test_round_trip_per_model(self, tmp_path, sample_transcript):
+        cache = TranscriptCache(tmp_path / "t.sqlite3", max_bytes=10**6)
+
+        cache.put("fp", "base", "int8", sample_transcript)
+
+        assert cache.get("fp", "base", "int8") == sample_transcript
+        assert cache.get("fp", "large-v3", "int8") is None
+        assert cache.get("fp", "base", "float16") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_evicts_least_recently_used(self, tmp_path, sample_transcript):
+        cache = TranscriptCache(tmp_path / "t.sqlite3", max_bytes=10**6)
+        cache.put("a", "base", "int8", sample_transcript)
+        entry_size = cache.total_bytes
+        cache.max_bytes = entry_size * 2
+
+        cache.put("b", "base", "int8", sample_transcript)
+        cache.get("a", "base", "int8")
+        cache.put("c", "base", "int8", sample_transcript)
+
+        assert cache.get("a", "base", "int8") is not None
+        assert cache.get("b", "base", "int8") is None
+        assert cache.get("c", "base", "int8") is not None
+        assert cache.total_bytes <= cache.max_bytes
+
+
+class TestTranscriberUsesCache:
+    def test_hit_skips_model(self, settings, sample_transcript):
+        from src.ingestion.transcriber import WhisperXTranscriber
+
+        transcriber = WhisperXTranscriber(settings)
+        transcriber.load_audio = MagicMock(return_value=_audio([0.5, -0.5]))
+
+        with patch.object(
+            WhisperXTranscriber, "_transcribe_audio", return_value=sample_transcript
+        ) as run_model:
+            first = transcriber.transcribe(settings.storage_base_path / "a.mp4")
+            second = transcriber.transcribe(settings.storage_base_path / "renamed.mp4")
+
+        assert run_model.call_count == 1
+        assert first == second
+        assert transcriber._model is None
+
+    def test_disabled(self, settings, sample_transcript):
+        from src.ingestion.transcriber import WhisperXTranscriber
+
+        settings.transcript_cache_enabled = False
+        transcriber = WhisperXTranscriber(settings)
+        transcriber.load_audio = MagicMock(return_value=_audio([0.5]))
+
+        with patch.object(
+            WhisperXTranscriber, "_transcribe_audio", return_value=sample_transcript
+        ) as run_model:
+            transcriber.transcribe(settings.storage_base_path / "a.mp4")
+            transcriber.transcribe(settings.storage_base_path / "a.mp4")
+
+        assert run_model.call_count == 2
+        assert not settings.get_transcript_cache_path().exists()
@@ -0,0 +1,112 @@
+import random
+
+from src.ingestion.compact_transcript import CompactTranscript
+from src.ingestion.transcript_index import TranscriptIndex, get_transcript_index
+
+
+def _scan_words(transcript, start_time, end_time):
+    return [
+        w
+        for s in transcript.get("segments", [])
+        for w in s.get("words", [])
+        if w.get("end", 0) >= start_time and w.get("start", 0) <= end_time
+    ]
+
+
+def _scan_segments(transcript, start_time, end_time):
+    return [
+        s
+        for s in transcript.get("segments", [])
+        if s.get("end", 0) >= start_time and s.get("start", 0) <= end_time
+    ]
+
+
+def _random_transcript(seed, segments=50):
+    rng = random.Random(seed)
+    t = 0.0
+    result = []
+    for n in range(segments):
+        words = []
+        for i in range(rng.randint(0, 8)):
+            start = t + rng.uniform(-0.5, 0.5)
+            end = start + rng.uniform(0.0, 2.0)
+            word = {"word": f"w{n}_{i}", "start": start, "end": end}
+            if rng.random() < 0.05:
+                del word["start"], word["end"]
+            words.append(word)
+            t += rng.uniform(0.1, 0.6)
+        result.append({"start": t - 3, "end": t, "text": f"seg {n}", "words": words})
+    return {"segments": result}
+
+
+class TestTranscriptIndex:
+    def test_words_in_range(self, sample_transcript):
+        index = TranscriptIndex(sample_transcript)
+        assert index.words_in_range(0.0, 10.0) == _scan_words(sample_transcript, 0.0, 10.0)
+        assert index.words_in_range(100.0, 200.0) == []
+
+    def test_matches_linear_scan(self):
+        for seed in range(20):
+            transcript = _random_transcript(seed)
+            index = TranscriptIndex(transcript)
+            rng = random.Random(seed)
+            for _ in range(20):
+                start = rng.uniform(-5, 120)
+                end = start + rng.uniform(0, 40)
+                assert index.words_in_range(start, end) == _scan_words(transcript, start, end)
+                assert index.segments_in_range(start, end) == _scan_segments(
+                    transcript, start, end
+                )
+
+    def test_compact_transcript_matches_dict(self):
+        for seed in range(10):
+            transcript = _random_transcript(seed)
+            compact = CompactTranscript.from_dict(transcript)
+            index = TranscriptIndex(compact)
+            assert index.words == [] and index.segments == []
+            rng = random.Random(seed)
+            for _ in range(20):
+                start = rng.uniform(-5, 120)
+                end = start + rng.uniform(0, 40)
+                assert index.words_in_range(start, end) == _scan_words(transcript, start, end)
+                assert compact.segments_in_range(start, end) == _scan_segments(
+                    transcript, start, end
+                )
+
+    def test_unsorted_and_overlapping_words(self):
+        transcript = {"segments": [{"start": 0, "end": 10, "words": [
+            {"word": "late", "start": 5.0, "end": 6.0},
+            {"word": "long", "start": 0.0, "end": 9.0},
+            {"word": "early", "start": 1.0, "end": 1.5},
+        ]}]}
+        index = TranscriptIndex(transcript)
+        assert [w["word"] for w in index.words_in_range(7.0, 8.0)] == ["long"]
+        assert [w["word"] for w in index.words_in_range(1.2, 5.5)] == ["late", "long", "early"]
+
+    def test_empty(self):
+        index = TranscriptIndex({})
+        assert index.words_in_range(0.0, 10.0) == []
+        assert index.segments_in_range(0.0, 10.0) == []
+
+
+class TestGetTranscriptIndex:
+    def test_cached_per_object(self, sample_transcript):
+        assert get_transcript_index(sample_transcript) is get_transcript_index(sample_transcript)
+
+    def test_cached_per_key_across_objects(self, sample_transcript):
+        import copy
+
+        first = get_transcript_index(sample_transcript, key="source-1")
+        again = get_transcript_index(copy.deepcopy(sample_transcript), key="source-1")
+        assert again is first
+
+    def test_changed_transcript_rebuilds(self, sample_transcript):
+        first = get_transcript_index(sample_transcript, key="source-2")
+        changed = {"segments": sample_transcript["segments"][:1]}
+        assert get_transcript_index(changed, key="source-2") is not first
+
+    def test_compact_cached_per_key(self, sample_transcript):
+        compact = CompactTranscript.from_dict(sample_transcript)
+        first = get_transcript_index(compact, key="source-3")
+        again = get_transcript_index(CompactTranscript.from_dict(sample_transcript), key="source-3")
+        assert again is first
@@ -0,0 +1,129 @@
+from concurrent.futures import Future
+
+from src.ingestion import transcription_benchmark
+from src.ingestion.transcription_benchmark import (
+    BenchmarkReport,
+    BenchmarkResult,
+    benchmark_matrix,
+    compare_to_baseline,
+    format_table,
+    run_benchmark,
+)
+
+
+def _report(rtf, fixture="abc", error=None):
+    result = BenchmarkResult(
+        key="base/int8/b16/c1",
+        model="base",
+        compute_type="int8",
+        batch_size=16,
+        concurrency=1,
+        audio_seconds=30,
+        model_load_seconds=12.5,
+        asr_seconds=6.0,
+        align_seconds=1.5,
+        wall_seconds=7.5,
+        rtf=rtf,
+        peak_rss_bytes=900 * 1024**2,
+        error=error,
+    )
+    return BenchmarkReport(created_at="2026-01-01T00:00:00+00:00", host={}, fixture=fixture, results=[result])
+
+
+class TestBenchmarkMatrix:
+    def test_every_combination_in_stable_order(self):
+        configs = benchmark_matrix(["base", "small"], ["int8"], [8, 16], [1])
+
+        assert [c.key for c in configs] == [
+            "base/int8/b8/c1",
+            "base/int8/b16/c1",
+            "small/int8/b8/c1",
+            "small/int8/b16/c1",
+        ]
+
+
+class TestReportOutput:
+    def test_table_row(self):
+        table = format_table(_report(0.25))
+
+        row = table.splitlines()[2]
+        assert row.startswith("base/int8/b16/c1")
+        assert "0.250" in row
+        assert "900" in row
+
+    def test_failed_rows_show_error(self):
+        assert "failed: unsupported compute type" in format_table(
+            _report(0.0, error="unsupported compute type")
+        )
+
+    def test_json_round_trip(self):
+        report = _report(0.25)
+
+        assert BenchmarkReport.model_validate_json(report.model_dump_json()) == report
+
+
+class TestCompareToBaseline:
+    def test_reports_rtf_change(self):
+        lines = compare_to_baseline(_report(0.3), _report(0.25))
+
+        assert lines == ["base/int8/b16/c1                30s rtf 0.250 -> 0.300 (+20.0%)"]
+
+    def test_different_fixture_is_not_comparable(self):
+        lines = compare_to_baseline(_report(0.3), _report(0.25, fixture="other"))
+
+        assert "not comparable" in lines[0]
+
+
+class _InlinePool:
+    """ProcessPoolExecutor stand-in that counts pools and runs jobs inline."""
+
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class TestRunBenchmark:
+    def test_one_process_per_fixture(self, settings, monkeypatch):
+        calls = []
+
+        def fake_run_fixture(config_settings, config, seconds, audio):
+            calls.append((config.key, seconds, config_settings))
+            if seconds == 120:
+                raise RuntimeError("out of memory")
+            return BenchmarkResult(
+                key=config.key, **config.model_dump(), audio_seconds=seconds,
+                peak_rss_bytes=seconds * 1024**2,
+            )
+
+        _InlinePool.created = 0
+        monkeypatch.setattr(transcription_benchmark, "ProcessPoolExecutor", _InlinePool)
+        monkeypatch.setattr(transcription_benchmark, "_run_fixture", fake_run_fixture)
+        monkeypatch.setattr(transcription_benchmark, "fixture_audio", lambda seconds, source=None: [0.0])
+        monkeypatch.setattr(transcription_benchmark, "audio_fingerprint", lambda audio: "abc")
+        monkeypatch.setattr(transcription_benchmark, "host_info", lambda: {})
+
+        configs = benchmark_matrix(["base"], ["int8"], [16], [2])
+        report = run_benchmark(settings, configs, [30, 120])
+
+        assert _InlinePool.created == 2
+        assert [r.peak_rss_bytes for r in report.results] == [30 * 1024**2, 0]
+        assert report.results[1].error == "out of memory"
+        config_settings = calls[0][2]
+        assert config_settings.max_concurrent_transcriptions == 2
+        # Whole-file jobs only: the longest fixture stays under the chunking threshold
+        assert config_settings.transcription_chunk_threshold_seconds > 120
@@ -0,0 +1,195 @@
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.exceptions import TranscriptionError
+from src.ingestion.transcriber import WhisperXTranscriber
+from src.ingestion.transcription_server import (
+    TranscriptionClient,
+    TranscriptionServer,
+    get_transcriber,
+)
+
+
+class FakeTranscriber:
+    """Stands in for a WhisperXTranscriber with its models loaded."""
+
+    def __init__(self):
+        self.model_loaded = False
+        self.align_languages: list[str] = []
+        self.calls: list[Path] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def preload(self, language="en"):
+        self.model_loaded = True
+        self.align_languages = [language]
+
+    def transcribe(self, video_path):
+        self.release.wait(5)
+        self.calls.append(video_path)
+        if video_path.name == "broken.mp4":
+            raise TranscriptionError("Failed to load audio: broken")
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": video_path.stem}], "language": "en"}
+
+
+@pytest.fixture
+def server_settings(settings):
+    # Unix socket paths are limited to ~100 bytes, so keep it short
+    socket_dir = Path(tempfile.mkdtemp(prefix="vc"))
+    settings.transcription_socket_path = socket_dir / "t.sock"
+    yield settings
+    settings.transcription_socket_path.unlink(missing_ok=True)
+    socket_dir.rmdir()
+
+
+@pytest.fixture
+def running_server(server_settings):
+    fake = FakeTranscriber()
+    server = TranscriptionServer(server_settings, transcriber=fake)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = TranscriptionClient(server.socket_path, timeout=10)
+    for _ in range(100):
+        if client.is_available():
+            break
+        threading.Event().wait(0.02)
+    yield server, fake, client
+    fake.release.set()
+    server.shutdown()
+    thread.join(5)
+
+
+class TestTranscriptionServer:
+    def test_transcribes_through_socket(self, running_server, tmp_path):
+        server, fake, client = running_server
+
+        result = client.transcribe(tmp_path / "talk.mp4")
+
+        assert result["segments"][0]["text"] == "talk"
+        assert fake.calls == [(tmp_path / "talk.mp4").resolve()]
+        assert client.status().jobs_completed == 1
+
+    def test_status_reports_preloaded_models(self, running_server):
+        _, _, client = running_server
+
+        status = client.status()
+
+        assert status.model_loaded is True
+        assert status.align_languages == ["en"]
+        assert status.queue_depth == 0
+
+    def test_failure_is_raised_on_client(self, running_server, tmp_path):
+        _, _, client = running_server
+
+        with pytest.raises(TranscriptionError, match="broken"):
+            client.transcribe(tmp_path / "broken.mp4")
+        assert client.status().jobs_failed == 1
+
+    def test_queue_depth_counts_waiting_jobs(self, running_server, tmp_path):
+        server, fake, client = running_server
+        fake.release.clear()
+
+        threads = [
+            threading.Thread(target=client.transcribe, args=(tmp_path / f"v{i}.mp4",))
+            for i in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for _ in range(100):
+            status = client.status()
+            if status.active_jobs + status.queue_depth == 3:
+                break
+            threading.Event().wait(0.02)
+
+        # One worker (max_concurrent_transcriptions=1): one runs, two wait
+        assert status.active_jobs == 1
+        assert status.queue_depth == 2
+
+        fake.release.set()
+        for t in threads:
+            t.join(5)
+        assert len(fake.calls) == 3
+
+    def test_refuses_second_server_on_same_socket(self, running_server, server_settings):
+        second = TranscriptionServer(server_settings, transcriber=FakeTranscriber())
+
+        with pytest.raises(TranscriptionError, match="already running"):
+            second.start()
+
+    def test_replaces_stale_socket_file(self, server_settings):
+        server_settings.transcription_socket_path.write_bytes(b"")
+        server = TranscriptionServer(server_settings, transcriber=FakeTranscriber())
+
+        server.start()
+        try:
+            assert TranscriptionClient(server.socket_path).is_available()
+        finally:
+            server.close()
+        assert not server.socket_path.exists()
+
+    def test_close_fails_queued_jobs(self, server_settings, tmp_path):
+        fake = FakeTranscriber()
+        fake.release.clear()
+        server = TranscriptionServer(server_settings, transcriber=fake)
+        server.start()
+        client = TranscriptionClient(server.socket_path, timeout=30)
+        errors = {}
+
+        def transcribe(name):
+            try:
+                client.transcribe(tmp_path / name)
+            except TranscriptionError as e:
+                errors[name] = str(e)
+
+        threads = [
+            threading.Thread(target=transcribe, args=(f"v{i}.mp4",)) for i in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for _ in range(100):
+            status = server.status()
+            if status.active_jobs == 1 and status.queue_depth == 2:
+                break
+            threading.Event().wait(0.02)
+
+        try:
+            server.close()
+            # Both waiting jobs are answered at once, not at the client timeout
+            for _ in range(100):
+                if len(errors) == 2:
+                    break
+                threading.Event().wait(0.02)
+            assert len(errors) == 2
+            assert all("shut down" in e for e in errors.values())
+        finally:
+            fake.release.set()
+            for t in threads:
+                t.join(5)
+        assert len(fake.calls) == 1
+
+    def test_rejects_jobs_while_closing(self, server_settings, tmp_path):
+        server = TranscriptionServer(server_settings, transcriber=FakeTranscriber())
+        server._fail_queued_jobs("closing")
+
+        response = server.handle_request({"op": "transcribe", "path": str(tmp_path / "a.mp4")})
+
+        assert response == {"ok": False, "error": "Transcription server is shutting down"}
+
+
+class TestGetTranscriber:
+    def test_uses_server_when_running(self, running_server, server_settings):
+        assert isinstance(get_transcriber(server_settings), TranscriptionClient)
+
+    def test_falls_back_to_local(self, server_settings):
+        local = WhisperXTranscriber(server_settings)
+
+        assert get_transcriber(server_settings, local=local) is local
+
+    def test_disabled(self, running_server, server_settings):
+        server_settings.transcription_server_enabled = False
+
+        assert isinstance(get_transcriber(server_settings), WhisperXTranscriber)
+
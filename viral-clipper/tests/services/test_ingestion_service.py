@@ -30,6 +30,27 @@ class TestAddSourceFromUrl:
             add_source_from_url(999, "https://youtube.com/watch?v=abc")
 
 
+class TestAddSourceFromFile:
+    @patch("src.tasks.ingestion_tasks.prepare_source_media")
+    @patch("src.tasks.ingestion_tasks.transcribe_source")
+    def test_enqueues_transcription_and_media_prep(self, mock_transcribe, mock_prepare, mock_db_session):
+        mock_transcribe.send = MagicMock()
+        mock_prepare.send = MagicMock()
+
+        client = Client(name="Test")
+        mock_db_session.add(client)
+        mock_db_session.flush()
+
+        from src.services.ingestion_service import add_source_from_file
+
+        source_id = add_source_from_file(client.id, "/tmp/video.mp4", "Video", 60.0)
+
+        source = mock_db_session.query(Source).filter_by(id=source_id).first()
+        assert source.status == SourceStatus.TRANSCRIBING
+        mock_transcribe.send.assert_called_once_with(source_id)
+        mock_prepare.send.assert_called_once_with(source_id)
+
+
 class TestGetClientSources:
     def test_returns_sources(self, mock_db_session):
         client = Client(name="Test")
@@ -53,3 +74,5 @@ class TestGetClientSources:
         assert len(result) == 1
         assert result[0]["title"] == "Test Video"
         assert result[0]["status"] == "ready"
+        assert result[0]["has_transcript"] is False
+        assert result[0]["transcript_size"] is None
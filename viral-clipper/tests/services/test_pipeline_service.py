@@ -0,0 +1,51 @@
+import os
+from unittest.mock import MagicMock
+
+from src.services.pipeline_service import PipelineService
+
+
+class TestMediaPath:
+    def _video(self, tmp_path):
+        video = tmp_path / "talk.mp4"
+        video.write_bytes(b"\x00" * 16)
+        return video
+
+    def test_disabled_uses_original(self, settings, tmp_path):
+        settings.mezzanine_enabled = False
+        video = self._video(tmp_path)
+        ffmpeg = MagicMock()
+
+        assert PipelineService(settings)._media_path(video, ffmpeg) == video
+        ffmpeg.transcode_mezzanine.assert_not_called()
+
+    def test_transcodes_mezzanine(self, settings, tmp_path):
+        settings.mezzanine_enabled = True
+        video = self._video(tmp_path)
+        ffmpeg = MagicMock()
+        ffmpeg.transcode_mezzanine.side_effect = lambda src, out: out
+
+        media = PipelineService(settings)._media_path(video, ffmpeg)
+
+        assert media == tmp_path / "talk.mezzanine.mp4"
+        ffmpeg.transcode_mezzanine.assert_called_once_with(video, media)
+
+    def test_reuses_fresh_mezzanine(self, settings, tmp_path):
+        settings.mezzanine_enabled = True
+        video = self._video(tmp_path)
+        mezzanine = tmp_path / "talk.mezzanine.mp4"
+        mezzanine.write_bytes(b"\x00" * 16)
+        os.utime(video, (1000, 1000))
+        ffmpeg = MagicMock()
+
+        assert PipelineService(settings)._media_path(video, ffmpeg) == mezzanine
+        ffmpeg.transcode_mezzanine.assert_not_called()
+
+    def test_failed_transcode_falls_back(self, settings, tmp_path):
+        from src.exceptions import FFmpegError
+
+        settings.mezzanine_enabled = True
+        video = self._video(tmp_path)
+        ffmpeg = MagicMock()
+        ffmpeg.transcode_mezzanine.side_effect = FFmpegError("boom")
+
+        assert PipelineService(settings)._media_path(video, ffmpeg) == video
@@ -6,7 +6,7 @@ from src.models.content import ClipMoment, MomentStatus
 
 
 class TestDetectMomentsTask:
-    @patch("src.tasks.clipper_tasks.generate_clip")
+    @patch("src.tasks.clipper_tasks.generate_source_clips")
     @patch("src.tasks.ai_tasks.MomentDetector")
     @patch("src.tasks.ai_tasks.get_settings")
     def test_creates_clip_moments(self, mock_settings, mock_detector_class, mock_gen_clip, mock_db_session, settings):
@@ -48,6 +48,7 @@ class TestDetectMomentsTask:
         moments = mock_db_session.query(ClipMoment).filter_by(source_id=source.id).all()
         assert len(moments) == 1
         assert moments[0].viral_score == 90
+        mock_gen_clip.send.assert_called_once_with(source.id)
 
     @patch("src.tasks.ai_tasks.get_settings")
     def test_source_not_ready_returns(self, mock_settings, mock_db_session, settings):
@@ -1,4 +1,14 @@
-from src.tasks.clipper_tasks import _extract_words_for_range
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.client import Client, Source, SourceStatus
+from src.models.content import ClipMoment, GeneratedClip, MomentStatus
+from src.tasks.clipper_tasks import (
+    _extract_words_for_range,
+    _record_generated_clip,
+    generate_source_clips,
+)
 
 
 class TestExtractWordsForRange:
@@ -28,3 +38,188 @@ class TestExtractWordsForRange:
         transcript = {"segments": [{"start": 0, "end": 5, "text": "hello"}]}
         words = _extract_words_for_range(transcript, 0.0, 5.0)
         assert words == []
+
+
+class TestRecordGeneratedClip:
+    def _moment(self):
+        return MagicMock(id=7, client_id=1, start_time=10.0, end_time=40.0)
+
+    def test_records_variation_number(self, tmp_path):
+        session = MagicMock()
+        ffmpeg = MagicMock()
+        ffmpeg.validate_clip.return_value = {"passed": True, "issues": [], "duration": 30.0}
+        moment = self._moment()
+
+        generated = _record_generated_clip(
+            session, ffmpeg, moment, tmp_path / "clip_7_v2.mp4", variation_number=2
+        )
+
+        assert generated.variation_number == 2
+        assert generated.file_path == str(tmp_path / "clip_7_v2.mp4")
+        session.add.assert_called_once_with(generated)
+        assert moment.status == MomentStatus.READY
+
+    def test_defaults_to_first_variation(self, tmp_path):
+        ffmpeg = MagicMock()
+        ffmpeg.validate_clip.return_value = {"passed": False, "issues": ["short"]}
+
+        generated = _record_generated_clip(
+            MagicMock(), ffmpeg, self._moment(), tmp_path / "clip_7_final.mp4"
+        )
+
+        assert generated.variation_number == 1
+        assert generated.duration == 30.0
+        assert generated.quality_check_passed is False
+
+    def test_uses_precomputed_validation(self, tmp_path):
+        ffmpeg = MagicMock()
+
+        generated = _record_generated_clip(
+            MagicMock(),
+            ffmpeg,
+            self._moment(),
+            tmp_path / "clip_7_final.mp4",
+            validation={"passed": True, "issues": [], "duration": 29.5},
+        )
+
+        ffmpeg.validate_clip.assert_not_called()
+        assert generated.duration == 29.5
+
+    def test_records_hook_text(self, tmp_path):
+        ffmpeg = MagicMock()
+        ffmpeg.validate_clip.return_value = {"passed": True, "issues": []}
+        moment = self._moment()
+        moment.hook_text = "Moment hook"
+
+        default = _record_generated_clip(MagicMock(), ffmpeg, moment, tmp_path / "a.mp4")
+        variant = _record_generated_clip(
+            MagicMock(), ffmpeg, moment, tmp_path / "b.mp4", hook_text="Variant hook"
+        )
+
+        assert default.hook_text == "Moment hook"
+        assert variant.hook_text == "Variant hook"
+
+
+class TestGenerateSourceClips:
+    @pytest.fixture
+    def source(self, mock_db_session, sample_transcript, tmp_path):
+        media = tmp_path / "source.mp4"
+        media.write_bytes(b"video")
+        client = Client(name="Test")
+        mock_db_session.add(client)
+        mock_db_session.flush()
+        source = Source(
+            client_id=client.id,
+            file_path=str(media),
+            title="Test",
+            duration_seconds=10.0,
+            status=SourceStatus.READY,
+            transcript_json=sample_transcript,
+        )
+        mock_db_session.add(source)
+        mock_db_session.flush()
+        for start in (0.0, 5.0):
+            mock_db_session.add(ClipMoment(
+                source_id=source.id,
+                client_id=client.id,
+                start_time=start,
+                end_time=start + 4.0,
+                viral_score=80,
+                hook_text=f"Hook at {start:.0f}",
+                caption_text="caption",
+                reasoning="reasons",
+            ))
+        mock_db_session.flush()
+        return source
+
+    @pytest.fixture
+    def ffmpeg(self):
+        def render_batch(plans, output_paths, **kwargs):
+            return [
+                {
+                    "success": True,
+                    "output_path": str(path),
+                    "error": None,
+                    "validation": {"passed": True, "issues": [], "duration": 4.0},
+                }
+                for path in output_paths
+            ]
+
+        ffmpeg = MagicMock()
+        ffmpeg.render_batch.side_effect = render_batch
+        with patch("src.tasks.clipper_tasks.FFmpegService", return_value=ffmpeg), \
+                patch("src.tasks.clipper_tasks.ProfanityFilter") as profanity:
+            profanity.return_value.detect_profanity.return_value = []
+            yield ffmpeg
+
+    @patch("src.tasks.clipper_tasks.generate_hook_variants")
+    @patch("src.tasks.clipper_tasks.get_settings")
+    def test_records_clips_with_hook_text(
+        self, mock_settings, mock_variants, settings, source, ffmpeg, mock_db_session
+    ):
+        mock_settings.return_value = settings
+
+        generate_source_clips(source.id)
+
+        clips = mock_db_session.query(GeneratedClip).order_by(GeneratedClip.moment_id).all()
+        assert [c.hook_text for c in clips] == ["Hook at 0", "Hook at 5"]
+        mock_variants.send.assert_not_called()
+
+    @patch("src.tasks.clipper_tasks.generate_hook_variants")
+    @patch("src.tasks.clipper_tasks.get_settings")
+    def test_enqueues_hook_variants(
+        self, mock_settings, mock_variants, settings, source, ffmpeg, mock_db_session
+    ):
+        settings.hook_variants_per_clip = 3
+        mock_settings.return_value = settings
+
+        generate_source_clips(source.id)
+
+        moment_ids = [m.id for m in mock_db_session.query(ClipMoment).all()]
+        assert sorted(c.args for c in mock_variants.send.call_args_list) == sorted(
+            (moment_id, 2) for moment_id in moment_ids
+        )
+
+    @patch("src.tasks.clipper_tasks.generate_hook_variants")
+    @patch("src.tasks.clipper_tasks.get_settings")
+    def test_caption_failure_fails_only_its_moment(
+        self, mock_settings, mock_variants, settings, source, ffmpeg, mock_db_session
+    ):
+        mock_settings.return_value = settings
+        from src.tasks import clipper_tasks
+
+        real_captions = clipper_tasks.generate_ass_captions
+
+        def captions(words, output_path, clip_start_time):
+            if clip_start_time == 5.0:
+                raise ValueError("bad caption")
+            return real_captions(words, output_path, clip_start_time=clip_start_time)
+
+        with patch("src.tasks.clipper_tasks.generate_ass_captions", side_effect=captions):
+            generate_source_clips(source.id)
+
+        moments = mock_db_session.query(ClipMoment).order_by(ClipMoment.start_time).all()
+        assert [m.status for m in moments] == [MomentStatus.READY, MomentStatus.FAILED]
+        plans = ffmpeg.render_batch.call_args[0][0]
+        assert [p.start_time for p in plans] == [0.0]
+        assert mock_db_session.query(GeneratedClip).count() == 1
+
+    @patch("src.tasks.clipper_tasks._record_generated_clip")
+    @patch("src.tasks.clipper_tasks.generate_hook_variants")
+    @patch("src.tasks.clipper_tasks.get_settings")
+    def test_record_failure_fails_only_its_moment(
+        self, mock_settings, mock_variants, mock_record, settings, source, ffmpeg, mock_db_session
+    ):
+        mock_settings.return_value = settings
+
+        def record(session, ffmpeg, moment, path, validation):
+            if moment.start_time == 0.0:
+                raise RuntimeError("disk full")
+            moment.status = MomentStatus.READY
+
+        mock_record.side_effect = record
+
+        generate_source_clips(source.id)
+
+        moments = mock_db_session.query(ClipMoment).order_by(ClipMoment.start_time).all()
+        assert [m.status for m in moments] == [MomentStatus.FAILED, MomentStatus.READY]
@@ -5,12 +5,14 @@ from src.models.client import Client, Source, SourceStatus
 
 
 class TestDownloadSource:
+    @patch("src.tasks.ingestion_tasks.prepare_source_media")
     @patch("src.tasks.ingestion_tasks.transcribe_source")
     @patch("src.tasks.ingestion_tasks.ContentDownloader")
     @patch("src.tasks.ingestion_tasks.get_settings")
-    def test_happy_path(self, mock_settings, mock_dl_class, mock_transcribe, mock_db_session, settings, tmp_path):
+    def test_happy_path(self, mock_settings, mock_dl_class, mock_transcribe, mock_prepare, mock_db_session, settings, tmp_path):
         mock_settings.return_value = settings
         mock_transcribe.send = MagicMock()
+        mock_prepare.send = MagicMock()
 
         client = Client(name="Test")
         mock_db_session.add(client)
@@ -39,6 +41,8 @@ class TestDownloadSource:
         mock_db_session.refresh(source)
         assert source.status == SourceStatus.TRANSCRIBING
         assert source.title == "Test Video"
+        mock_transcribe.send.assert_called_once_with(source.id)
+        mock_prepare.send.assert_called_once_with(source.id)
 
     @patch("src.tasks.ingestion_tasks.get_settings")
     def test_not_found(self, mock_settings, mock_db_session, settings):
@@ -81,3 +85,102 @@ class TestDownloadSource:
 
         mock_db_session.refresh(source)
         assert source.status == SourceStatus.FAILED
+
+
+class TestPrepareMedia:
+    @patch("src.tasks.ingestion_tasks.FFmpegService")
+    @patch("src.tasks.ingestion_tasks.get_settings")
+    def test_mezzanine_enabled(self, mock_settings, mock_ffmpeg_class, settings, tmp_path):
+        settings.mezzanine_enabled = True
+        mock_settings.return_value = settings
+        mock_ffmpeg = MagicMock()
+        mock_ffmpeg.transcode_mezzanine.return_value = tmp_path / "src.mezzanine.mp4"
+        mock_ffmpeg_class.return_value = mock_ffmpeg
+
+        source = Source(client_id=1, file_path=str(tmp_path / "src.mp4"), title="t", duration_seconds=0)
+
+        from src.tasks.ingestion_tasks import _prepare_media
+
+        _prepare_media(source)
+
+        assert source.mezzanine_path == str(tmp_path / "src.mezzanine.mp4")
+        mock_ffmpeg.get_keyframe_index.assert_called_once_with(tmp_path / "src.mezzanine.mp4")
+
+    @patch("src.tasks.ingestion_tasks.FFmpegService")
+    @patch("src.tasks.ingestion_tasks.get_settings")
+    def test_mezzanine_failure_is_not_fatal(self, mock_settings, mock_ffmpeg_class, settings, tmp_path):
+        from src.exceptions import FFmpegError
+
+        settings.mezzanine_enabled = True
+        mock_settings.return_value = settings
+        mock_ffmpeg = MagicMock()
+        mock_ffmpeg.transcode_mezzanine.side_effect = FFmpegError("boom")
+        mock_ffmpeg_class.return_value = mock_ffmpeg
+
+        source = Source(client_id=1, file_path=str(tmp_path / "src.mp4"), title="t", duration_seconds=0)
+
+        from src.tasks.ingestion_tasks import _prepare_media
+
+        _prepare_media(source)
+
+        assert source.mezzanine_path is None
+        mock_ffmpeg.get_keyframe_index.assert_called_once_with(tmp_path / "src.mp4")
+
+
+class TestPrepareSourceMedia:
+    @patch("src.tasks.ingestion_tasks.FFmpegService")
+    @patch("src.tasks.ingestion_tasks.get_settings")
+    def test_stores_mezzanine_path(self, mock_settings, mock_ffmpeg_class, mock_db_session, settings, tmp_path):
+        settings.mezzanine_enabled = True
+        mock_settings.return_value = settings
+        mock_ffmpeg = MagicMock()
+        mock_ffmpeg.transcode_mezzanine.return_value = tmp_path / "src.mezzanine.mp4"
+        mock_ffmpeg_class.return_value = mock_ffmpeg
+
+        client = Client(name="Test")
+        mock_db_session.add(client)
+        mock_db_session.flush()
+        video = tmp_path / "src.mp4"
+        video.write_bytes(b"\x00")
+        source = Source(
+            client_id=client.id,
+            file_path=str(video),
+            title="t",
+            duration_seconds=0,
+            status=SourceStatus.TRANSCRIBING,
+        )
+        mock_db_session.add(source)
+        mock_db_session.flush()
+
+        from src.tasks.ingestion_tasks import prepare_source_media
+
+        prepare_source_media(source.id)
+
+        mock_db_session.refresh(source)
+        assert source.mezzanine_path == str(tmp_path / "src.mezzanine.mp4")
+        # Transcription owns the status
+        assert source.status == SourceStatus.TRANSCRIBING
+
+    @patch("src.tasks.ingestion_tasks.FFmpegService")
+    @patch("src.tasks.ingestion_tasks.get_settings")
+    def test_missing_file_skipped(self, mock_settings, mock_ffmpeg_class, mock_db_session, settings, tmp_path):
+        mock_settings.return_value = settings
+
+        client = Client(name="Test")
+        mock_db_session.add(client)
+        mock_db_session.flush()
+        source = Source(
+            client_id=client.id,
+            file_path=str(tmp_path / "gone.mp4"),
+            title="t",
+            duration_seconds=0,
+            status=SourceStatus.TRANSCRIBING,
+        )
+        mock_db_session.add(source)
+        mock_db_session.flush()
+
+        from src.tasks.ingestion_tasks import prepare_source_media
+
+        prepare_source_media(source.id)
+
+        mock_ffmpeg_class.assert_not_called()
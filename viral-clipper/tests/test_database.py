@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
-from src.models.client import Client, Source, SourceStatus
+from src.ingestion.compact_transcript import CompactTranscript
+from src.models.client import Client, Source, SourceStatus, SourceTranscript
 from src.models.content import ClipMoment, GeneratedClip, MomentStatus
 from src.models.distribution import (
     Account,
@@ -40,6 +41,24 @@ class TestDatabaseModels:
         loaded = db_session.query(Source).first()
         assert loaded.title == "Test Video"
         assert loaded.status == SourceStatus.PENDING
+        assert loaded.media_path == "/tmp/test.mp4"
+
+    def test_source_media_path_prefers_mezzanine(self, db_session):
+        client = Client(name="Test")
+        db_session.add(client)
+        db_session.flush()
+
+        source = Source(
+            client_id=client.id,
+            file_path="/tmp/test.mp4",
+            mezzanine_path="/tmp/test.mezzanine.mp4",
+            title="Test Video",
+            duration_seconds=120.0,
+        )
+        db_session.add(source)
+        db_session.flush()
+
+        assert db_session.query(Source).first().media_path == "/tmp/test.mezzanine.mp4"
 
     def test_full_chain(self, db_session):
         # Client -> Source -> Moment -> Clip -> Account -> PostJob
@@ -179,3 +198,102 @@ class TestDatabaseModels:
         loaded = db_session.query(Source).first()
         assert loaded.status == SourceStatus.TRANSCRIBING
         assert loaded.status.value == "transcribing"
+
+    def test_transcript_stored_separately(self, db_session, sample_transcript):
+        client = Client(name="Transcript")
+        db_session.add(client)
+        db_session.flush()
+
+        source = Source(
+            client_id=client.id,
+            file_path="/tmp/test.mp4",
+            title="Transcribed",
+            duration_seconds=60.0,
+            transcript_json=sample_transcript,
+        )
+        db_session.add(source)
+        db_session.flush()
+        db_session.expire_all()
+
+        loaded = db_session.query(Source).first()
+        assert loaded.has_transcript
+        assert loaded.transcript_size > 0
+        assert "transcript_record" not in loaded.__dict__
+        assert loaded.transcript_json == sample_transcript
+        assert db_session.query(SourceTranscript).count() == 1
+
+    def test_transcript_compact_access(self, db_session, sample_transcript):
+        client = Client(name="Transcript")
+        db_session.add(client)
+        db_session.flush()
+
+        source = Source(
+            client_id=client.id,
+            file_path="/tmp/test.mp4",
+            title="Transcribed",
+            duration_seconds=60.0,
+            transcript_json=sample_transcript,
+        )
+        db_session.add(source)
+        db_session.flush()
+        db_session.expire_all()
+
+        loaded = db_session.query(Source).first()
+        compact = loaded.transcript
+        assert isinstance(compact, CompactTranscript)
+        assert len(compact) == len(sample_transcript["segments"])
+        assert compact.words_in_range(0.0, 0.45)[0]["word"] == "This"
+
+    def test_transcript_cache_dropped_on_expire_and_refresh(self, db_session, sample_transcript):
+        client = Client(name="Transcript")
+        db_session.add(client)
+        db_session.flush()
+
+        source = Source(
+            client_id=client.id,
+            file_path="/tmp/test.mp4",
+            title="Transcribed",
+            duration_seconds=60.0,
+            transcript_json=sample_transcript,
+        )
+        db_session.add(source)
+        db_session.flush()
+
+        assert source.transcript is source.transcript
+        db_session.expire(source)
+        assert "_transcript_cache" not in source.__dict__
+
+        source.transcript
+        db_session.refresh(source)
+        assert "_transcript_cache" not in source.__dict__
+
+        # Rewritten out of band: the next load sees the new bytes
+        source.transcript
+        changed = {"segments": [{"start": 0.0, "end": 1.0, "text": "Changed"}]}
+        db_session.query(SourceTranscript).update(
+            {"data": CompactTranscript.from_dict(changed).to_bytes()}
+        )
+        db_session.expire_all()
+        assert source.transcript_json["segments"][0]["text"] == "Changed"
+
+    def test_transcript_cleared(self, db_session, sample_transcript):
+        client = Client(name="Transcript")
+        db_session.add(client)
+        db_session.flush()
+
+        source = Source(
+            client_id=client.id,
+            file_path="/tmp/test.mp4",
+            title="Transcribed",
+            duration_seconds=60.0,
+            transcript_json=sample_transcript,
+        )
+        db_session.add(source)
+        db_session.flush()
+
+        source.transcript_json = None
+        db_session.flush()
+
+        assert not source.has_transcript
+        assert source.transcript_json is None
+        assert db_session.query(SourceTranscript).count() == 0